@@ -0,0 +1,208 @@
+import threading, time
+from collections import namedtuple
+import numpy as np
+from PySide6.QtCore import Qt, QObject, QThread, QTimer, QMetaObject, Signal, Slot
+
+CHANNELS = ("viscosity", "density", "temperature", "pressure")
+CONN_TYPES = ("WiFi", "Ethernet", "USB")
+SENSOR_KINDS = ("temperature", "pressure", "viscosity")
+
+# values: (muestras, sensores, canales) en float32, timestamps en segundos epoch
+Batch = namedtuple("Batch", "offset timestamps values")
+
+
+# Fuentes
+class SampleSource:
+    channels = CHANNELS
+
+    def sensors(self):
+        # (modelo, serie, tipo de conexion, tipo de sensor)
+        return []
+
+    def open(self):
+        pass
+
+    def read(self, now):
+        # Devuelve (timestamps, values) con las muestras nuevas o None
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SimulatorSource(SampleSource):
+    MODELS = ("SRD", "DVM", "SRV", "DVP")
+    SUFFIXES = ("AC", "GG", "RT", "WD")
+    # Valor base y amplitud por canal
+    BASE = np.array([12.0, 1.0, 25.0, 1.2], dtype=np.float32)
+    SPREAD = np.array([4.0, 0.2, 10.0, 0.4], dtype=np.float32)
+    NOISE = np.array([0.05, 0.002, 0.05, 0.01], dtype=np.float32)
+
+    def __init__(self, n_sensors=4, rate=100.0, seed=0, max_block=1.0):
+        self.n_sensors = int(n_sensors)
+        self.rate = float(rate)
+        self.seed = seed
+        self.max_samples = max(1, int(self.rate * max_block))
+        rng = np.random.default_rng(seed)
+        shape = (self.n_sensors, len(CHANNELS))
+        self._base = (self.BASE + self.SPREAD * rng.uniform(-0.5, 0.5, shape)).astype(np.float32)
+        self._amp = (self.SPREAD * rng.uniform(0.02, 0.1, shape)).astype(np.float32)
+        self._freq = rng.uniform(0.01, 0.2, shape).astype(np.float32)
+        self._phase = rng.uniform(0, 2 * np.pi, shape).astype(np.float32)
+        self._conn = rng.integers(0, len(CONN_TYPES), self.n_sensors)
+        self._kind = rng.integers(0, len(SENSOR_KINDS), self.n_sensors)
+        self._rng = np.random.default_rng(seed)
+        self._start = None
+        self._count = 0
+        self._epoch = time.time()
+
+    def sensors(self):
+        result = []
+        for i in range(self.n_sensors):
+            m = i % len(self.MODELS)
+            model = self.MODELS[m]
+            n = i // len(self.MODELS)
+            serial = f"{model}-{n:03d}-{self.SUFFIXES[m]}{n % 100:02d}"
+            result.append((model, serial, CONN_TYPES[self._conn[i]], SENSOR_KINDS[self._kind[i]]))
+        return result
+
+    def open(self):
+        self._start = None
+        self._count = 0
+        self._rng = np.random.default_rng(self.seed)
+
+    def read(self, now):
+        if self._start is None:
+            self._start = now
+        due = int((now - self._start) * self.rate)
+        if due - self._count > self.max_samples:
+            # Si nos atrasamos se descartan muestras viejas en vez de acumular
+            self._count = due - self.max_samples
+        count = due - self._count
+        if count <= 0:
+            return None
+        rel = np.arange(self._count, due) / self.rate
+        self._count = due
+        wave = np.sin(2 * np.pi * self._freq * rel[:, None, None] + self._phase).astype(np.float32)
+        values = self._base + self._amp * wave
+        values += self.NOISE * self._rng.standard_normal(values.shape, dtype=np.float32)
+        return self._start + rel, values
+
+    def sample(self, t, rows):
+        # Valor instantaneo de algunos sensores, para equipos que se consultan de a uno
+        rel = t - self._epoch
+        wave = np.sin(2 * np.pi * self._freq[rows] * rel + self._phase[rows]).astype(np.float32)
+        values = self._base[rows] + self._amp[rows] * wave
+        values += self.NOISE * self._rng.standard_normal(values.shape, dtype=np.float32)
+        return values
+
+
+# Worker
+class AcquisitionWorker(QObject):
+    def __init__(self, engine, interval_ms):
+        super().__init__()
+        self.engine = engine
+        self.interval_ms = interval_ms
+        self.timer = None
+
+    @Slot()
+    def start(self):
+        for source in self.engine.sources:
+            source.open()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(self.interval_ms)
+
+    @Slot()
+    def stop(self):
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer = None
+
+    @Slot()
+    def tick(self):
+        now = time.time()
+        for source, offset in zip(self.engine.sources, self.engine.offsets):
+            block = source.read(now)
+            if block is not None:
+                self.engine.deliver(Batch(offset, *block))
+
+
+# Motor
+class AcquisitionEngine(QObject):
+    batchesReady = Signal()
+
+    def __init__(self, sources, interval_ms=50, parent=None):
+        super().__init__(parent)
+        self.sources = list(sources)
+        self.offsets = []
+        total = 0
+        for source in self.sources:
+            self.offsets.append(total)
+            total += len(source.sensors())
+        self.sensor_count = total
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._pending = []
+        self._notified = False
+        self._thread = None
+        self._worker = None
+
+    def sensors(self):
+        result = []
+        for source in self.sources:
+            result.extend(source.sensors())
+        return result
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = QThread()
+        self._worker = AcquisitionWorker(self, self.interval_ms)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.start)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        QMetaObject.invokeMethod(self._worker, "stop", Qt.BlockingQueuedConnection)
+        self._thread.quit()
+        self._thread.wait()
+        for source in self.sources:
+            source.close()
+        self._thread = None
+        self._worker = None
+
+    def deliver(self, batch):
+        # Una sola senal pendiente a la vez: el GUI recoge todo lo acumulado
+        with self._lock:
+            self._pending.append(batch)
+            notify = not self._notified
+            self._notified = True
+        if notify:
+            self.batchesReady.emit()
+
+    def take(self):
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+            self._notified = False
+        return merge_batches(pending)
+
+
+def merge_batches(batches):
+    by_offset = {}
+    for batch in batches:
+        by_offset.setdefault(batch.offset, []).append(batch)
+    merged = []
+    for offset, group in by_offset.items():
+        if len(group) == 1:
+            merged.append(group[0])
+        else:
+            merged.append(Batch(
+                offset,
+                np.concatenate([b.timestamps for b in group]),
+                np.concatenate([b.values for b in group]),
+            ))
+    return merged
@@ -0,0 +1,136 @@
+import numpy as np
+
+
+# Contador por ventana con buckets en anillo: guarda la ventana actual y la
+# anterior, asi el cambio porcentual sale sin recorrer el historial
+class WindowCounter:
+    def __init__(self, window_s=60.0, buckets=60):
+        self.buckets = int(buckets)
+        self.width = float(window_s) / self.buckets
+        self.ring = np.zeros(2 * self.buckets, dtype=np.float64)
+        self.head = None
+        self.total = 0.0
+
+    def advance(self, bucket):
+        # Limpia los buckets que quedan fuera al avanzar el tiempo
+        if self.head is None:
+            self.head = bucket
+            return
+        steps = bucket - self.head
+        if steps <= 0:
+            return
+        size = len(self.ring)
+        if steps >= size:
+            self.ring[:] = 0
+        else:
+            slots = (self.head + 1 + np.arange(steps)) % size
+            self.ring[slots] = 0
+        self.head = bucket
+
+    def add(self, ts, weights):
+        ts = np.asarray(ts, dtype=np.float64)
+        if not len(ts):
+            return
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), ts.shape)
+        self.total += float(weights.sum())
+        b = np.floor(ts / self.width).astype(np.int64)
+        self.advance(int(b.max()))
+        size = len(self.ring)
+        first = self.head - size + 1
+        keep = b >= first
+        counts = np.bincount(b[keep] - first, weights[keep], minlength=size)
+        # counts[i] corresponde al bucket absoluto first + i
+        self.ring[(first + np.arange(size)) % size] += counts
+
+    def add_count(self, t, count):
+        self.add((t,), (count,))
+
+    def windows(self, now=None):
+        if self.head is None:
+            return 0.0, 0.0
+        if now is not None:
+            self.advance(int(np.floor(now / self.width)))
+        size = len(self.ring)
+        order = (self.head - np.arange(size)) % size
+        ring = self.ring[order]
+        return float(ring[:self.buckets].sum()), float(ring[self.buckets:].sum())
+
+    def change(self, now=None):
+        current, previous = self.windows(now)
+        if previous <= 0:
+            return None
+        return (current - previous) / previous * 100.0
+
+    def state(self):
+        return {"head": self.head, "total": self.total}, {"ring": self.ring.copy()}
+
+    def restore(self, meta, arrays):
+        if arrays["ring"].shape != self.ring.shape:
+            return
+        self.ring[:] = arrays["ring"]
+        self.head = meta["head"]
+        self.total = meta["total"]
+
+
+# Agregados detras de las tarjetas del dashboard
+class DashboardAggregates:
+    def __init__(self, n_sensors, window_s=60.0, buckets=60, timeout=5.0):
+        self.readings = WindowCounter(window_s, buckets)
+        self.events = WindowCounter(window_s, buckets)
+        self.last_seen = np.full(n_sensors, -np.inf)
+        self.timeout = timeout
+        self.now = None
+
+    def add_batch(self, offset, ts, values):
+        # values: (muestras, sensores, canales); las lecturas faltantes vienen como NaN
+        n, sensors, channels = values.shape
+        valid = ~np.isnan(values)
+        self.readings.add(ts, valid.sum(axis=(1, 2)))
+        seen = ts[-1]
+        answered = valid.any(axis=(0, 2))
+        self.last_seen[offset:offset + sensors][answered] = seen
+        self.now = seen if self.now is None else max(self.now, seen)
+
+    def add_events(self, ts):
+        ts = np.asarray(ts, dtype=np.float64)
+        if len(ts):
+            self.events.add(ts, 1.0)
+
+    def connected(self, active=None):
+        if self.now is None:
+            return 0
+        alive = self.last_seen >= self.now - self.timeout
+        if active is not None:
+            alive &= active
+        return int(np.count_nonzero(alive))
+
+    def state(self):
+        # (metadatos JSON, arreglos) para guardar entre ejecuciones
+        readings, readings_arrays = self.readings.state()
+        events, events_arrays = self.events.state()
+        meta = {"readings": readings, "events": events, "now": self.now}
+        arrays = {"last_seen": self.last_seen.copy()}
+        arrays.update({f"readings_{k}": v for k, v in readings_arrays.items()})
+        arrays.update({f"events_{k}": v for k, v in events_arrays.items()})
+        return meta, arrays
+
+    def restore(self, meta, arrays):
+        if arrays["last_seen"].shape != self.last_seen.shape:
+            return
+        self.last_seen[:] = arrays["last_seen"]
+        self.now = meta["now"]
+        self.readings.restore(meta["readings"], {"ring": arrays["readings_ring"]})
+        self.events.restore(meta["events"], {"ring": arrays["events_ring"]})
+
+    def snapshot(self, active=None):
+        return {
+            "readings": int(self.readings.total),
+            "readings_change": self.readings.change(self.now),
+            "connected": self.connected(active),
+            "events": int(self.events.total),
+            "events_change": self.events.change(self.now),
+        }
+
+
+def format_change(value):
+    return "--" if value is None else f"{value:+.2f}%"
@@ -0,0 +1,211 @@
+import os, signal
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+WINDOW = 2048
+NPERSEG = 512
+INTERVAL = 1.0
+# Sensores analizados como maximo (las primeras filas): cada uno ocupa
+# WINDOW muestras por canal en el anillo y otro tanto en memoria compartida
+MAX_SENSORS = 1024
+
+# Por sensor y canal
+METRIC_DTYPE = np.dtype([
+    ("mean", "f4"), ("std", "f4"), ("recent_mean", "f4"), ("recent_std", "f4"),
+    ("drift", "f4"), ("noise", "f4"), ("peak_hz", "f4"), ("peak_power", "f4"),
+])
+
+
+# Calculo (corre en los procesos del pool)
+def welch(x, rate, nperseg=NPERSEG):
+    # x: (muestras, ...). Segmentos con 50% de solape, ventana de Hann
+    nperseg = min(nperseg, len(x))
+    step = max(1, nperseg // 2)
+    starts = np.arange(0, len(x) - nperseg + 1, step)
+    window = np.hanning(nperseg).astype(np.float32)
+    shape = (nperseg,) + (1,) * (x.ndim - 1)
+    psd = 0.0
+    for s in starts:
+        seg = x[s:s + nperseg]
+        seg = (seg - seg.mean(axis=0)) * window.reshape(shape)
+        psd = psd + np.abs(np.fft.rfft(seg, axis=0)) ** 2
+    psd = psd / (len(starts) * rate * float((window ** 2).sum()))
+    return np.fft.rfftfreq(nperseg, 1.0 / rate), psd
+
+
+def compute_metrics(x, rate, recent):
+    # x: (muestras, sensores, canales); rate: (sensores,)
+    n = len(x)
+    out = np.zeros(x.shape[1:], dtype=METRIC_DTYPE)
+    if n < 2:
+        return out
+    x = x.astype(np.float64)
+    out["mean"] = x.mean(axis=0)
+    out["std"] = x.std(axis=0)
+    tail = x[-min(recent, n):]
+    out["recent_mean"] = tail.mean(axis=0)
+    out["recent_std"] = tail.std(axis=0)
+    # Deriva: pendiente por minimos cuadrados, en unidades por segundo
+    t = np.arange(n, dtype=np.float64) - (n - 1) / 2.0
+    slope = np.tensordot(t, x, axes=(0, 0)) / float((t ** 2).sum())
+    out["drift"] = slope * rate[:, None]
+    # Ruido: las diferencias entre muestras quitan la parte lenta de la senal
+    out["noise"] = np.diff(x, axis=0).std(axis=0) / np.sqrt(2.0)
+    if n >= 16:
+        freqs, psd = welch(x, 1.0)
+        peak = psd[1:].argmax(axis=0) + 1
+        out["peak_hz"] = freqs[peak] * rate[:, None]
+        out["peak_power"] = np.take_along_axis(psd, peak[None], axis=0)[0] / rate[:, None]
+    return out
+
+
+_attached = {}
+
+
+def init_worker():
+    # Ctrl-C llega a todo el grupo de procesos: lo atiende el principal, que
+    # cierra el pool; si no, cada proceso imprime su KeyboardInterrupt
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def analyze(name, shape, s0, s1, count, rate, recent):
+    # Cada proceso se engancha una sola vez al bloque compartido
+    shm = _attached.get(name)
+    if shm is None:
+        for old in _attached.values():
+            old.close()
+        _attached.clear()
+        shm = _attached[name] = shared_memory.SharedMemory(name=name)
+    frame = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+    x = frame[shape[0] - count:, s0:s1]
+    return s0, compute_metrics(x, np.asarray(rate, dtype=np.float64), recent)
+
+
+# Motor (lado GUI)
+# El hilo de la GUI solo copia muestras a un anillo. Cada `interval` segundos
+# el anillo se ordena en un bloque de memoria compartida y cada proceso lee
+# de ahi su rango de sensores, sin copias serializadas. collect() no bloquea.
+class AnalyticsEngine:
+    def __init__(self, n_sensors, channels, window=WINDOW, interval=INTERVAL, workers=None, recent=None):
+        self.n_sensors = n_sensors
+        self.channels = channels
+        self.window = window
+        self.interval = interval
+        self.recent = recent or max(2, window // 8)
+        self.ring = np.zeros((window, n_sensors, channels), dtype=np.float32)
+        self.head = np.zeros(n_sensors, dtype=np.int64)
+        self.filled = np.zeros(n_sensors, dtype=np.int64)
+        self.rate = np.ones(n_sensors, dtype=np.float64)
+        self.shape = (window, n_sensors, channels)
+        # El bloque compartido y el pool se crean con la primera ronda
+        self.shm = None
+        self.frame = None
+        self.pool = None
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.result = np.zeros((n_sensors, channels), dtype=METRIC_DTYPE)
+        self.valid = np.zeros(n_sensors, dtype=bool)
+        self.version = 0
+        self._futures = []
+        self._last_submit = None
+
+    def add(self, offset, timestamps, values):
+        # Las filas fuera de los n_sensors analizados se ignoran
+        n, count = values.shape[0], min(values.shape[1], self.n_sensors - offset)
+        if n == 0 or count <= 0:
+            return
+        rows = slice(offset, offset + count)
+        values = values[-self.window:, :count]
+        # Todos los sensores de un lote avanzan juntos
+        head = int(self.head[offset])
+        if np.isnan(values).any():
+            # Lectura faltante: se repite la anterior para no envenenar el
+            # analisis. Por cada valor, el indice de la ultima muestra con
+            # dato (0 es la fila previa del anillo) y se toma de ahi
+            stacked = np.concatenate((self.ring[(head - 1) % self.window, rows][None], values))
+            index = np.where(np.isnan(stacked), 0, np.arange(len(stacked))[:, None, None])
+            np.maximum.accumulate(index, axis=0, out=index)
+            values = np.take_along_axis(stacked, index, axis=0)[1:]
+        idx = (head + np.arange(len(values))) % self.window
+        self.ring[idx, rows] = values
+        self.head[rows] = (head + len(values)) % self.window
+        self.filled[rows] = np.minimum(self.filled[rows] + len(values), self.window)
+        if n > 1 and timestamps[-1] > timestamps[0]:
+            self.rate[rows] = (n - 1) / (timestamps[-1] - timestamps[0])
+
+    def submit(self, now):
+        # Una sola ronda en vuelo; si el pool va atrasado se saltea el intervalo
+        if self._futures or self.n_sensors == 0:
+            return False
+        if self._last_submit is not None and now - self._last_submit < self.interval:
+            return False
+        count = int(self.filled.min())
+        if count < 2:
+            return False
+        self._last_submit = now
+        if self.pool is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(1, self.ring.nbytes))
+            self.frame = np.ndarray(self.shape, dtype=np.float32, buffer=self.shm.buf)
+            # spawn: los procesos no heredan el estado de Qt del proceso principal
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=mp.get_context("spawn"), initializer=init_worker)
+        self.snapshot()
+        step = -(-self.n_sensors // self.workers)
+        for s0 in range(0, self.n_sensors, step):
+            s1 = min(s0 + step, self.n_sensors)
+            self._futures.append(self.pool.submit(
+                analyze, self.shm.name, self.shape, s0, s1, count, self.rate[s0:s1], self.recent
+            ))
+        return True
+
+    def snapshot(self):
+        # Deja el anillo en orden temporal dentro del bloque compartido. Los
+        # sensores de una misma fuente comparten cabeza, asi que alcanza con
+        # dos copias de bloque por cada tramo de sensores con la misma cabeza
+        cuts = np.flatnonzero(np.diff(self.head)) + 1
+        bounds = np.concatenate(([0], cuts, [self.n_sensors]))
+        for r0, r1 in zip(bounds[:-1], bounds[1:]):
+            h = int(self.head[r0])
+            tail = self.window - h
+            self.frame[:tail, r0:r1] = self.ring[h:, r0:r1]
+            self.frame[tail:, r0:r1] = self.ring[:h, r0:r1]
+
+    def collect(self):
+        # True cuando termino una ronda completa y hay resultados nuevos
+        if not self._futures or not all(f.done() for f in self._futures):
+            return False
+        futures, self._futures = self._futures, []
+        for f in futures:
+            s0, metrics = f.result()
+            self.result[s0:s0 + len(metrics)] = metrics
+            self.valid[s0:s0 + len(metrics)] = True
+        self.version += 1
+        return True
+
+    def state(self):
+        # Solo los resultados: las ventanas se vuelven a llenar con datos en vivo
+        return {}, {"result": self.result.copy(), "valid": self.valid.copy()}
+
+    def restore(self, meta, arrays):
+        if arrays["result"].dtype != self.result.dtype or arrays["result"].shape != self.result.shape:
+            return
+        self.result[:] = arrays["result"]
+        self.valid[:] = arrays["valid"]
+
+    def summary(self, active=None):
+        # Mediana por canal entre los sensores activos con resultado
+        mask = self.valid if active is None else self.valid & active[:self.n_sensors]
+        if not mask.any():
+            return None
+        rows = self.result[mask]
+        return {name: np.median(rows[name], axis=0) for name in METRIC_DTYPE.names}
+
+    def close(self):
+        self._futures = []
+        if self.pool is None:
+            return
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.pool = None
+        self.frame = None
+        self.shm.close()
+        self.shm.unlink()
@@ -0,0 +1,263 @@
+import os, sys, time, json, platform, argparse
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import numpy as np
+from PySide6 import __version__ as PYSIDE_VERSION
+from PySide6.QtWidgets import QApplication
+import main
+
+RESULTS = os.path.join(HERE, "results.json")
+BASELINE = os.path.join(HERE, "baseline.json")
+# Techo absoluto de p50 por benchmark, con o sin baseline: un cuadro del
+# grafico en vivo tiene que entrar en 30 FPS
+BUDGETS_MS = {"canvas_frame": 33.0}
+
+
+def stats(samples):
+    ordered = sorted(samples)
+    return {
+        "rounds": len(samples),
+        "first_ms": round(samples[0], 3),
+        "min_ms": round(ordered[0], 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 3),
+        "mean_ms": round(sum(samples) / len(samples), 3),
+    }
+
+
+def timed(app, fn, rounds):
+    # Cada muestra incluye el procesamiento de eventos que la operacion deja en cola
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        app.processEvents()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def window(app, sensors):
+    w = main.Dashboard(sensors=sensors)
+    w.show()
+    w.go_dashboard()
+    app.processEvents()
+    # Sin adquisicion: los lotes entrantes meterian ruido en cada muestra
+    w.engine.stop()
+    return w
+
+
+def close(app, w):
+    w.close()
+    w.deleteLater()
+    app.processEvents()
+
+
+# Benchmarks por cantidad de sensores
+def bench_construct(app, sensors, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        w = window(app, sensors)
+        samples.append((time.perf_counter() - start) * 1000)
+        close(app, w)
+    return samples
+
+
+def bench_populate_table(app, sensors, rounds):
+    from dashboard import DashboardPage
+    from sensor_registry import SensorRegistry
+    from acquisition import CONN_TYPES, SENSOR_KINDS
+    w = main.Dashboard(sensors=4, fast_start=True)
+    page = DashboardPage(w.i18n)
+    # Filas sinteticas: la tabla no necesita la adquisicion para poblarse
+    page.set_registry(SensorRegistry([
+        (f"S{i % 7}", f"SN-{i:07d}", CONN_TYPES[i % len(CONN_TYPES)], SENSOR_KINDS[i % len(SENSOR_KINDS)])
+        for i in range(sensors)
+    ], "Status"))
+    # Cada filtro nuevo arma su indice en un hilo: se espera fuera de la
+    # muestra para medir solo la tabla sin solaparse con la ronda siguiente
+    samples = []
+    for _ in range(rounds):
+        samples += timed(app, page.populate_table, 1)
+        page.filter.ready.wait()
+    page.deleteLater()
+    close(app, w)
+    return samples
+
+
+def bench_theme_toggle(app, sensors, rounds):
+    w = window(app, sensors)
+    samples = timed(app, w.toggle_theme, rounds)
+    close(app, w)
+    return samples
+
+
+def bench_language_switch(app, sensors, rounds):
+    w = window(app, sensors)
+    langs = w.i18n.catalog.languages
+    turn = iter(range(1 << 30))
+    samples = timed(app, lambda: w.set_language(langs[(next(turn) + 1) % len(langs)]), rounds)
+    close(app, w)
+    return samples
+
+
+def bench_sidebar(app, sensors, rounds):
+    w = window(app, sensors)
+    samples = timed(app, w.toggle_sidebar, rounds)
+    close(app, w)
+    return samples
+
+
+# Benchmarks por cantidad de muestras en el grafico
+def canvas(app, samples):
+    from dashboard import MplCanvas
+    c = MplCanvas(width=6, height=2.6, dpi=100)
+    c.resize(600, 260)
+    c.show()
+    # Tres series de ruido blanco: el peor caso para rasterizar
+    c.start_streaming([
+        ("data", "data", {"linewidth": 2.5}),
+        ("events", "events", {"linewidth": 1.8}),
+        ("extra", "extra", {"linewidth": 1.2}),
+    ], capacity=samples)
+    t = np.arange(samples, dtype=np.float64)
+    rng = np.random.default_rng(0)
+    for key in c.streams:
+        c.push(key, t, rng.standard_normal(samples).astype(np.float32))
+    c._dirty = True
+    c.render_frame()
+    app.processEvents()
+    return c
+
+
+def bench_canvas_draw(app, samples, rounds):
+    c = canvas(app, samples)
+    out = timed(app, c.draw, rounds)
+    c.close()
+    return out
+
+
+def bench_canvas_frame(app, samples, rounds):
+    c = canvas(app, samples)
+
+    def frame():
+        c._dirty = True
+        c.render_frame()
+
+    out = timed(app, frame, rounds)
+    c.close()
+    return out
+
+
+BENCHMARKS = {
+    "construct": ("sensors", bench_construct),
+    "populate_table": ("sensors", bench_populate_table),
+    "theme_toggle": ("sensors", bench_theme_toggle),
+    "language_switch": ("sensors", bench_language_switch),
+    "sidebar_toggle": ("sensors", bench_sidebar),
+    "canvas_draw": ("samples", bench_canvas_draw),
+    "canvas_frame": ("samples", bench_canvas_frame),
+}
+
+
+def compare(results, baseline, tolerance, floor_ms):
+    # Regresion: p50 por encima de la tolerancia relativa y del piso absoluto
+    # o p50 por encima del techo del benchmark
+    lines, regressions = [], []
+    for key, r in results.items():
+        b = baseline.get(key)
+        if "p50_ms" not in r:
+            lines.append(f"{key:<36} skipped: {r.get('skipped')}")
+            continue
+        budget = BUDGETS_MS.get(key.split("[")[0])
+        over = budget is not None and r["p50_ms"] > budget
+        mark = f"  OVER BUDGET ({budget:g} ms)" if over else ""
+        if not b or "p50_ms" not in b:
+            if over:
+                regressions.append(key)
+            lines.append(f"{key:<36} {r['p50_ms']:>10.2f} {r['p99_ms']:>10.2f}  (no baseline)" + mark)
+            continue
+        change = r["p50_ms"] / b["p50_ms"] - 1 if b["p50_ms"] else 0.0
+        slower = change > tolerance and r["p50_ms"] - b["p50_ms"] > floor_ms
+        if slower or over:
+            regressions.append(key)
+        lines.append(
+            f"{key:<36} {r['p50_ms']:>10.2f} {r['p99_ms']:>10.2f} {b['p50_ms']:>10.2f} {change:>+8.1%}"
+            + ("  REGRESSION" if slower else "") + mark
+        )
+    header = f"{'benchmark':<36} {'p50 ms':>10} {'p99 ms':>10} {'base p50':>10} {'change':>8}"
+    return "\n".join([header] + lines), regressions
+
+
+def scales(text):
+    return [int(float(v)) for v in text.split(",") if v]
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Headless timings of the dashboard hot paths")
+    parser.add_argument("--sensors", type=scales, default=[10, 1000, 10_000, 100_000, 1_000_000], help="comma list, e.g. 10,1e3,1e6")
+    parser.add_argument("--samples", type=scales, default=[1000, 100_000, 1_000_000], help="comma list, e.g. 1e3,1e7")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--only", help="comma list of benchmarks: " + ",".join(BENCHMARKS))
+    parser.add_argument("--out", default=RESULTS, help="results file (JSON)")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p50 slowdown")
+    parser.add_argument("--floor-ms", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    results = {}
+    for name in names:
+        dimension, bench = BENCHMARKS[name]
+        # Construir la ventana entera es caro: menos rondas que las operaciones
+        rounds = max(3, args.rounds // 5) if name == "construct" else args.rounds
+        for scale in (args.sensors if dimension == "sensors" else args.samples):
+            key = f"{name}[{dimension}={scale}]"
+            try:
+                results[key] = stats(bench(app, scale, rounds))
+            except Exception as e:
+                # Escalas que no entran en esta maquina (memoria, /dev/shm, ...)
+                # quedan registradas, no cortan la corrida
+                results[key] = {"skipped": f"{type(e).__name__}: {e}"}
+            print(f"{key:<36} {results[key].get('p50_ms', '-')}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pyside": PYSIDE_VERSION,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "rounds": args.rounds,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    table, regressions = compare(results, baseline, args.tolerance, args.floor_ms)
+    print(table)
+
+    if args.update_baseline:
+        # Se conservan las escalas que esta corrida no midio
+        baseline.update({k: v for k, v in results.items() if "p50_ms" in v})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"meta": report["meta"], "results": baseline}, f, indent=2)
+        print(f"baseline updated: {args.baseline}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,63 @@
+import os, sys, time, argparse
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtCore import Qt
+import main
+
+
+# Camino anterior: relee y aplica el .qss entero, reaplica todos los textos y
+# arma QIcon/QPixmap desde disco
+def legacy_toggle(w):
+    w.theme = "dark" if w.theme == "light" else "light"
+    with open(os.path.join(main.BASE, "styles", f"{w.theme}.qss"), "r", encoding="utf-8") as f:
+        w.setStyleSheet(f.read())
+    w.i18n.refresh()
+    folder = main.asset_folder(w.theme)
+    w.logo.setPixmap(QPixmap(os.path.join(main.BASE, "assets", folder, main.themed_logo(w.theme, w.collapsed))).scaled(
+        180 if not w.collapsed else 40, 50, Qt.KeepAspectRatio, Qt.SmoothTransformation
+    ))
+    for btn in [
+        w.btn_menu, w.btn_home, w.btn_sensors, w.btn_help,
+        w.btn_account, w.btn_theme, w.btn_lang
+    ]:
+        file = btn._icon_dark if w.theme == "dark" else btn._icon_light
+        btn.setIcon(QIcon(os.path.join(main.BASE, "assets", folder, file)))
+
+
+def measure(app, w, toggle, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        toggle(w)
+        app.processEvents()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Theme toggle latency, before and after the cache")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    w = main.Dashboard()
+    w.show()
+    w.go_dashboard()
+    app.processEvents()
+
+    before = measure(app, w, legacy_toggle, args.rounds)
+    # Se vuelve a la hoja con todos los temas que usa toggle_theme
+    w.setStyleSheet("")
+    w.load_theme()
+    after = measure(app, w, main.Dashboard.toggle_theme, args.rounds)
+    print(f"before: p50 {before[0]:.2f} ms  p99 {before[1]:.2f} ms")
+    print(f"after:  p50 {after[0]:.2f} ms  p99 {after[1]:.2f} ms")
+    w.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -1,31 +1,23 @@
-import os
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QComboBox, QFrame, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QCheckBox, QDialog, QDialogButtonBox, QFormLayout
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QIcon, QPainter, QColor, QBrush
+import os, time
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QComboBox, QFrame, QTableView, QHeaderView, QAbstractItemView, QDialog, QDialogButtonBox, QFormLayout
+from PySide6.QtCore import Qt, QTimer
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
 import numpy as np
+from streaming import Stream
+from lod import LodPyramid
+from scheduler import get_scheduler
+from perf import timed
+from aggregates import format_change
+from fleet import Fleet
+from acquisition import CHANNELS, CONN_TYPES, SENSOR_KINDS
+from sensor_filter import SensorFilter
+from sensor_registry import SensorRegistry, DEFAULT_STATUS
+from sensor_table import SensorTableModel, ToggleDelegate, EditButtonDelegate, COL_ACTION, COL_EDIT, ROW_HEIGHT
 
 BASE = os.path.dirname(__file__)
 
-# Switch
-class ToggleSwitch(QCheckBox):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setFixedSize(50, 28)
-        self.setCursor(Qt.PointingHandCursor)
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        rect = self.rect()
-        painter.setBrush(QBrush(QColor("#5BC4A2" if self.isChecked() else "#D3D5DA")))
-        painter.setPen(Qt.NoPen)
-        painter.drawRoundedRect(rect, 14, 14)
-        painter.setBrush(QBrush(QColor("white")))
-        x = rect.width() - 24 if self.isChecked() else 4
-        painter.drawEllipse(x, 4, 20, 20)
-
 # Matplotlib
 class MplCanvas(FigureCanvas):
     def __init__(self, parent=None, width=6, height=2.6, dpi=100):
@@ -33,20 +25,271 @@ class MplCanvas(FigureCanvas):
         self.ax = self.fig.add_subplot(111)
         super().__init__(self.fig)
         self.fig.tight_layout()
+        self.streams = {}
+        self.history = {}
+        self.history_source = None
+        self.scheduler = None
+        self.lod_mode = "minmax"
+        self.legend = True
+        self.example = {}
+        self._legend_texts = {}
+        self._background = None
+        self._bare = None
+        self._dirty = False
+        self._pan = None
+        self._frame_timer = QTimer(self)
+        self._frame_timer.timeout.connect(self.render_frame)
+        self.mpl_connect("draw_event", self._on_draw)
+        self.mpl_connect("resize_event", lambda e: self.refresh_history())
+        self.mpl_connect("scroll_event", self._on_scroll)
+        self.mpl_connect("button_press_event", self._on_press)
+        self.mpl_connect("motion_notify_event", self._on_motion)
+        self.mpl_connect("button_release_event", self._on_release)
+
+    @timed("canvas.draw")
+    def draw(self):
+        super().draw()
 
     def plot_example(self, tr):
+        self.stop_streaming()
+        self.history = {}
         x = np.arange(1, 13)
         this_year = np.array([10, 12, 9, 11, 13, 22, 26, 23, 20, 18, 21, 22]) * 1000 / 1.2
         last_year = np.array([8, 10, 11, 10, 12, 18, 20, 17, 15, 14, 19, 25]) * 1000 / 1.1
         self.ax.clear()
-        self.ax.plot(x, this_year, linewidth=2.5, label=tr["data"])
-        self.ax.plot(x, last_year, linestyle="--", linewidth=1.8, label=tr["events_created"])
+        self.example = {
+            "data": self.ax.plot(x, this_year, linewidth=2.5, label=tr["data"])[0],
+            "events": self.ax.plot(x, last_year, linestyle="--", linewidth=1.8, label=tr["events_created"])[0],
+        }
         self.ax.fill_between(x, this_year, alpha=0.06)
-        self.ax.legend(frameon=False, loc="upper left", fontsize=9)
+        self.update_legend()
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        self.draw()
+
+    # Streaming
+    def start_streaming(self, series, capacity=100_000, fps=30, legend=True):
+        # series: lista de (clave, etiqueta, kwargs de estilo)
+        self.stop_streaming()
+        self.history = {}
+        self.example = {}
+        self.legend = legend
+        self.ax.clear()
+        for key, label, style in series:
+            line, = self.ax.plot([], [], label=label, animated=True, **style)
+            band = PolyCollection([], facecolors=line.get_color(), linewidths=0, animated=True)
+            self.ax.add_collection(band, autolim=False)
+            self.streams[key] = Stream(line, capacity, band)
+        self.update_legend()
+        # Sin ticks el fondo no depende de los limites, asi que cambiar
+        # los limites no obliga a redibujar la figura completa
         self.ax.set_xticks([])
         self.ax.set_yticks([])
+        if self.scheduler is None:
+            self._frame_timer.start(max(1, int(1000 / fps)))
         self.draw()
 
+    def series_lines(self, key):
+        if key in self.streams:
+            yield self.streams[key].line
+        if key in self.history:
+            yield self.history[key][1]
+        if key in self.example:
+            yield self.example[key]
+
+    def set_labels(self, labels):
+        # Cambia los textos de la leyenda en el lugar, sin rearmar el grafico
+        for key, text in labels.items():
+            for line in self.series_lines(key):
+                line.set_label(text)
+                legend_text = self._legend_texts.get(id(line))
+                if legend_text is not None:
+                    legend_text.set_text(text)
+        if self.streams and not self.history:
+            # Se repinta solo la leyenda sobre el fondo guardado sin ella
+            if self._bare is not None:
+                self.restore_region(self._bare)
+                self.paint_legend()
+            self._dirty = True
+            if self.scheduler is not None:
+                self.scheduler.post(("chart", id(self)), self, self.render_frame)
+            else:
+                self.render_frame()
+        else:
+            self.draw_idle()
+
+    def update_legend(self):
+        self._legend_texts = {}
+        if not self.legend:
+            return
+        handles, labels = self.ax.get_legend_handles_labels()
+        legend = self.ax.legend(handles, labels, frameon=False, loc="upper left", fontsize=9)
+        # En vivo la leyenda no entra en el draw completo: se pinta aparte sobre
+        # el fondo, asi un cambio de texto no obliga a redibujar la figura
+        legend.set_animated(bool(self.streams) and not self.history)
+        self._legend_texts = {id(h): t for h, t in zip(handles, legend.get_texts())}
+
+    def show_series(self, keys):
+        # Solo las series visibles cuentan para la escala
+        for key, stream in self.streams.items():
+            stream.line.set_visible(key in keys)
+        self._dirty = True
+        self.rescale(force=True)
+        self.render_frame()
+
+    def stop_streaming(self):
+        self._frame_timer.stop()
+        self.streams = {}
+        self._background = None
+        self._bare = None
+        self._dirty = False
+
+    def push(self, key, x, y):
+        self.streams[key].push(x, y)
+        self._dirty = True
+        if self.scheduler is not None:
+            self.scheduler.post(("chart", id(self)), self, self.render_frame)
+
+    @timed("canvas.frame")
+    def render_frame(self):
+        if not self._dirty or not self.isVisible() or self.history:
+            return
+        self._dirty = False
+        self.rescale()
+        x0, x1 = self.ax.get_xlim()
+        pixels = self.ax.bbox.width
+        for stream in self.streams.values():
+            stream.sync(x0, x1, pixels)
+        if self._background is None:
+            self.draw()
+            return
+        self.restore_region(self._background)
+        self.draw_streams()
+        self.blit(self.fig.bbox)
+
+    def rescale(self, force=False):
+        bounds = [b for b in (s.bounds() for s in self.streams.values() if s.line.get_visible()) if b]
+        if not bounds:
+            return
+        x0 = min(b[0] for b in bounds)
+        x1 = max(b[1] for b in bounds)
+        y0 = min(b[2] for b in bounds)
+        y1 = max(b[3] for b in bounds)
+        if x1 > x0:
+            self.ax.set_xlim(x0, x1)
+        self.fit_ylim(y0, y1, force)
+
+    def fit_ylim(self, y0, y1, force=False):
+        lo, hi = self.ax.get_ylim()
+        span = max(y1 - y0, 1e-9)
+        # Solo se reajusta si los datos salen del rango o quedan muy chicos
+        if force or y0 < lo or y1 > hi or span < 0.5 * (hi - lo):
+            self.ax.set_ylim(y0 - 0.1 * span, y1 + 0.1 * span)
+
+    def draw_streams(self):
+        for stream in self.streams.values():
+            if stream.line.get_visible():
+                self.ax.draw_artist(stream.band)
+            self.ax.draw_artist(stream.line)
+
+    def paint_legend(self):
+        legend = self.ax.get_legend()
+        if legend is not None and legend.get_animated():
+            self.ax.draw_artist(legend)
+        self._background = self.copy_from_bbox(self.fig.bbox)
+
+    def _on_draw(self, event):
+        if not self.streams or self.history:
+            return
+        self._bare = self.copy_from_bbox(self.fig.bbox)
+        self.paint_legend()
+        self.draw_streams()
+
+    # Historial con niveles de detalle
+    def show_history(self, series):
+        # series: lista de (clave, LodPyramid, etiqueta, kwargs de estilo)
+        self.hide_history()
+        extents = []
+        for key, pyramid, label, style in series:
+            line, = self.ax.plot([], [], label=label, **style)
+            self.history[key] = (pyramid, line)
+            if pyramid.extent():
+                extents.append(pyramid.extent())
+        if not extents:
+            self.hide_history()
+            return
+        for stream in self.streams.values():
+            stream.line.set_visible(False)
+        self._background = None
+        self.update_legend()
+        x0 = min(e[0] for e in extents)
+        x1 = max(e[1] for e in extents)
+        self.ax.set_xlim(x0, x1 if x1 > x0 else x0 + 1)
+        self.refresh_history()
+
+    def hide_history(self):
+        if not self.history:
+            return
+        for _, line in self.history.values():
+            line.remove()
+        self.history = {}
+        for stream in self.streams.values():
+            stream.line.set_visible(True)
+        self.update_legend()
+        self._dirty = True
+        self.draw()
+
+    def refresh_history(self):
+        # Cada linea recibe como mucho ~2 puntos por pixel del nivel adecuado
+        if not self.history:
+            return
+        x0, x1 = self.ax.get_xlim()
+        pixels = self.ax.bbox.width
+        y0, y1 = np.inf, -np.inf
+        for pyramid, line in self.history.values():
+            x, y = pyramid.select(x0, x1, pixels, self.lod_mode)
+            line.set_data(x, y)
+            if len(y):
+                y0, y1 = min(y0, float(y.min())), max(y1, float(y.max()))
+        if y1 >= y0:
+            self.fit_ylim(y0, y1)
+        self.draw_idle()
+
+    def _on_scroll(self, event):
+        if event.inaxes is not self.ax or event.xdata is None:
+            return
+        if not self.history:
+            if self.history_source is None:
+                return
+            self.show_history(self.history_source())
+            if not self.history:
+                return
+        factor = 0.8 if event.button == "up" else 1.25
+        x0, x1 = self.ax.get_xlim()
+        x = event.xdata
+        self.ax.set_xlim(x - (x - x0) * factor, x + (x1 - x) * factor)
+        self.refresh_history()
+
+    def _on_press(self, event):
+        if not self.history or event.inaxes is not self.ax:
+            return
+        if event.dblclick:
+            self._pan = None
+            self.hide_history()
+        elif event.button == 1:
+            self._pan = (event.x, self.ax.get_xlim())
+
+    def _on_motion(self, event):
+        if self._pan is None or event.x is None:
+            return
+        start, (x0, x1) = self._pan
+        shift = (event.x - start) * (x1 - x0) / max(self.ax.bbox.width, 1)
+        self.ax.set_xlim(x0 - shift, x1 - shift)
+        self.refresh_history()
+
+    def _on_release(self, event):
+        self._pan = None
+
 # Edit
 class EditRowDialog(QDialog):
     def __init__(self, sensor, serial, status, tr, parent=None):
@@ -79,12 +322,30 @@ class EditRowDialog(QDialog):
 
 # Main
 class DashboardPage(QWidget):
-    def __init__(self, lang="en", tr=None):
+    UNITS = {"viscosity": "cP", "density": "g/cm³", "temperature": "°C", "pressure": "bar"}
+
+    def __init__(self, i18n, scheduler=None):
         super().__init__()
-        self.lang = lang
-        self.tr = tr or {}
+        self.i18n = i18n
+        self.tr = i18n.tr
+        self.engine = None
+        self.history = None
+        # Fleet propia o vista de un motor en otro proceso (solo lectura)
+        self.fleet = None
+        self.read_only = False
+        self.poll_timer = None
+        self.scheduler = scheduler or get_scheduler()
+        # Paginas de detalle abiertas: fila del sensor -> pagina
+        self.detail_pages = {}
+        # En modo vista: fila -> muestras ya pasadas a la pagina de detalle
+        self.cursors = {}
         self.build_ui()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Lo que se acumulo mientras la pagina estaba oculta se aplica ahora
+        self.scheduler.wake()
+
     def build_ui(self):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(16, 16, 16, 16)
@@ -94,28 +355,25 @@ class DashboardPage(QWidget):
         filters = QHBoxLayout()
         filters.setSpacing(12)
 
+        bind = self.i18n.bind
         self.search = QLineEdit()
         self.search.setObjectName("SearchBox")
-        self.search.setPlaceholderText(self.tr["search_placeholder"])
+        bind("search_placeholder", self.search.setPlaceholderText)
 
         self.conn_type = QComboBox()
         self.conn_type.setObjectName("ComboBox")
-        self.conn_type.addItems([
-            self.tr["select_conn"],
-            "WiFi", "Ethernet", "USB"
-        ])
+        self.conn_type.addItems(["", "WiFi", "Ethernet", "USB"])
+        bind("select_conn", lambda text: self.conn_type.setItemText(0, text))
 
         self.sensor_type = QComboBox()
         self.sensor_type.setObjectName("ComboBox")
-        self.sensor_type.addItems([
-            self.tr["select_sensor"],
-            self.tr["temperature"],
-            self.tr["pressure"],
-            self.tr["viscosity"]
-        ])
-
-        self.add_btn = QPushButton(self.tr["add_sensor"])
+        self.sensor_type.addItems([""] * 4)
+        for i, key in enumerate(("select_sensor", "temperature", "pressure", "viscosity")):
+            bind(key, lambda text, i=i: self.sensor_type.setItemText(i, text))
+
+        self.add_btn = QPushButton()
         self.add_btn.setObjectName("AddButton")
+        bind("add_sensor", self.add_btn.setText)
 
         filters.addWidget(self.search, 2)
         filters.addWidget(self.conn_type, 1)
@@ -125,9 +383,9 @@ class DashboardPage(QWidget):
         # Estadisticas
         cards = QHBoxLayout()
         cards.setSpacing(12)
-        self.card1 = self.createStatCard(self.tr["data"], "7,265", "+11.01%")
-        self.card2 = self.createStatCard(self.tr["sensors_connected"], "3")
-        self.card3 = self.createStatCard(self.tr["events_created"], "156", "+15.03%")
+        self.card1 = self.createStatCard("data", "7,265", "+11.01%")
+        self.card2 = self.createStatCard("sensors_connected", "3")
+        self.card3 = self.createStatCard("events_created", "156", "+15.03%")
         cards.addWidget(self.card1)
         cards.addWidget(self.card2)
         cards.addWidget(self.card3)
@@ -141,11 +399,18 @@ class DashboardPage(QWidget):
         chart_layout = QVBoxLayout(chart_frame)
         chart_layout.setContentsMargins(12, 12, 12, 12)
 
-        self.chart_title = QLabel(self.tr["total_data"])
+        self.chart_title = QLabel()
         self.chart_title.setObjectName("SectionTitle")
+        bind("total_data", self.chart_title.setText)
         chart_layout.addWidget(self.chart_title)
+        # Solo con un motor externo (attach_view): aparece cuando el motor cierra
+        self.stale_notice = QLabel(objectName="StaleNotice")
+        bind("engine_closed", self.stale_notice.setText)
+        self.stale_notice.hide()
+        chart_layout.addWidget(self.stale_notice)
 
         self.canvas = MplCanvas(self, width=6, height=2.6, dpi=100)
+        self.canvas.scheduler = self.scheduler
         self.canvas.plot_example(self.tr)
         chart_layout.addWidget(self.canvas)
 
@@ -154,46 +419,75 @@ class DashboardPage(QWidget):
         measures_layout = QVBoxLayout(measures)
         measures_layout.setContentsMargins(12, 12, 12, 12)
 
-        self.lbl_visc = QLabel(self.tr["viscosity"])
-        self.lbl_temp = QLabel(self.tr["temperature"])
-        self.lbl_dens = QLabel(self.tr["density"])
-        self.lbl_pres = QLabel(self.tr["pressure"])
-
-        measures_layout.addWidget(self.lbl_visc)
-        measures_layout.addWidget(self.lbl_temp)
-        measures_layout.addWidget(self.lbl_dens)
-        measures_layout.addWidget(self.lbl_pres)
+        self.lbl_visc = QLabel()
+        self.lbl_temp = QLabel()
+        self.lbl_dens = QLabel()
+        self.lbl_pres = QLabel()
+
+        self.measure_values = {}
+        self.measure_details = {}
+        for key, lbl in (
+            ("viscosity", self.lbl_visc), ("temperature", self.lbl_temp),
+            ("density", self.lbl_dens), ("pressure", self.lbl_pres)
+        ):
+            bind(key, lbl.setText)
+            value = QLabel("--", objectName="MeasureValue")
+            detail = QLabel("", objectName="MeasureDetail")
+            self.measure_values[key] = value
+            self.measure_details[key] = detail
+            measures_layout.addWidget(lbl)
+            measures_layout.addWidget(value)
+            measures_layout.addWidget(detail)
 
         middle.addWidget(chart_frame, 3)
         middle.addWidget(measures, 1)
 
         # Tabla
-        self.table_title = QLabel(self.tr["sensor_table"])
+        self.table_title = QLabel()
         self.table_title.setObjectName("SectionTitle")
+        bind("sensor_table", self.table_title.setText)
 
-        self.table = QTableWidget(4, 5)
+        self.model = SensorTableModel(headers=self.table_headers(), parent=self)
+        self.table = QTableView()
         self.table.setObjectName("SensorTable")
-        self.table.setHorizontalHeaderLabels([
-            self.tr["sensor"],
-            self.tr["serial"],
-            self.tr["status"],
-            self.tr["action"],
-            self.tr["edit"]
-        ])
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setStretchLastSection(False)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
         self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table.setSelectionMode(QAbstractItemView.NoSelection)
+        self.table.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
         self.table.setAlternatingRowColors(True)
 
-        self.data = [
-            ("SRD", "SRD-000-AC00", self.tr["status"], True),
-            ("DVM", "DVM-000-GG00", self.tr["status"], False),
-            ("SRV", "SRV-000-RT00", self.tr["status"], True),
-            ("DVP", "DVP-000-WD00", self.tr["status"], False),
-        ]
+        self.toggle_delegate = ToggleDelegate(self.table)
+        self.toggle_delegate.clicked.connect(lambda r: self.on_toggle_clicked(self.model.source_row(r)))
+        self.table.setItemDelegateForColumn(COL_ACTION, self.toggle_delegate)
+        self.edit_delegate = EditButtonDelegate(self.table)
+        self.edit_delegate.clicked.connect(lambda r: self.open_edit_dialog(self.model.source_row(r)))
+        self.table.setItemDelegateForColumn(COL_EDIT, self.edit_delegate)
+
+        self.set_registry(SensorRegistry([
+            ("SRD", "SRD-000-AC00", "WiFi", "temperature"),
+            ("DVM", "DVM-000-GG00", "Ethernet", "viscosity"),
+            ("SRV", "SRV-000-RT00", "USB", "viscosity"),
+            ("DVP", "DVP-000-WD00", "WiFi", "pressure"),
+        ], self.tr["status"]))
+        self.registry.active[:] = (True, False, True, False)
         self.populate_table()
 
+        # Filtrado con indices, la busqueda espera a que se deje de tipear
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(150)
+        self.filter_timer.timeout.connect(self.apply_filters)
+        self.search.textChanged.connect(lambda _: self.filter_timer.start())
+        self.conn_type.currentIndexChanged.connect(lambda _: self.apply_filters())
+        self.sensor_type.currentIndexChanged.connect(lambda _: self.apply_filters())
+
+        # Textos compuestos: encabezados, leyenda y medidas de analisis
+        self.i18n.on_change(self.update_translations)
+
         layout.addLayout(filters)
         layout.addLayout(cards)
         layout.addLayout(middle)
@@ -201,39 +495,71 @@ class DashboardPage(QWidget):
         layout.addWidget(self.table)
 
     # Poblar
+    def set_registry(self, registry):
+        self.registry = registry
+        registry.on_change(self.table_changed)
+
+    @timed("table.populate")
     def populate_table(self):
-        self.table.setRowCount(len(self.data))
-        for row, (sensor, sn, status, active) in enumerate(self.data):
-            self.table.setItem(row, 0, QTableWidgetItem(sensor))
-            self.table.setItem(row, 1, QTableWidgetItem(sn))
-            self.table.setItem(row, 2, QTableWidgetItem(status))
-            toggle = ToggleSwitch()
-            toggle.setChecked(active)
-            toggle.stateChanged.connect(lambda st, r=row: self.on_switch_toggled(r, st))
-            self.table.setCellWidget(row, 3, toggle)
-            edit_btn = QPushButton()
-            edit_btn.setObjectName("EditButton")
-            icon_path = os.path.join(BASE, "assets", "edit.png")
-            if os.path.exists(icon_path):
-                edit_btn.setIcon(QIcon(icon_path))
-            edit_btn.setFixedSize(QSize(28, 28))
-            edit_btn.clicked.connect(lambda _, r=row: self.open_edit_dialog(r))
-            self.table.setCellWidget(row, 4, edit_btn)
+        registry = self.registry
+        self.filter = SensorFilter(
+            registry.labels(), registry.conn, registry.kind,
+            len(CONN_TYPES), len(SENSOR_KINDS)
+        )
+        self.model.set_rows(registry, self.visible_rows())
+
+    def visible_rows(self):
+        conn = self.conn_type.currentIndex() - 1
+        kind = self.sensor_type.currentIndex() - 1
+        text = self.search.text()
+        if self.filter.deferred(text):
+            # Indice del texto sin terminar: se vuelve a filtrar en un rato
+            self.filter_timer.start()
+        return self.filter.query(
+            text,
+            conn if conn >= 0 else None,
+            kind if kind >= 0 else None
+        )
+
+    def apply_filters(self):
+        self.filter_timer.stop()
+        self.model.set_visible(self.visible_rows())
+
+    def table_headers(self):
+        return [
+            self.tr["sensor"],
+            self.tr["serial"],
+            self.tr["status"],
+            self.tr["action"],
+            self.tr["edit"]
+        ]
+
+    def table_changed(self, lo, hi):
+        # Llega del registro; la tabla junta los rangos hasta el proximo frame
+        self.model.mark_changed(lo, hi)
+        self.scheduler.post(("table", id(self.model)), self.table, self.model.flush_changes)
+
+    def on_toggle_clicked(self, row):
+        if self.read_only:
+            return
+        active = self.registry.active[row]
+        self.on_switch_toggled(row, Qt.Unchecked if active else Qt.Checked)
 
     def on_switch_toggled(self, row, state):
-        checked = state == Qt.Checked
-        sensor, sn, status, _ = self.data[row]
-        self.data[row] = (sensor, sn, status, checked)
+        self.toggle_delegate.animate(row, state == Qt.Checked)
+        self.registry.set_active(row, state == Qt.Checked)
 
     def open_edit_dialog(self, row):
-        sensor, sn, status, active = self.data[row]
+        if self.read_only:
+            return
+        sensor, sn, status, _ = self.registry.row(row)
         dlg = EditRowDialog(sensor, sn, status, tr=self.tr, parent=self)
         if dlg.exec() == QDialog.Accepted:
             s, serial, st = dlg.values()
-            self.data[row] = (s, serial, st, active)
-            self.table.item(row, 0).setText(s)
-            self.table.item(row, 1).setText(serial)
-            self.table.item(row, 2).setText(st)
+            self.registry.update(row, s, serial, st)
+            self.filter.update_text(row, f"{s} {serial}")
+            if self.search.text().strip():
+                self.apply_filters()
 
     # Tarjetas
     def createStatCard(self, title, value, change=None):
@@ -241,46 +567,225 @@ class DashboardPage(QWidget):
         card.setObjectName("StatCard")
         layout = QVBoxLayout(card)
         layout.setSpacing(4)
-        title_lbl = QLabel(title, objectName="CardTitle")
+        title_lbl = QLabel(objectName="CardTitle")
+        self.i18n.bind(title, title_lbl.setText)
         value_lbl = QLabel(value, objectName="CardValue")
         layout.addWidget(title_lbl)
         layout.addWidget(value_lbl)
+        card.value_lbl = value_lbl
+        card.change_lbl = None
         if change:
             change_lbl = QLabel(change, objectName="CardChange")
             layout.addWidget(change_lbl)
+            card.change_lbl = change_lbl
         return card
 
-    # Traducciones
-    def update_translations(self, lang, tr):
-        self.lang = lang
+    # Adquisicion
+    def attach_engine(self, engine, rules=None, snapshot=None):
+        # snapshot: instantanea de una ejecucion anterior con la misma fuente;
+        # se usa si coincide la cantidad de sensores
+        self.engine = engine
+        meta = snapshot.state.get("dashboard") if snapshot is not None else None
+        # Instantanea de otra fuente o incompleta: registro nuevo
+        if meta is not None and (
+            "registry.serial" not in snapshot
+            or len(snapshot.get("registry.serial")) != engine.sensor_count
+        ):
+            meta = None
+        if meta is not None:
+            self.set_registry(SensorRegistry.restore(meta["registry"], snapshot.group("registry")))
+            self.registry.rename_status(DEFAULT_STATUS, self.tr["status"])
+        else:
+            self.set_registry(SensorRegistry(engine.sensors(), self.tr["status"]))
+        self.fleet = Fleet(self.registry, rules)
+        self.populate_table()
+        self.canvas.start_streaming(self.stream_series())
+        self.lods = {"data": LodPyramid(), "events": LodPyramid()}
+        self.canvas.history_source = self.history_series
+        if meta is not None:
+            self.restore(meta, snapshot)
+        engine.batchesReady.connect(self.on_batches)
+
+    def attach_view(self, view, interval_ms=50):
+        # view: shared_fleet.FleetView. Los datos llegan ya procesados por el
+        # motor; la pagina solo los trae en cada tick y no edita el registro
+        self.fleet = view
+        self.read_only = True
+        self.set_registry(view.registry)
+        self.registry.rename_status(DEFAULT_STATUS, self.tr["status"])
+        self.populate_table()
+        self.canvas.start_streaming(self.stream_series())
+        self.lods = {"data": LodPyramid(), "events": LodPyramid()}
+        self.canvas.history_source = self.history_series
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_view)
+        self.poll_timer.start(interval_ms)
+        self.poll_view()
+
+    def poll_view(self):
+        # Se mira antes de leer: lo publicado antes de cerrar entra en este poll
+        closed = self.fleet.closed()
+        update = self.fleet.poll()
+        if closed:
+            # El motor termino: lo que se ve queda fijo y se deja de consultar
+            self.poll_timer.stop()
+            self.stale_notice.show()
+        if update is None:
+            return
+        (t, rate, event_rate), fresh = update
+        if len(t):
+            self.push_rates(t, rate, event_rate)
+        for row, page in self.detail_pages.items():
+            self.push_samples(row, page)
+        self.update_live_values()
+        if fresh:
+            self.update_analytics()
+
+    def push_samples(self, row, page):
+        self.cursors[row], ts, values = self.fleet.samples(row, self.cursors.get(row, 0))
+        if len(ts):
+            page.push(ts, values)
+
+    # Instantanea: lo que se ve en el dashboard, para mostrarlo apenas arranca
+    # la proxima ejecucion mientras la adquisicion se pone al dia
+    def state(self):
+        meta, arrays = self.fleet.state()
+        for key, stream in self.canvas.streams.items():
+            arrays[f"chart.{key}.x"] = stream.x.view().copy()
+            arrays[f"chart.{key}.y"] = stream.y.view().copy()
+        return meta, arrays
+
+    def restore(self, meta, snapshot):
+        self.fleet.restore(meta, snapshot)
+        chart = snapshot.group("chart")
+        for key in self.canvas.streams:
+            x, y = chart.get(f"{key}.x"), chart.get(f"{key}.y")
+            if x is not None and len(x):
+                self.canvas.push(key, x, y)
+                self.lods[key].append(x, y)
+        self.update_live_values()
+        self.update_analytics()
+
+    def attach_history(self, store):
+        self.history = store
+
+    def stream_series(self):
+        return [
+            ("data", self.tr["data"], {"linewidth": 2.5}),
+            ("events", self.tr["events_created"], {"linestyle": "--", "linewidth": 1.8}),
+        ]
+
+    def history_series(self):
+        return [
+            (key, self.lods[key], label, style)
+            for key, label, style in self.stream_series()
+        ]
+
+    def on_batches(self):
+        batches = self.engine.take()
+        if not batches:
+            return
+        for batch in batches:
+            self.ingest(batch)
+        self.update_live_values()
+        if self.fleet.analyze(time.monotonic()):
+            self.update_analytics()
+
+    def ingest(self, batch):
+        count = batch.values.shape[1]
+        _, point = self.fleet.ingest(batch)
+        for row, page in self.detail_pages.items():
+            if batch.offset <= row < batch.offset + count:
+                page.push(batch.timestamps, batch.values[:, row - batch.offset])
+        if self.history is not None:
+            self.history.append_block(
+                self.registry.serial_texts(batch.offset, batch.offset + count), CHANNELS,
+                batch.timestamps, batch.values
+            )
+        if point is not None:
+            t, rate, event_rate = point
+            self.push_rates((t,), (rate,), (event_rate,))
+
+    def push_rates(self, t, rate, event_rate):
+        self.canvas.push("data", t, rate)
+        self.canvas.push("events", t, event_rate)
+        self.lods["data"].append(t, rate)
+        self.lods["events"].append(t, event_rate)
+
+    def set_text(self, label, text):
+        # Solo el ultimo texto por label llega a pintarse, una vez por frame
+        self.scheduler.post(("text", id(label)), label, label.setText, text)
+
+    def update_live_values(self):
+        stats = self.fleet.stats()
+        self.set_text(self.card1.value_lbl, f"{stats['readings']:,}")
+        self.set_text(self.card1.change_lbl, format_change(stats["readings_change"]))
+        self.set_text(self.card2.value_lbl, f"{stats['connected']:,}")
+        self.set_text(self.card3.value_lbl, f"{stats['events']:,}")
+        self.set_text(self.card3.change_lbl, format_change(stats["events_change"]))
+        if stats["events"]:
+            self.scheduler.post(("tooltip", id(self.card3)), self.card3, self.card3.setToolTip, self.event_summary())
+        known, means = self.fleet.means()
+        for i, key in enumerate(CHANNELS):
+            if not known[i]:
+                self.set_text(self.measure_values[key], "--")
+            else:
+                self.set_text(self.measure_values[key], f"{means[i]:.3f} {self.UNITS[key]}")
+
+    def update_analytics(self):
+        summary = self.fleet.summary()
+        for i, key in enumerate(CHANNELS):
+            if summary is None:
+                self.set_text(self.measure_details[key], "")
+                continue
+            unit = self.UNITS[key]
+            self.set_text(self.measure_details[key], (
+                f"σ {summary['std'][i]:.3g} · {self.tr['noise']} {summary['noise'][i]:.3g}\n"
+                f"{self.tr['drift']} {summary['drift'][i]:+.2g} {unit}/s · {summary['peak_hz'][i]:.2f} Hz"
+            ))
+        for row, page in self.detail_pages.items():
+            metrics = self.fleet.metrics(row)
+            if metrics is not None:
+                page.update_analytics(metrics)
+
+    # Paginas de detalle
+    def open_detail(self, row):
+        from sensor_page import SensorPage
+        sensor = self.registry.sensor(row)
+        page = SensorPage(row, sensor, self.i18n, self.scheduler, self.UNITS)
+        if self.history is not None:
+            tails = self.history.tails(sensor[1], CHANNELS, page.capacity)
+            page.seed([t for t, _ in tails], [v for _, v in tails])
+        if self.read_only:
+            # Lo que el motor guarda de este sensor, y desde ahi en vivo
+            self.push_samples(row, page)
+        self.detail_pages[row] = page
+        return page
+
+    def close_detail(self, page):
+        self.detail_pages.pop(page.row, None)
+        self.cursors.pop(page.row, None)
+        page.release()
+
+    def shutdown(self):
+        if self.poll_timer is not None:
+            self.poll_timer.stop()
+        if self.fleet is not None:
+            self.fleet.close()
+
+    def event_summary(self, count=5):
+        lines = []
+        for t, row, rule, value in self.fleet.recent_events(count):
+            stamp = time.strftime("%H:%M:%S", time.localtime(t))
+            lines.append(f"{stamp}  {self.registry.serial_text(row)}  {rule}  {value:.3f}")
+        return "\n".join(lines)
+
+    # Traducciones: los textos simples se actualizan solos por sus claves
+    @timed("page.translations")
+    def update_translations(self, tr):
         self.tr = tr
-        # Filtros
-        self.search.setPlaceholderText(tr["search_placeholder"])
-        self.conn_type.setItemText(0, tr["select_conn"])
-        self.sensor_type.setItemText(0, tr["select_sensor"])
-        self.sensor_type.setItemText(1, tr["temperature"])
-        self.sensor_type.setItemText(2, tr["pressure"])
-        self.sensor_type.setItemText(3, tr["viscosity"])
-        self.add_btn.setText(tr["add_sensor"])
-        # Títulos
-        self.chart_title.setText(tr["total_data"])
-        self.table_title.setText(tr["sensor_table"])
-        # Medidas
-        self.lbl_visc.setText(tr["viscosity"])
-        self.lbl_temp.setText(tr["temperature"])
-        self.lbl_dens.setText(tr["density"])
-        self.lbl_pres.setText(tr["pressure"])
-        # Tarjetas
-        self.card1.layout().itemAt(0).widget().setText(tr["data"])
-        self.card2.layout().itemAt(0).widget().setText(tr["sensors_connected"])
-        self.card3.layout().itemAt(0).widget().setText(tr["events_created"])
-        # Tabla
-        self.table.setHorizontalHeaderLabels([
-            tr["sensor"],
-            tr["serial"],
-            tr["status"],
-            tr["action"],
-            tr["edit"]
-        ])
-        # Redibujar gráfico
-        self.canvas.plot_example(tr)
\ No newline at end of file
+        self.registry.rename_status(DEFAULT_STATUS, tr["status"])
+        self.model.set_headers(self.table_headers())
+        self.canvas.set_labels({"data": tr["data"], "events": tr["events_created"]})
+        if self.fleet is not None:
+            self.update_analytics()
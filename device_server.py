@@ -0,0 +1,165 @@
+import asyncio, argparse, json, threading, time
+from collections import namedtuple
+import numpy as np
+from acquisition import SimulatorSource, CONN_TYPES
+from devices import REQUEST, READING, READING_SIZE, OP_READ, OP_LIST, STATUS_OK, STATUS_ERROR, DEFAULT_PORTS, message
+
+# Comportamiento de cada enlace: latencia y jitter en segundos, fraccion de
+# pedidos que se pierden y tiempo por trama en enlaces serie (se atienden en orden)
+Link = namedtuple("Link", "latency jitter loss per_frame")
+LINKS = {
+    "WiFi": Link(0.004, 0.003, 0.01, 0.0),
+    "Ethernet": Link(0.0005, 0.0002, 0.0, 0.0),
+    "USB": Link(0.0, 0.0, 0.0, 20e-6),
+}
+
+
+# Equipos simulados detras de un gateway por tipo de conexion, para probar el
+# poller sin hardware. Usa el mismo simulador que la adquisicion local
+class DeviceServer:
+    def __init__(self, n_devices=1000, host="127.0.0.1", ports=None, links=None, seed=0):
+        self.host = host
+        self.ports = dict(DEFAULT_PORTS if ports is None else ports)
+        self.links = {**LINKS, **(links or {})}
+        self.sim = SimulatorSource(n_devices, seed=seed)
+        sensors = self.sim.sensors()
+        self.devices = {}
+        for i, (model, serial, conn, kind) in enumerate(sensors):
+            self.devices.setdefault(conn, []).append((i, model, serial, kind))
+        # Transporte de cada equipo, para rechazar pedidos que llegan por otro enlace
+        self.transport = np.array([CONN_TYPES.index(s[2]) for s in sensors], dtype=np.int64)
+        self.servers = []
+        self.clients = set()
+        self._rng = np.random.default_rng(seed)
+        self._loop = None
+        self._thread = None
+
+    async def start(self):
+        for transport, port in self.ports.items():
+            server = await asyncio.start_server(
+                lambda r, w, t=transport: self.handle(r, w, t), self.host, port
+            )
+            self.ports[transport] = server.sockets[0].getsockname()[1]
+            self.servers.append(server)
+        return self.ports
+
+    async def handle(self, reader, writer, transport):
+        link = self.links[transport]
+        code = CONN_TYPES.index(transport)
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        self.clients.add((task, writer))
+        buf = b""
+        try:
+            while True:
+                data = await reader.read(1 << 16)
+                if not data:
+                    break
+                buf += data
+                n = len(buf) // REQUEST.itemsize
+                if not n:
+                    continue
+                requests = np.frombuffer(buf, dtype=REQUEST, count=n)
+                buf = buf[n * REQUEST.itemsize:]
+                for req in requests[requests["op"] == OP_LIST]:
+                    payload = json.dumps(self.devices.get(transport, [])).encode("utf-8")
+                    writer.write(message(STATUS_OK, int(req["req"]), 0, payload))
+                reads = requests[requests["op"] == OP_READ]
+                if not len(reads):
+                    continue
+                if link.loss:
+                    reads = reads[self._rng.random(len(reads)) >= link.loss]
+                data = self.readings(reads, code)
+                if link.per_frame:
+                    # Enlace serie: una trama por vez, el resto espera en el socket
+                    await asyncio.sleep(link.per_frame * len(reads))
+                    writer.write(data)
+                elif link.latency:
+                    delay = link.latency + link.jitter * float(self._rng.random())
+                    loop.call_later(delay, self.write, writer, data)
+                else:
+                    writer.write(data)
+        except (OSError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients.discard((task, writer))
+            writer.close()
+
+    def readings(self, reads, code):
+        devices = reads["device"].astype(np.int64)
+        valid = (devices < len(self.transport))
+        valid[valid] = self.transport[devices[valid]] == code
+        frames = np.zeros(len(reads), dtype=READING)
+        frames["req"] = reads["req"]
+        frames["device"] = reads["device"]
+        frames["size"] = READING_SIZE
+        frames["status"] = np.where(valid, STATUS_OK, STATUS_ERROR)
+        if valid.any():
+            frames["values"][valid] = self.sim.sample(time.time(), devices[valid])
+        return frames.tobytes()
+
+    @staticmethod
+    def write(writer, data):
+        if not writer.is_closing():
+            writer.write(data)
+
+    # Hilo propio, para levantarlo junto a la app
+    def start_in_thread(self):
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.ports
+
+    def stop(self):
+        if self._loop is None:
+            return
+
+        async def close():
+            for server in self.servers:
+                server.close()
+            # Cerrar el listener no corta las conexiones ya abiertas
+            tasks = [task for task, _ in self.clients]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for server in self.servers:
+                await server.wait_closed()
+            self.servers = []
+
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="stand-in device gateways for offline testing")
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args()
+    server = DeviceServer(args.devices, args.host)
+
+    async def serve():
+        ports = await server.start()
+        for transport, port in ports.items():
+            print(f"{transport}: {args.host}:{port} ({len(server.devices.get(transport, []))} devices)")
+        await asyncio.gather(*(s.serve_forever() for s in server.servers))
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+import asyncio, json, threading, time
+from collections import deque
+import numpy as np
+from acquisition import SampleSource, CHANNELS
+
+# Protocolo binario con tramas de tamano fijo para las lecturas:
+#   pedido:    op (u8), req (u32), device (u32)
+#   respuesta: status (u8), req (u32), device (u32), size (u32), payload
+# `req` identifica la ronda de sondeo, asi las respuestas tardias se descartan
+OP_READ, OP_LIST = 1, 2
+STATUS_OK, STATUS_ERROR = 0, 1
+REQUEST = np.dtype([("op", "u1"), ("req", "<u4"), ("device", "<u4")])
+HEADER = np.dtype([("status", "u1"), ("req", "<u4"), ("device", "<u4"), ("size", "<u4")])
+READING = np.dtype(HEADER.descr + [("values", "<f4", (len(CHANNELS),))])
+READING_SIZE = READING.itemsize - HEADER.itemsize
+
+DEFAULT_PORTS = {"WiFi": 5020, "Ethernet": 5021, "USB": 5022}
+# Conexiones persistentes y pedidos en vuelo por conexion, segun el transporte
+POOL_SIZE = {"WiFi": 4, "Ethernet": 4, "USB": 1}
+PIPELINE = {"WiFi": 256, "Ethernet": 1024, "USB": 256}
+
+
+def request_frames(op, req, devices):
+    frames = np.empty(len(devices), dtype=REQUEST)
+    frames["op"] = op
+    frames["req"] = req
+    frames["device"] = devices
+    return frames.tobytes()
+
+
+def message(status, req, device, payload=b""):
+    header = np.array([(status, req, device, len(payload))], dtype=HEADER)
+    return header.tobytes() + payload
+
+
+# Conexion persistente con pedidos en cadena (pipelining): se mantienen hasta
+# `pipeline` pedidos sin respuesta y cada respuesta libera lugar para otro
+class Connection:
+    def __init__(self, poller, transport, host, port, pipeline):
+        self.poller = poller
+        self.transport = transport
+        self.host = host
+        self.port = port
+        self.pipeline = pipeline
+        self.reader = None
+        self.writer = None
+        self.task = None
+        self.round = 0
+        self.queue = np.zeros(0, dtype=np.uint32)
+        self.inflight = 0
+        self.failures = 0
+        self.retry_at = 0.0
+        self.connecting = False
+
+    @property
+    def up(self):
+        return self.writer is not None
+
+    async def connect(self, timeout):
+        self.connecting = True
+        try:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), timeout
+            )
+            self.failures = 0
+            self.task = asyncio.ensure_future(self.read_loop())
+            return True
+        except (OSError, asyncio.TimeoutError):
+            self.failures += 1
+            self.retry_at = time.monotonic() + self.poller.backoff(self.failures)
+            return False
+        finally:
+            self.connecting = False
+
+    def send(self, data):
+        if self.writer is not None:
+            self.writer.write(data)
+
+    def send_round(self, round_id, devices):
+        self.round = round_id
+        self.queue = devices
+        self.inflight = 0
+        self.pump()
+
+    def pump(self):
+        k = min(self.pipeline - self.inflight, len(self.queue))
+        if k <= 0 or self.writer is None:
+            return
+        self.writer.write(request_frames(OP_READ, self.round, self.queue[:k]))
+        self.queue = self.queue[k:]
+        self.inflight += k
+
+    async def read_loop(self):
+        buf = b""
+        try:
+            while True:
+                data = await self.reader.read(1 << 16)
+                if not data:
+                    break
+                buf = self.parse(buf + data)
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.drop()
+
+    def parse(self, buf):
+        pos = 0
+        while len(buf) - pos >= HEADER.itemsize:
+            size = int.from_bytes(buf[pos + 9:pos + 13], "little")
+            if size == READING_SIZE:
+                # Camino rapido: un tramo de lecturas se decodifica de una vez
+                n = (len(buf) - pos) // READING.itemsize
+                if n == 0:
+                    break
+                frames = np.frombuffer(buf, dtype=READING, count=n, offset=pos)
+                bad = np.flatnonzero(frames["size"] != READING_SIZE)
+                if len(bad):
+                    n = int(bad[0])
+                    frames = frames[:n]
+                self.inflight = max(0, self.inflight - n)
+                self.poller.on_readings(frames)
+                pos += n * READING.itemsize
+                self.pump()
+                continue
+            end = pos + HEADER.itemsize + size
+            if end > len(buf):
+                break
+            self.poller.on_message(buf[pos:end])
+            pos = end
+        return buf[pos:]
+
+    def drop(self):
+        if self.writer is None:
+            return
+        self.writer.close()
+        self.reader = self.writer = None
+        self.queue = self.queue[:0]
+        self.inflight = 0
+        self.failures += 1
+        self.retry_at = time.monotonic() + self.poller.backoff(self.failures)
+        self.poller.stats["disconnects"] += 1
+
+
+# Sondeo de equipos en un hilo propio con asyncio. Cada ronda pide una lectura
+# a todos los equipos al dia; los que no responden antes del timeout pasan a
+# espera exponencial. Las rondas completas se entregan en bloque via drain().
+class DevicePoller:
+    def __init__(self, endpoints, rate=10.0, timeout=None, pool_size=None, pipeline=None,
+                 backoff_base=0.5, backoff_max=30.0, max_rounds=None):
+        self.endpoints = dict(endpoints)
+        self.rate = float(rate)
+        self.period = 1.0 / self.rate
+        self.timeout = timeout or 0.8 * self.period
+        self.pool_size = {**POOL_SIZE, **(pool_size or {})}
+        self.pipeline = {**PIPELINE, **(pipeline or {})}
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pools = {}
+        self.devices = []
+        self.stats = {"rounds": 0, "requests": 0, "answered": 0, "timeouts": 0, "disconnects": 0, "late": 0}
+        self._rng = np.random.default_rng()
+        self._out = deque(maxlen=max_rounds or int(10 * self.rate))
+        self._out_lock = threading.Lock()
+        self._waiters = {}
+        self._loop = None
+        self._thread = None
+        self._task = None
+        self.round_id = 0
+
+    def backoff(self, failures):
+        # Espera exponencial con jitter para no sincronizar los reintentos
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (failures - 1))
+        return delay * self._rng.uniform(0.5, 1.0)
+
+    # Hilo y ciclo de eventos
+    def start(self, timeout=5.0):
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.call_soon(ready.set)
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        asyncio.run_coroutine_threadsafe(self.discover(timeout), self._loop).result()
+        return self.devices
+
+    def begin(self):
+        self._task = asyncio.run_coroutine_threadsafe(self.run(), self._loop)
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
+        self._thread = None
+
+    async def shutdown(self):
+        if self._task is not None:
+            self._task.cancel()
+        for pool in self.pools.values():
+            for conn in pool:
+                conn.drop()
+
+    # Descubrimiento
+    async def discover(self, timeout):
+        for transport, (host, port) in self.endpoints.items():
+            pool = [
+                Connection(self, transport, host, port, self.pipeline.get(transport, 256))
+                for _ in range(self.pool_size.get(transport, 1))
+            ]
+            results = await asyncio.gather(*(c.connect(timeout) for c in pool))
+            if not any(results):
+                continue
+            self.pools[transport] = pool
+            conn = next(c for c in pool if c.up)
+            req = len(self._waiters) + 1
+            waiter = self._waiters[req] = asyncio.get_running_loop().create_future()
+            conn.send(request_frames(OP_LIST, req, [0]))
+            try:
+                listing = await asyncio.wait_for(waiter, timeout)
+            except asyncio.TimeoutError:
+                continue
+            finally:
+                self._waiters.pop(req, None)
+            for device, model, serial, kind in listing:
+                self.devices.append((device, model, serial, transport, kind))
+        n = len(self.devices)
+        ids = np.array([d[0] for d in self.devices], dtype=np.int64)
+        self.row_of = np.full(int(ids.max()) + 1 if n else 0, -1, dtype=np.int64)
+        self.row_of[ids] = np.arange(n)
+        # Equipos de cada conexion: reparto fijo por turno dentro del transporte
+        self.assigned = {}
+        for transport, pool in self.pools.items():
+            rows = np.array([i for i, d in enumerate(self.devices) if d[3] == transport], dtype=np.int64)
+            for k, conn in enumerate(pool):
+                self.assigned[conn] = rows[k::len(pool)]
+        self.device_ids = ids.astype(np.uint32)
+        self.failures = np.zeros(n, dtype=np.int32)
+        self.next_due = np.zeros(n)
+        self.values = np.full((n, len(CHANNELS)), np.nan, dtype=np.float32)
+        self.got = np.zeros(n, dtype=bool)
+        self.remaining = 0
+        self.done = asyncio.Event()
+
+    def on_message(self, data):
+        header = np.frombuffer(data, dtype=HEADER, count=1)[0]
+        waiter = self._waiters.get(int(header["req"]))
+        if waiter is not None and not waiter.done():
+            waiter.set_result(json.loads(data[HEADER.itemsize:].decode("utf-8")))
+
+    def on_readings(self, frames):
+        current = frames["req"] == self.round_id
+        self.stats["late"] += int(len(frames) - np.count_nonzero(current))
+        frames = frames[current & (frames["status"] == STATUS_OK)]
+        if not len(frames):
+            return
+        devices = frames["device"].astype(np.int64)
+        rows = np.full(len(devices), -1, dtype=np.int64)
+        known = devices < len(self.row_of)
+        rows[known] = self.row_of[devices[known]]
+        frames, rows = frames[rows >= 0], rows[rows >= 0]
+        fresh = ~self.got[rows]
+        self.values[rows] = frames["values"]
+        self.got[rows] = True
+        self.remaining -= int(np.count_nonzero(fresh))
+        if self.remaining <= 0:
+            self.done.set()
+
+    # Rondas
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await self.poll_round()
+            await asyncio.sleep(max(0.0, start + self.period - loop.time()))
+
+    async def poll_round(self):
+        now = time.monotonic()
+        self.reconnect(now)
+        self.round_id = (self.round_id + 1) & 0xFFFFFFFF
+        ts = time.time()
+        self.values[:] = np.nan
+        self.got[:] = False
+        self.done.clear()
+        due = self.next_due <= now
+        asked = np.zeros(len(self.devices), dtype=bool)
+        for conn, rows in self.assigned.items():
+            if not conn.up:
+                continue
+            rows = rows[due[rows]]
+            asked[rows] = True
+            conn.send_round(self.round_id, self.device_ids[rows])
+        self.remaining = int(np.count_nonzero(asked))
+        self.stats["requests"] += self.remaining
+        if self.remaining:
+            try:
+                await asyncio.wait_for(self.done.wait(), self.timeout)
+            except asyncio.TimeoutError:
+                pass
+        # Los equipos al dia que no respondieron (o sin conexion) esperan mas
+        failed = due & ~self.got
+        self.failures[self.got] = 0
+        self.failures[failed] += 1
+        if failed.any():
+            delays = np.minimum(self.backoff_max, self.backoff_base * 2.0 ** (self.failures[failed] - 1))
+            self.next_due[failed] = now + delays * self._rng.uniform(0.5, 1.0, len(delays))
+        self.stats["rounds"] += 1
+        self.stats["answered"] += int(np.count_nonzero(self.got))
+        self.stats["timeouts"] += int(np.count_nonzero(failed))
+        with self._out_lock:
+            self._out.append((ts, self.values.copy()))
+
+    def reconnect(self, now):
+        for pool in self.pools.values():
+            for conn in pool:
+                if not conn.up and not conn.connecting and conn.retry_at <= now:
+                    asyncio.ensure_future(conn.connect(self.timeout))
+
+    def drain(self):
+        with self._out_lock:
+            rounds = list(self._out)
+            self._out.clear()
+        if not rounds:
+            return None
+        return np.array([r[0] for r in rounds]), np.stack([r[1] for r in rounds])
+
+
+# Fuente de adquisicion sobre equipos reales (o el simulador de red). Las
+# lecturas faltantes de una ronda llegan como NaN
+class DeviceSource(SampleSource):
+    def __init__(self, endpoints, rate=10.0, **options):
+        self.poller = DevicePoller(endpoints, rate, **options)
+        self.poller.start()
+
+    def sensors(self):
+        return [(model, serial, transport, kind) for _, model, serial, transport, kind in self.poller.devices]
+
+    def open(self):
+        self.poller.begin()
+
+    def read(self, now):
+        return self.poller.drain()
+
+    def close(self):
+        self.poller.stop()
@@ -0,0 +1,117 @@
+import json
+from collections import namedtuple
+import numpy as np
+from acquisition import CHANNELS
+
+THRESHOLD, RATE, HYSTERESIS = "threshold", "rate", "hysteresis"
+
+# threshold: sube al pasar `limit` (o bajar de el si above es False)
+# rate: |dv/dt| por segundo mayor que `limit`
+# hysteresis: se activa sobre `limit` y se libera recien bajo `clear`
+Rule = namedtuple("Rule", "name channel kind limit clear above", defaults=(None, True))
+
+DEFAULT_RULES = [
+    Rule("high_viscosity", "viscosity", HYSTERESIS, 13.5, 13.2),
+    Rule("low_density", "density", THRESHOLD, 0.92, above=False),
+    Rule("temperature_jump", "temperature", RATE, 50.0),
+    Rule("high_pressure", "pressure", THRESHOLD, 1.35),
+]
+
+EVENT_DTYPE = np.dtype([("t", "f8"), ("sensor", "i4"), ("rule", "i2"), ("value", "f4")])
+
+
+def load_rules(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [Rule(**item) for item in json.load(f)]
+
+
+# Registro acotado de eventos recientes
+class EventLog:
+    def __init__(self, capacity=10_000):
+        self.records = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.head = 0
+        self.size = 0
+
+    def extend(self, events):
+        cap = len(self.records)
+        if len(events) > cap:
+            events = events[-cap:]
+        idx = (self.head + np.arange(len(events))) % cap
+        self.records[idx] = events
+        self.head = (self.head + len(events)) % cap
+        self.size = min(cap, self.size + len(events))
+
+    def state(self):
+        return {"head": self.head, "size": self.size}, {"records": self.records.copy()}
+
+    def restore(self, meta, arrays):
+        records = arrays["records"]
+        if records.dtype != self.records.dtype or len(records) != len(self.records):
+            return
+        self.records[:] = records
+        self.head = meta["head"]
+        self.size = meta["size"]
+
+    def recent(self, count):
+        count = min(count, self.size)
+        idx = (self.head - 1 - np.arange(count)) % len(self.records)
+        return self.records[idx]
+
+
+# Motor de reglas: cada tick se evalua como operaciones sobre (sensores, reglas)
+class EventEngine:
+    def __init__(self, n_sensors, rules=None):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self.n_sensors = n_sensors
+        self.channel = np.array([CHANNELS.index(r.channel) for r in self.rules], dtype=np.intp)
+        self.limit = np.array([r.limit for r in self.rules], dtype=np.float32)
+        self.clear = np.array([r.limit if r.clear is None else r.clear for r in self.rules], dtype=np.float32)
+        self.sign = np.array([1.0 if r.above else -1.0 for r in self.rules], dtype=np.float32)
+        self.is_rate = np.array([r.kind == RATE for r in self.rules])
+        self.is_hyst = np.array([r.kind == HYSTERESIS for r in self.rules])
+        # Las reglas "por debajo" se evaluan con el signo invertido
+        self.upper = np.where(self.is_rate, self.limit, self.limit * self.sign)
+        self.lower = np.where(self.is_rate, self.limit, self.clear * self.sign)
+        self.active = np.zeros((n_sensors, len(self.rules)), dtype=bool)
+        # Ultima lectura valida por sensor y canal, y cuando llego
+        self.prev = np.full((n_sensors, len(CHANNELS)), np.nan, dtype=np.float32)
+        self.prev_t = np.full((n_sensors, len(CHANNELS)), np.nan)
+        self.log = EventLog()
+
+    def evaluate(self, offset, timestamps, values):
+        # values: (muestras, sensores, canales). Devuelve los eventos nuevos
+        count = values.shape[1]
+        rows = slice(offset, offset + count)
+        active = self.active[rows]
+        prev, prev_t = self.prev[rows], self.prev_t[rows]
+        found = []
+        for t, sample in zip(timestamps, values):
+            v = sample[:, self.channel]
+            # Las reglas de tasa comparan la derivada en vez del valor
+            dt = t - prev_t[:, self.channel]
+            rate = np.abs(v - prev[:, self.channel]) / np.where(dt > 0, dt, np.nan)
+            metric = np.where(self.is_rate, rate, v * self.sign)
+            over = metric > self.upper
+            # Histeresis: sigue activa hasta bajar de clear
+            hold = self.is_hyst & active & (metric >= self.lower)
+            # Una lectura perdida (NaN) no dice nada: el estado queda como estaba,
+            # si no la siguiente lectura valida dispararia de nuevo
+            now = np.where(np.isnan(metric), active, over | hold)
+            new = now & ~active
+            active[:] = now
+            seen = ~np.isnan(sample)
+            np.copyto(prev, sample, where=seen)
+            prev_t[seen] = t
+            if new.any():
+                sensors, rules = np.nonzero(new)
+                ev = np.empty(len(sensors), dtype=EVENT_DTYPE)
+                ev["t"] = t
+                ev["sensor"] = sensors + offset
+                ev["rule"] = rules
+                # Las reglas de tasa guardan la tasa que las disparo
+                ev["value"] = np.where(self.is_rate[rules], metric[sensors, rules], v[sensors, rules])
+                found.append(ev)
+        events = np.concatenate(found) if found else np.zeros(0, dtype=EVENT_DTYPE)
+        if len(events):
+            self.log.extend(events)
+        return events
@@ -0,0 +1,109 @@
+import numpy as np
+from acquisition import CHANNELS
+from aggregates import DashboardAggregates
+from events import EventEngine
+from analytics import AnalyticsEngine, MAX_SENSORS
+
+
+# Estado de la flota sin interfaz: lo que se calcula con cada lote. Lo usa el
+# dashboard cuando adquiere en su propio proceso y el motor sin ventana que
+# publica en memoria compartida; las vistas de ese bloque (FleetView) leen con
+# los mismos metodos, asi el dashboard no distingue de donde vienen los datos.
+class Fleet:
+    def __init__(self, registry, rules=None, max_analyzed=MAX_SENSORS):
+        self.registry = registry
+        n = len(registry)
+        self.latest = np.full((n, len(CHANNELS)), np.nan, dtype=np.float32)
+        self.aggregates = DashboardAggregates(n)
+        self.events = EventEngine(n, rules)
+        # El analisis espectral cubre solo las primeras max_analyzed filas: el
+        # resumen es una mediana y no necesita toda la flota
+        self.analytics = AnalyticsEngine(min(n, max_analyzed), len(CHANNELS))
+        self.last_ts = None
+
+    def ingest(self, batch):
+        # Devuelve (eventos, punto): punto es (t, lecturas/s, eventos/s) para
+        # los graficos de tasas, o None en el primer lote
+        count = batch.values.shape[1]
+        last = batch.values[-1]
+        np.copyto(self.latest[batch.offset:batch.offset + count], last, where=~np.isnan(last))
+        self.aggregates.add_batch(batch.offset, batch.timestamps, batch.values)
+        events = self.events.evaluate(batch.offset, batch.timestamps, batch.values)
+        self.aggregates.add_events(events["t"])
+        if self.analytics is not None:
+            self.analytics.add(batch.offset, batch.timestamps, batch.values)
+        t = batch.timestamps[-1]
+        point = None
+        if self.last_ts is not None and t > self.last_ts:
+            rate = np.count_nonzero(~np.isnan(batch.values)) / (t - self.last_ts)
+            point = (t, rate, len(events) / (t - self.last_ts))
+        self.last_ts = t
+        return events, point
+
+    def analyze(self, now):
+        # El pool de analisis trabaja fuera del proceso; aca solo se recoge y
+        # se lanza. True cuando hay resultados nuevos. Cerrada la flota, los
+        # lotes que quedaron en cola solo actualizan los agregados
+        if self.analytics is None:
+            return False
+        fresh = self.analytics.collect()
+        self.analytics.submit(now)
+        return fresh
+
+    # Lectura
+    def stats(self):
+        return self.aggregates.snapshot(self.registry.active)
+
+    def means(self):
+        # Promedio de la ultima lectura conocida de cada sensor activo, y
+        # cuantos sensores la tienen, por canal
+        latest = self.latest[self.registry.active]
+        known = np.count_nonzero(~np.isnan(latest), axis=0)
+        return known, np.nansum(latest, axis=0) / np.maximum(known, 1)
+
+    def summary(self):
+        if self.analytics is None:
+            return None
+        return self.analytics.summary(self.registry.active)
+
+    def metrics(self, row):
+        if self.analytics is None or row >= self.analytics.n_sensors or not self.analytics.valid[row]:
+            return None
+        return self.analytics.result[row]
+
+    def recent_events(self, count):
+        # (t, fila, nombre de la regla, valor), el mas nuevo primero
+        rules = self.events.rules
+        return [
+            (float(ev["t"]), int(ev["sensor"]), rules[ev["rule"]].name, float(ev["value"]))
+            for ev in self.events.log.recent(count)
+        ]
+
+    # Instantanea
+    def parts(self):
+        parts = [("registry", self.registry), ("aggregates", self.aggregates), ("events", self.events.log)]
+        if self.analytics is not None:
+            parts.append(("analytics", self.analytics))
+        return parts
+
+    def state(self):
+        # (metadatos JSON, arreglos por nombre); los arreglos son copias
+        meta, arrays = {}, {"latest.values": self.latest.copy()}
+        for name, part in self.parts():
+            meta[name], part_arrays = part.state()
+            arrays.update({f"{name}.{k}": v for k, v in part_arrays.items()})
+        return meta, arrays
+
+    def restore(self, meta, snapshot):
+        # El registro ya se restauro al crear la flota
+        for name, part in self.parts():
+            if name != "registry" and name in meta:
+                part.restore(meta[name], snapshot.group(name))
+        latest = snapshot.get("latest.values")
+        if latest.shape == self.latest.shape:
+            self.latest[:] = latest
+
+    def close(self):
+        if self.analytics is not None:
+            self.analytics.close()
+            self.analytics = None
@@ -0,0 +1,300 @@
+import os, json, threading
+import numpy as np
+
+# Registros por archivo de chunk; los archivos crecen a medida que se escriben
+CHUNK_SIZE = 1 << 20
+FORMAT = 2
+TS_DTYPE = np.float64
+VAL_DTYPE = np.float32
+
+
+def write_json_atomic(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def sync_files(paths, folder):
+    # Datos de los archivos y la entrada del directorio en disco
+    for path in paths:
+        with open(path, "rb") as f:
+            getattr(os, "fdatasync", os.fsync)(f.fileno())
+    if os.name == "posix":
+        fd = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def record_dtype(channels):
+    # Un registro por muestra: timestamp y los valores de todos los canales
+    return np.dtype([("ts", TS_DTYPE), ("val", VAL_DTYPE, (len(channels),))])
+
+
+def empty():
+    return np.zeros(0, dtype=TS_DTYPE), np.zeros(0, dtype=VAL_DTYPE)
+
+
+def join(views):
+    # Una sola vista se devuelve tal cual (sin copia); varias se concatenan
+    if not views:
+        return empty()
+    if len(views) == 1:
+        return views[0]
+    return np.concatenate([v[0] for v in views]), np.concatenate([v[1] for v in views])
+
+
+def merge(parts):
+    # [(canales, registros)] -> lo mismo, con los tramos seguidos de iguales
+    # canales unidos para escribirlos de una vez
+    merged = []
+    for channels, records in parts:
+        if merged and merged[-1][0] == channels:
+            merged[-1][1].append(records)
+        else:
+            merged.append((channels, [records]))
+    return [(channels, np.concatenate(blocks) if len(blocks) > 1 else blocks[0]) for channels, blocks in merged]
+
+
+# Historial de un sensor: todos sus canales en archivos de registros que solo
+# crecen, uno por chunk de hasta chunk_size registros. Lo escribe solo el
+# hilo del writer; los lectores toman una copia de la lista de chunks y
+# mapean lo confirmado, que nunca se reescribe
+class SensorLog:
+    def __init__(self, path, chunks, chunk_size):
+        self.path = path
+        self.chunk_size = chunk_size
+        # [primer timestamp, ultimo timestamp, registros confirmados, canales] por chunk
+        self.chunks = []
+        for i, (first, channels) in enumerate(chunks):
+            dtype = record_dtype(channels)
+            file = self.file(i)
+            size = os.path.getsize(file) if os.path.exists(file) else 0
+            n = min(chunk_size, size // dtype.itemsize)
+            if size != n * dtype.itemsize:
+                # Registro a medias de una ejecucion que se corto: se descarta
+                os.truncate(file, n * dtype.itemsize)
+            last = float(np.memmap(file, dtype=dtype, mode="r", shape=(n,))["ts"][-1]) if n else first
+            self.chunks.append([first, last, n, list(channels)])
+        # Chunks escritos desde el ultimo sync()
+        self.unsynced = set()
+
+    def file(self, chunk):
+        return os.path.join(self.path, f"{chunk:06d}.rec")
+
+    def manifest(self):
+        return [[first, channels] for first, _, _, channels in self.chunks]
+
+    def write(self, records, channels):
+        # records: arreglo de record_dtype(channels) en orden de tiempo.
+        # Devuelve True si empezo un chunk nuevo (cambia el manifiesto)
+        started = False
+        pos = 0
+        while pos < len(records):
+            info = self.chunks[-1] if self.chunks else None
+            fresh = info is None or info[2] == self.chunk_size or info[3] != channels
+            if fresh:
+                os.makedirs(self.path, exist_ok=True)
+                info = [float(records["ts"][pos]), float(records["ts"][pos]), 0, list(channels)]
+                self.chunks.append(info)
+                started = True
+            n = min(len(records) - pos, self.chunk_size - info[2])
+            part = records[pos:pos + n]
+            # Un chunk sin registros confirmados se trunca: puede quedar un
+            # archivo de una ejecucion cortada antes de guardar el manifiesto
+            with open(self.file(len(self.chunks) - 1), "wb" if info[2] == 0 else "r+b") as f:
+                f.seek(info[2] * part.dtype.itemsize)
+                f.write(part.tobytes())
+            self.unsynced.add(len(self.chunks) - 1)
+            # Escrito: recien ahora los lectores ven los registros
+            info[1] = float(part["ts"][-1])
+            info[2] += n
+            pos += n
+        return started
+
+    def sync(self):
+        if self.unsynced:
+            sync_files([self.file(i) for i in sorted(self.unsynced)], self.path)
+            self.unsynced = set()
+
+    def chunk_views(self, channel, t0, t1, cache):
+        # (chunk, registros) de los chunks que tocan [t0, t1) y tienen el canal
+        out = []
+        for i, (first, last, n, channels) in enumerate(list(self.chunks)):
+            if n == 0 or channel not in channels or last < t0 or first >= t1:
+                continue
+            key = (i, n)
+            if key not in cache:
+                cache[key] = np.memmap(self.file(i), dtype=record_dtype(channels), mode="r", shape=(n,))
+            out.append((channels.index(channel), cache[key]))
+        return out
+
+    def read_chunks(self, channel, t0, t1, cache=None):
+        # Vistas sin copia, una por chunk que toca el rango [t0, t1)
+        views = []
+        for c, rec in self.chunk_views(channel, t0, t1, {} if cache is None else cache):
+            ts = rec["ts"]
+            lo = int(np.searchsorted(ts, t0, "left"))
+            hi = int(np.searchsorted(ts, t1, "left"))
+            if hi > lo:
+                views.append((ts[lo:hi], rec["val"][lo:hi, c]))
+        return views
+
+    def tail(self, channel, count, cache=None):
+        views = []
+        for c, rec in reversed(self.chunk_views(channel, -np.inf, np.inf, {} if cache is None else cache)):
+            take = min(len(rec), count)
+            views.append((rec["ts"][len(rec) - take:], rec["val"][len(rec) - take:, c]))
+            count -= take
+            if count <= 0:
+                break
+        views.reverse()
+        return views
+
+
+# Store. Durabilidad: un flush() deja los registros en el cache del sistema,
+# asi que un corte del proceso no pierde nada ya escrito; ante un corte de
+# energia se pueden perder los registros de los ultimos flush. Al abrir, la
+# cantidad de cada chunk sale del tamano de su archivo y un registro a medias
+# se descarta. Los archivos de un chunk nuevo se sincronizan antes de guardar
+# el manifiesto que lo nombra, asi el manifiesto nunca apunta a un chunk que
+# no llego al disco
+class HistoryStore:
+    def __init__(self, root, chunk_size=CHUNK_SIZE):
+        self.root = root
+        self.chunk_size = chunk_size
+        os.makedirs(root, exist_ok=True)
+        self.manifest_path = os.path.join(root, "manifest.json")
+        self.manifest = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") != FORMAT:
+                raise ValueError(f"{root}: unsupported history format {data.get('format')}")
+            self.chunk_size = data["chunk_size"]
+            self.manifest = data["sensors"]
+        # _lock solo cubre la cola y el indice en memoria, nunca E/S: la
+        # interfaz encola sin esperar al disco. _io deja un flush a la vez
+        self._lock = threading.Lock()
+        self._io = threading.Lock()
+        self._pending = []
+        self._logs = {}
+        self._writer = None
+        self._stop = threading.Event()
+
+    def keys(self):
+        with self._lock:
+            sensors = list(self.manifest.items())
+        return [
+            (sensor, channel)
+            for sensor, chunks in sensors
+            for channel in dict.fromkeys(c for _, channels in chunks for c in channels)
+        ]
+
+    def log(self, sensor):
+        with self._lock:
+            log = self._logs.get(sensor)
+            chunks = self.manifest.get(sensor, [])
+        if log is None:
+            # Abrir mira los tamanos de los archivos: fuera del lock
+            log = SensorLog(os.path.join(self.root, sensor), chunks, self.chunk_size)
+            with self._lock:
+                log = self._logs.setdefault(sensor, log)
+        return log
+
+    # Escritura
+    def append(self, sensor, channel, ts, values):
+        self.append_block([sensor], [channel], ts, np.asarray(values).reshape(-1, 1, 1))
+
+    def append_block(self, sensors, channels, ts, values):
+        # values: (muestras, sensores, canales), como los lotes de adquisicion.
+        # Solo se encola; flush() reparte y escribe todo en bloque
+        with self._lock:
+            self._pending.append((list(sensors), list(channels), np.asarray(ts, dtype=TS_DTYPE), values))
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        with self._io:
+            # Los lotes seguidos de los mismos sensores y canales se unen antes
+            # de armar registros: unir arreglos planos es mucho mas barato
+            blocks = []
+            for sensors, channels, ts, values in pending:
+                if blocks and blocks[-1][0] == sensors and blocks[-1][1] == channels:
+                    blocks[-1][2].append(ts)
+                    blocks[-1][3].append(np.asarray(values))
+                else:
+                    blocks.append((sensors, channels, [ts], [np.asarray(values)]))
+            grouped = {}
+            for sensors, channels, ts, values in blocks:
+                # (sensores, muestras) registros: cada fila es contigua y va
+                # al archivo de su sensor en una sola escritura
+                ts = np.concatenate(ts) if len(ts) > 1 else ts[0]
+                values = np.concatenate(values) if len(values) > 1 else values[0]
+                records = np.empty((len(sensors), len(ts)), dtype=record_dtype(channels))
+                records["ts"] = ts
+                records["val"] = np.moveaxis(values, 1, 0)
+                for s, sensor in enumerate(sensors):
+                    grouped.setdefault(sensor, []).append((channels, records[s]))
+            changed = {}
+            for sensor, parts in grouped.items():
+                log = self.log(sensor)
+                started = False
+                for channels, records in merge(parts):
+                    started |= log.write(records, channels)
+                if started:
+                    changed[sensor] = log.manifest()
+            # El manifiesto solo guarda donde empieza cada chunk; las cantidades
+            # salen del tamano de los archivos, asi que cambia poco. Antes de
+            # guardarlo se sincronizan los archivos que nombra por primera vez
+            if changed:
+                for sensor in changed:
+                    self.log(sensor).sync()
+                with self._lock:
+                    self.manifest.update(changed)
+                    data = {"format": FORMAT, "chunk_size": self.chunk_size, "sensors": dict(self.manifest)}
+                write_json_atomic(self.manifest_path, data)
+
+    def start_writer(self, interval=1.0):
+        if self._writer is not None:
+            return
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.flush()
+
+        self._stop.clear()
+        self._writer = threading.Thread(target=loop, daemon=True)
+        self._writer.start()
+
+    # Lectura: sin esperar al writer, solo lo ya confirmado
+    def read(self, sensor, channel, t0=-np.inf, t1=np.inf):
+        # Vista sin copia si el rango cae en un solo chunk
+        return join(self.read_chunks(sensor, channel, t0, t1))
+
+    def read_chunks(self, sensor, channel, t0=-np.inf, t1=np.inf):
+        return self.log(sensor).read_chunks(channel, t0, t1)
+
+    def tail(self, sensor, channel, count):
+        return join(self.log(sensor).tail(channel, count))
+
+    def tails(self, sensor, channels, count):
+        # Varios canales de un sensor mapeando cada chunk una sola vez
+        log, cache = self.log(sensor), {}
+        return [join(log.tail(channel, count, cache)) for channel in channels]
+
+    def close(self):
+        if self._writer is not None:
+            self._stop.set()
+            self._writer.join()
+            self._writer = None
+        self.flush()
+        # Las vistas ya entregadas mantienen vivo su mmap por referencia
+        with self._lock:
+            self._logs.clear()
@@ -0,0 +1,81 @@
+import os, json
+
+
+# Catalogo compilado: las claves de todos los i18n/*.json quedan en un indice
+# unico y cada idioma es una tupla de textos en ese orden. Agregar un idioma es
+# agregar un .json; las claves que le falten caen al idioma base.
+class Catalog:
+    def __init__(self, folder, base="en"):
+        tables = {}
+        for name in sorted(os.listdir(folder)):
+            if name.endswith(".json"):
+                with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                    tables[name[:-5]] = json.load(f)
+        self.languages = list(tables)
+        self.keys = sorted(set().union(*tables.values()))
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        fallback = tables.get(base, {})
+        self.strings = {
+            lang: tuple(table.get(key, fallback.get(key, key)) for key in self.keys)
+            for lang, table in tables.items()
+        }
+        # Vista por clave para el codigo que arma textos compuestos
+        self.tables = {lang: dict(zip(self.keys, strings)) for lang, strings in self.strings.items()}
+
+
+# Traductor: cada widget registra las claves que muestra. Al cambiar de idioma
+# solo se llaman los setters cuyo texto cambia; los textos compuestos (tablas,
+# leyendas, arboles) se enganchan con on_change y reciben el diccionario nuevo.
+# owner agrupa registros para soltarlos juntos cuando el widget se destruye.
+class Translator:
+    def __init__(self, catalog, lang):
+        self.catalog = catalog
+        self.lang = lang
+        self.strings = catalog.strings[lang]
+        self.bindings = {}
+        self.listeners = {}
+
+    @property
+    def tr(self):
+        return self.catalog.tables[self.lang]
+
+    def text(self, key):
+        return self.strings[self.catalog.index[key]]
+
+    def bind(self, key, setter, fmt="{}", owner=None):
+        i = self.catalog.index[key]
+        self.bindings.setdefault(owner, []).append((i, setter, fmt))
+        setter(fmt.format(self.strings[i]))
+
+    def on_change(self, fn, owner=None):
+        self.listeners.setdefault(owner, []).append(fn)
+
+    def drop(self, owner):
+        self.bindings.pop(owner, None)
+        self.listeners.pop(owner, None)
+
+    def refresh(self):
+        # Vuelve a aplicar todo, sin importar que textos cambiaron
+        for bindings in list(self.bindings.values()):
+            for i, setter, fmt in bindings:
+                setter(fmt.format(self.strings[i]))
+        tr = self.tr
+        for listeners in list(self.listeners.values()):
+            for fn in listeners:
+                fn(tr)
+
+    def set_language(self, lang):
+        if lang == self.lang:
+            return False
+        old, new = self.strings, self.catalog.strings[lang]
+        self.lang = lang
+        self.strings = new
+        for bindings in list(self.bindings.values()):
+            for i, setter, fmt in bindings:
+                if old[i] != new[i]:
+                    setter(fmt.format(new[i]))
+        tr = self.tr
+        for listeners in list(self.listeners.values()):
+            for fn in listeners:
+                fn(tr)
+        return True
@@ -0,0 +1,168 @@
+import numpy as np
+
+
+# Columna que crece duplicando capacidad
+class Growable:
+    def __init__(self, dtype, capacity=1024):
+        self._buf = np.zeros(capacity, dtype=dtype)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, values):
+        n = len(values)
+        if self.size + n > len(self._buf):
+            buf = np.zeros(max(2 * len(self._buf), self.size + n), dtype=self._buf.dtype)
+            buf[:self.size] = self._buf[:self.size]
+            self._buf = buf
+        self._buf[self.size:self.size + n] = values
+        self.size += n
+
+    def view(self):
+        return self._buf[:self.size]
+
+
+class Level:
+    def __init__(self):
+        # Envolvente min/max por bin
+        self.x = Growable(np.float64)
+        self.lo = Growable(np.float32)
+        self.hi = Growable(np.float32)
+        # Puntos elegidos por LTTB
+        self.px = Growable(np.float64)
+        self.py = Growable(np.float32)
+
+
+def pick_lttb(x, y, first):
+    # x, y: pares consecutivos del nivel inferior, con un par extra a cada
+    # lado como ancla (el de la izquierda falta cuando first es True).
+    # Se elige en cada par el punto que forma el triangulo mas grande con el
+    # promedio del par anterior y el del siguiente. Usar el promedio en vez
+    # del punto ya elegido permite vectorizar todo el nivel de una vez.
+    px = x.reshape(-1, 2)
+    py = y.reshape(-1, 2).astype(np.float64)
+    ax_, ay = px.mean(axis=1), py.mean(axis=1)
+    if first:
+        ax_ = np.concatenate((ax_[:1], ax_))
+        ay = np.concatenate((ay[:1], ay))
+        px = np.concatenate((px[:1], px))
+        py = np.concatenate((py[:1], py))
+    a_x, a_y = ax_[:-2, None], ay[:-2, None]
+    c_x, c_y = ax_[2:, None], ay[2:, None]
+    bx, by = px[1:-1], py[1:-1]
+    area = np.abs(a_x * (by - c_y) + bx * (c_y - a_y) + c_x * (a_y - by))
+    choice = area.argmax(axis=1)
+    rows = np.arange(len(choice))
+    return bx[rows, choice], by[rows, choice]
+
+
+# Piramide de niveles de detalle: el nivel k resume 2**k muestras por bin
+class LodPyramid:
+    def __init__(self):
+        self.x = Growable(np.float64)
+        self.y = Growable(np.float32)
+        self.levels = []
+
+    def __len__(self):
+        return len(self.x)
+
+    def append(self, x, y):
+        x = np.asarray(x, dtype=np.float64).ravel()
+        y = np.asarray(y, dtype=np.float32).ravel()
+        if not len(x):
+            return
+        self.x.extend(x)
+        self.y.extend(y)
+        self.update()
+
+    def update(self):
+        # Solo se procesan los pares completos nuevos de cada nivel
+        below_x, below_lo, below_hi = self.x.view(), self.y.view(), self.y.view()
+        below_px, below_py = below_x, below_lo
+        k = 0
+        while len(below_x) >= 2:
+            if k == len(self.levels):
+                self.levels.append(Level())
+            level = self.levels[k]
+            done = len(level.x)
+            pairs = len(below_x) // 2
+            if pairs > done:
+                s, e = 2 * done, 2 * pairs
+                level.x.extend(below_x[s:e:2])
+                level.lo.extend(np.minimum(below_lo[s:e:2], below_lo[s + 1:e:2]))
+                level.hi.extend(np.maximum(below_hi[s:e:2], below_hi[s + 1:e:2]))
+            # LTTB necesita el par siguiente como ancla: va un par atrasado
+            done = len(level.px)
+            ready = len(below_px) // 2 - 1
+            if ready > done:
+                s = 2 * done - 2 if done else 0
+                e = 2 * ready + 2
+                x, y = pick_lttb(below_px[s:e], below_py[s:e], done == 0)
+                level.px.extend(x)
+                level.py.extend(y)
+            below_x, below_lo, below_hi = level.x.view(), level.lo.view(), level.hi.view()
+            below_px, below_py = level.px.view(), level.py.view()
+            k += 1
+
+    def extent(self):
+        if not len(self.x):
+            return None
+        x = self.x.view()
+        return x[0], x[-1]
+
+    def select(self, x0, x1, pixels, mode="minmax"):
+        # Nivel mas grueso que todavia deja ~1 bin por pixel en el rango
+        x = self.x.view()
+        lo = int(np.searchsorted(x, x0, "left"))
+        hi = int(np.searchsorted(x, x1, "right"))
+        count = hi - lo
+        k = 0
+        budget = max(1, int(pixels))
+        while count >> k > budget and k < len(self.levels):
+            k += 1
+        if k == 0:
+            s, e = max(lo - 1, 0), min(hi + 1, len(x))
+            return x[s:e], self.y.view()[s:e]
+        level = self.levels[k - 1]
+        if mode == "lttb":
+            px = level.px.view()
+            s = max(int(np.searchsorted(px, x0, "left")) - 1, 0)
+            e = min(int(np.searchsorted(px, x1, "right")) + 1, len(px))
+            out_x, out_y = px[s:e], level.py.view()[s:e]
+            bins = len(px)
+        else:
+            lx = level.x.view()
+            s = max(int(np.searchsorted(lx, x0, "right")) - 1, 0)
+            e = min(int(np.searchsorted(lx, x1, "right")) + 1, len(lx))
+            out_x = np.repeat(lx[s:e], 2)
+            out_y = np.empty(2 * (e - s), dtype=np.float32)
+            out_y[0::2] = level.lo.view()[s:e]
+            out_y[1::2] = level.hi.view()[s:e]
+            bins = len(lx)
+        # Si la vista llega al ultimo bin, lo que el nivel todavia no resume
+        # (en LTTB, el bin que espera su ancla) sale de los niveles finos
+        covered = 2 ** k * bins
+        if e == bins and covered < len(x):
+            tail_x, tail_y = self.tail(k, covered)
+            out_x = np.concatenate((out_x, tail_x))
+            out_y = np.concatenate((out_y, tail_y))
+        return out_x, out_y
+
+    def tail(self, k, covered):
+        # Lo que el nivel k todavia no cubre sale de los niveles mas finos:
+        # a lo sumo un bin por nivel, asi que el costo sigue acotado
+        xs, ys = [], []
+        for j in range(k - 1, 0, -1):
+            level = self.levels[j - 1]
+            first = covered >> j
+            if first < len(level.x):
+                xs.append(np.repeat(level.x.view()[first:], 2))
+                y = np.empty(2 * (len(level.x) - first), dtype=np.float32)
+                y[0::2] = level.lo.view()[first:]
+                y[1::2] = level.hi.view()[first:]
+                ys.append(y)
+                covered = len(level.x) << j
+        xs.append(self.x.view()[covered:])
+        ys.append(self.y.view()[covered:])
+        return np.concatenate(xs), np.concatenate(ys)
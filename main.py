@@ -1,18 +1,25 @@
-import sys, os, json
-from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFrame, QMenu
-from PySide6.QtGui import QIcon, QPixmap
-from PySide6.QtCore import Qt, QSize
+import startup
+import sys, os, argparse, time
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFrame, QMenu, QLineEdit, QStackedWidget
+from PySide6.QtGui import QIcon, QShortcut, QKeySequence
+from PySide6.QtCore import Qt, QSize, QTimer
+from theme import ThemeManager, asset_folder, THEMES
+from scheduler import get_scheduler
+from i18n import Catalog, Translator
+from perf import timed, recorder
+
+startup.timer.mark("import shell modules")
 
 BASE = os.path.dirname(__file__)
 
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def themed_icon(light, dark, theme):
-    folder = "dark" if theme == "dark" else "light"
-    file = dark if theme == "dark" else light
-    return QIcon(os.path.join(BASE, "assets", folder, file))
+# Bandera de cada idioma del catalogo; los que no tienen van sin icono
+FLAGS = {"en": "ingles.png", "es": "español.png"}
+ICON_SIZE = 22
+SNAPSHOT_INTERVAL_S = 30.0
+NAV_ICONS = [
+    ("menu.png", "menu_white.png"), ("dash.png", "dash_white.png"), ("help.png", "help_white.png"),
+    ("account.png", "account_white.png"), ("moon.png", "moon_white.png"), ("globe.png", "globe_white.png"),
+]
 
 def themed_logo(theme, collapsed):
     if theme == "dark":
@@ -20,23 +27,91 @@ def themed_logo(theme, collapsed):
             if collapsed else "Rheonics_Logo_blue_singleline_white 01.png")
     return "Rheonics_Logo_blue_singleline-HQ.png"
 
+def logo_size(collapsed):
+    return (40, 50) if collapsed else (180, 50)
+
+def make_source(sensors, rate, devices=None, poll_rate=10.0):
+    # (fuente, servidor de gateways simulados o None)
+    from acquisition import SimulatorSource
+    if not devices:
+        return SimulatorSource(sensors, rate), None
+    from devices import DeviceSource, DEFAULT_PORTS
+    server = None
+    if devices == "local":
+        # Gateways simulados en este mismo proceso, en puertos libres
+        from device_server import DeviceServer
+        server = DeviceServer(sensors, ports={t: 0 for t in DEFAULT_PORTS})
+        endpoints = {t: ("127.0.0.1", p) for t, p in server.start_in_thread().items()}
+    else:
+        endpoints = {t: (devices, p) for t, p in DEFAULT_PORTS.items()}
+    return DeviceSource(endpoints, poll_rate), server
+
 # Main
 class Dashboard(QWidget):
-    def __init__(self):
+    def __init__(self, sensors=4, rate=100.0, fast_start=False, startup_report=False, history=None, rules=None, devices=None, poll_rate=10.0, perf=False, snapshot=None, snapshot_interval=SNAPSHOT_INTERVAL_S, attach=None):
         super().__init__()
-        self.lang = "en"
+        # attach: nombre del bloque de un motor (--engine); la ventana solo lo mira
+        self.attach = attach
+        self.rules_path = rules
+        self.devices = devices
+        self.poll_rate = poll_rate
+        self.device_server = None
+        self.sensor_count = sensors
+        self.sample_rate = rate
+        self.history_dir = history
+        self.history = None
+        self.fast_start = fast_start
+        self.startup_report = startup_report
+        self.dashboard = None
+        self.sensor_pages = None
+        self.engine = None
+        self._shown = False
         self.theme = "light"
         self.collapsed = False
         self.sensors_expanded = False
-
-        self.tr = {
-            "en": load_json(os.path.join(BASE, "i18n", "en.json")),
-            "es": load_json(os.path.join(BASE, "i18n", "es.json")),
-        }
+        self.themes = ThemeManager(BASE)
+        self.themes.preload()
+        self.scheduler = get_scheduler()
+        self.last_toggle_ms = None
+
+        # Instantanea de la ejecucion anterior: estado de la interfaz y lo
+        # ultimo que mostraba el dashboard, mapeado desde disco
+        self.snapshot_path = snapshot
+        self.snapshot_writer = None
+        self.restored = None
+        if snapshot:
+            from snapshot import load_snapshot, SnapshotWriter
+            self.restored = load_snapshot(snapshot)
+            self.snapshot_writer = SnapshotWriter(snapshot)
+            startup.timer.mark("load snapshot")
+        ui = self.restored.state.get("ui", {}) if self.restored is not None else {}
+        if ui.get("theme") in THEMES:
+            self.theme = ui["theme"]
+
+        catalog = Catalog(os.path.join(BASE, "i18n"))
+        self.i18n = Translator(catalog, ui["lang"] if ui.get("lang") in catalog.languages else "en")
+        self.header_key = "dashboard"
+
+        startup.timer.mark("load catalogs")
 
         self.build_ui()
+        if ui.get("collapsed"):
+            self.toggle_sidebar()
+        if ui.get("sensors_expanded"):
+            self.toggle_sensors()
+        startup.timer.mark("build shell")
+        self.perf_overlay = None
+        if perf:
+            self.start_perf()
+        if not self.fast_start:
+            self.build_pages()
+            self.restore_view()
         self.load_theme()
-        self.refresh_ui()
+        startup.timer.mark("apply theme")
+        if self.snapshot_writer is not None:
+            self.snapshot_timer = QTimer(self)
+            self.snapshot_timer.timeout.connect(self.save_snapshot)
+            self.snapshot_timer.start(int(snapshot_interval * 1000))
 
     # UI Construction
     def build_ui(self):
@@ -71,14 +146,14 @@ class Dashboard(QWidget):
         self.btn_sensors = self.nav_btn("", "", self.toggle_sensors, "sensors")
         self.sb.addWidget(self.btn_sensors)
 
-        self.sensors_container = QVBoxLayout()
-        self.sensors_container.setContentsMargins(40, 0, 0, 0)
-        self.sensors_container.setSpacing(4)
-
-        self.btn_sensor_item = self.nav_btn("", "", self.open_sensor_screen)
-        self.btn_sensor_item.setText("SRV-4829-AC73")
-        self.sensors_container.addWidget(self.btn_sensor_item)
-        self.sb.addLayout(self.sensors_container)
+        # Arbol de sensores: un solo widget sin importar cuantos sensores haya.
+        # Usa numpy, asi que se arma junto con las paginas
+        self.sensor_panel = QWidget()
+        self.sensor_panel_layout = QVBoxLayout(self.sensor_panel)
+        self.sensor_panel_layout.setContentsMargins(8, 0, 0, 0)
+        self.sensor_panel_layout.setSpacing(4)
+        self.sensor_tree = None
+        self.sb.addWidget(self.sensor_panel, 1)
         self.toggle_sensors(hide_only=True)
 
         self.sb.addStretch()
@@ -96,19 +171,167 @@ class Dashboard(QWidget):
 
         return frame
 
+    def build_sensor_tree(self):
+        if self.sensor_tree is not None:
+            return
+        from sensor_tree import SensorTreeModel, SensorTree
+        self.sensor_search = QLineEdit()
+        self.sensor_search.setObjectName("SearchBox")
+        self.sensor_search.setClearButtonEnabled(True)
+        self.i18n.bind("search_placeholder", self.sensor_search.setPlaceholderText)
+        self.sensor_tree_model = SensorTreeModel(self.i18n.tr)
+        self.i18n.on_change(self.sensor_tree_model.set_translations)
+        self.sensor_tree = SensorTree(self.sensor_tree_model)
+        self.sensor_tree.sensorActivated.connect(self.open_sensor_screen)
+        self.sensor_panel_layout.addWidget(self.sensor_search)
+        self.sensor_panel_layout.addWidget(self.sensor_tree, 1)
+        self.tree_search_timer = QTimer(self)
+        self.tree_search_timer.setSingleShot(True)
+        self.tree_search_timer.setInterval(150)
+        self.tree_search_timer.timeout.connect(self.search_sensors)
+        self.sensor_search.textChanged.connect(self.tree_search_timer.start)
+
     def build_content(self):
-        from dashboard import DashboardPage
         frame = QFrame()
-        layout = QVBoxLayout(frame)
+        self.content_layout = QVBoxLayout(frame)
         self.header = QLabel(alignment=Qt.AlignLeft)
         self.header.setObjectName("header")
-        layout.addWidget(self.header)
+        self.i18n.on_change(lambda tr: self.header_key and self.set_header(self.header_key))
+        self.set_header("dashboard")
+        self.content_layout.addWidget(self.header)
+        # Una pagina visible por vez; la vacia es para ayuda y cuenta
+        self.pages = QStackedWidget()
+        self.blank_page = QWidget()
+        self.pages.addWidget(self.blank_page)
+        self.content_layout.addWidget(self.pages, 1)
+        return frame
+
+    def build_pages(self):
+        # Paginas pesadas: matplotlib y numpy se importan recien aca
+        if self.dashboard is not None:
+            return
+        from dashboard import DashboardPage
+        from acquisition import AcquisitionEngine
+        startup.timer.mark("import plotting")
 
         # Dashboard page
-        self.dashboard = DashboardPage(lang=self.lang, tr=self.tr[self.lang])
-        layout.addWidget(self.dashboard)
-        self.dashboard.hide()
-        return frame
+        self.dashboard = DashboardPage(self.i18n, scheduler=self.scheduler)
+        self.pages.addWidget(self.dashboard)
+        startup.timer.mark("build dashboard page")
+
+        if self.attach:
+            from shared_fleet import FleetView
+            self.dashboard.attach_view(FleetView(self.attach))
+            startup.timer.mark("attach engine")
+            self.build_sensor_tree()
+            self.sensor_tree_model.set_sensors(self.dashboard.registry, self.dashboard.filter)
+            self.sensor_tree.expand_matches(False)
+            from sensor_page import PageCache
+            self.sensor_pages = PageCache(self.create_sensor_page, self.drop_sensor_page)
+            return
+
+        # Adquisicion en segundo plano
+        self.engine = AcquisitionEngine([self.make_source()], parent=self)
+        rules = None
+        if self.rules_path:
+            from events import load_rules
+            rules = load_rules(self.rules_path)
+        # Los datos guardados solo valen para la misma fuente
+        restored = self.restored
+        if restored is not None and restored.state.get("source") != self.source_key():
+            restored = None
+        self.dashboard.attach_engine(self.engine, rules, restored)
+        self.build_sensor_tree()
+        self.sensor_tree_model.set_sensors(self.dashboard.registry, self.dashboard.filter)
+        self.sensor_tree.expand_matches(False)
+        if self.history_dir:
+            from history_store import HistoryStore
+            self.history = HistoryStore(self.history_dir)
+            self.history.start_writer()
+            self.dashboard.attach_history(self.history)
+        self.engine.start()
+        startup.timer.mark("start acquisition")
+
+        # Detalle por sensor: se arma en la primera visita y solo quedan las
+        # MAX_PAGES mas recientes
+        from sensor_page import PageCache
+        self.sensor_pages = PageCache(self.create_sensor_page, self.drop_sensor_page)
+
+    def create_sensor_page(self, row):
+        page = self.dashboard.open_detail(row)
+        self.pages.addWidget(page)
+        return page
+
+    def drop_sensor_page(self, page):
+        self.pages.removeWidget(page)
+        self.dashboard.close_detail(page)
+
+    def source_key(self):
+        if self.attach:
+            return f"engine:{self.attach}"
+        return f"{self.devices or 'simulator'}:{self.sensor_count}"
+
+    # Instantanea
+    def current_page(self):
+        page = self.pages.currentWidget()
+        if page is self.dashboard:
+            return {"page": "dashboard"}
+        if page is not self.blank_page:
+            return {"page": "sensor", "serial": page.serial}
+        return {"page": self.header_key}
+
+    def restore_view(self):
+        # Vuelve a la pagina guardada; despues la instantanea ya no hace falta
+        if self.restored is None:
+            return
+        ui = self.restored.state.get("ui", {})
+        page = ui.get("page")
+        if page == "sensor":
+            self.open_sensor_screen(ui["serial"])
+        elif page in ("dashboard", "help", "account"):
+            {"dashboard": self.go_dashboard, "help": self.open_help, "account": self.open_account}[page]()
+        self.restored.close()
+        self.restored = None
+        startup.timer.mark("restore snapshot")
+
+    def save_snapshot(self, wait=False):
+        state = {
+            "source": self.source_key(),
+            "ui": {
+                "theme": self.theme, "lang": self.lang, "collapsed": self.collapsed,
+                "sensors_expanded": self.sensors_expanded, **self.current_page(),
+            },
+        }
+        arrays = {}
+        # Una vista no guarda datos: son del motor
+        if self.dashboard is not None and self.engine is not None:
+            state["dashboard"], arrays = self.dashboard.state()
+        # El hilo de la interfaz solo copia; el archivo se escribe en segundo plano
+        self.snapshot_writer.save(state, arrays, wait)
+
+    def make_source(self):
+        source, self.device_server = make_source(self.sensor_count, self.sample_rate, self.devices, self.poll_rate)
+        return source
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._shown:
+            self._shown = True
+            QTimer.singleShot(0, self.on_first_show)
+
+    def on_first_show(self):
+        startup.timer.mark("show window")
+        if self.fast_start:
+            # Con la ventana ya visible, el resto se arma en tiempo ocioso
+            self.update_logo()
+            startup.timer.mark("load logo")
+            self.build_pages()
+            self.restore_view()
+        # Logos e iconos de los otros temas y estados de la barra se escalan en
+        # segundo plano: el primer cambio de tema o de barra ya los encuentra
+        self.themes.warm(self.asset_variants())
+        if self.startup_report:
+            startup.timer.print_report()
 
     def nav_btn(self, light, dark, callback, text_key=None):
         btn = QPushButton()
@@ -116,20 +339,33 @@ class Dashboard(QWidget):
         btn._icon_dark = dark
         btn._text_key = text_key
         btn._full_text = ""
+        if text_key:
+            self.i18n.bind(text_key, lambda text: self.set_nav_text(btn, text))
         btn.clicked.connect(callback)
-        btn.setIcon(themed_icon(light, dark, self.theme))
-        btn.setIconSize(QSize(22, 22))
+        btn.setIcon(self.themes.icon(light, dark, self.theme, ICON_SIZE, self.devicePixelRatioF()))
+        btn.setIconSize(QSize(ICON_SIZE, ICON_SIZE))
         btn.setMinimumHeight(38)
         btn.setCursor(Qt.PointingHandCursor)
         return btn
 
+    def set_nav_text(self, btn, text):
+        btn._full_text = text
+        if self.collapsed:
+            return
+        if btn._text_key == "sensors":
+            arrow = "▲" if self.sensors_expanded else "▼"
+            spaces = "                               "
+            btn.setText(f"{text}{spaces}{arrow}")
+        else:
+            btn.setText(text)
+
     # Navigation
     def toggle_sidebar(self):
         self.collapsed = not self.collapsed
         self.sidebar.setFixedWidth(60 if self.collapsed else 240)
 
         for btn in [
-            self.btn_home, self.btn_sensors, self.btn_sensor_item,
+            self.btn_home, self.btn_sensors,
             self.btn_help, self.btn_account, self.btn_theme, self.btn_lang
         ]:
             if self.collapsed:
@@ -141,8 +377,6 @@ class Dashboard(QWidget):
                         arrow = "▲" if self.sensors_expanded else "▼"
                         spaces = "                               "
                         btn.setText(f"{btn._full_text}{spaces}{arrow}")
-                elif btn == self.btn_sensor_item:
-                    btn.setText("SRV-4829-AC73")
 
         self.toggle_sensors(hide_only=self.collapsed)
         self.update_logo()
@@ -151,10 +385,7 @@ class Dashboard(QWidget):
         if not hide_only:
             self.sensors_expanded = not self.sensors_expanded
 
-        show = self.sensors_expanded and not self.collapsed
-        for i in range(self.sensors_container.count()):
-            widget = self.sensors_container.itemAt(i).widget()
-            widget.setVisible(show)
+        self.sensor_panel.setVisible(self.sensors_expanded and not self.collapsed)
 
         spaces = "                               "
         if not self.collapsed:
@@ -164,104 +395,205 @@ class Dashboard(QWidget):
             self.btn_sensors.setText("▼")
 
     def hide_all_pages(self):
-        self.dashboard.hide()
+        self.pages.setCurrentWidget(self.blank_page)
 
     def go_dashboard(self):
-        self.hide_all_pages()
-        self.header.setText(self.t("dashboard"))
-        self.dashboard.show()
+        self.build_pages()
+        self.set_header("dashboard")
+        self.pages.setCurrentWidget(self.dashboard)
 
     def open_help(self):
         self.hide_all_pages()
-        self.header.setText(self.t("help"))
+        self.set_header("help")
 
     def open_account(self):
         self.hide_all_pages()
-        self.header.setText(self.t("account"))
-
-    def open_sensor_screen(self):
-        self.hide_all_pages()
-        self.header.setText("SRV-4829-AC73")
+        self.set_header("account")
+
+    def search_sensors(self):
+        text = self.sensor_search.text()
+        if self.sensor_tree_model.deferred(text):
+            self.tree_search_timer.start()
+        self.sensor_tree_model.search(text)
+        self.sensor_tree.expand_matches(bool(text.strip()))
+
+    def open_sensor_screen(self, serial):
+        self.build_pages()
+        row = self.dashboard.registry.find(serial)
+        if row is None:
+            return
+        self.set_header(None, serial)
+        self.pages.setCurrentWidget(self.sensor_pages.get(row))
 
     def open_language_menu(self):
         menu = QMenu()
+        menu.setProperty("theme", self.theme)
         menu.setStyleSheet(self.styleSheet())
 
-        flag_en = os.path.join(BASE, "assets", "ingles.png")
-        flag_es = os.path.join(BASE, "assets", "español.png")
-
-        a_en = menu.addAction(QIcon(flag_en), "English")
-        a_es = menu.addAction(QIcon(flag_es), "Español")
+        catalog = self.i18n.catalog
+        for lang in catalog.languages:
+            flag = FLAGS.get(lang)
+            icon = QIcon(os.path.join(BASE, "assets", flag)) if flag else QIcon()
+            menu.addAction(icon, catalog.tables[lang]["language_name"]).setData(lang)
 
         pos = self.btn_lang.mapToGlobal(self.btn_lang.rect().topRight())
         action = menu.exec_(pos)
-        if action == a_en:
-            self.lang = "en"
-        elif action == a_es:
-            self.lang = "es"
+        # Cerrar el menu sin elegir no toca nada
+        if action is not None:
+            self.set_language(action.data())
 
-        self.refresh_ui()
-
-        # Actualizar dashboard
-        if hasattr(self, "dashboard"):
-            self.dashboard.update_translations(self.lang, self.tr[self.lang])
+    @timed("ui.language")
+    def set_language(self, lang):
+        # Solo se actualizan los textos registrados que cambian con el idioma
+        return self.i18n.set_language(lang)
 
     # Theme & Language
-    def t(self, key):
-        return self.tr[self.lang].get(key, key) if key else ""
-
-    def refresh_ui(self):
-        self.header.setText(self.t("dashboard"))
-        spaces = "                               "
+    # Instrumentacion: tiempos de las rutas calientes, atraso del loop y un
+    # panel con p50/p99 (F12 lo muestra u oculta)
+    def start_perf(self):
+        from perf import LoopMonitor, PerfOverlay
+        recorder.enable()
+        self.loop_monitor = LoopMonitor(parent=self)
+        self.loop_monitor.start()
+        self.perf_overlay = PerfOverlay(self)
+        self.perf_overlay.start()
+        QShortcut(QKeySequence("F12"), self, self.perf_overlay.toggle)
+
+    @property
+    def lang(self):
+        return self.i18n.lang
 
-        for btn in [self.btn_home, self.btn_sensors, self.btn_help, self.btn_account, self.btn_theme, self.btn_lang]:
-            if btn._text_key:
-                btn._full_text = self.t(btn._text_key)
-            else:
-                btn._full_text = ""
-            if not self.collapsed:
-                if btn == self.btn_sensors:
-                    arrow = "▲" if self.sensors_expanded else "▼"
-                    btn.setText(f"{btn._full_text}{spaces}{arrow}")
-                else:
-                    btn.setText(btn._full_text)
+    def t(self, key):
+        return self.i18n.text(key) if key else ""
 
-        self.update_logo()
-        self.update_icons()
+    def set_header(self, key, text=None):
+        # key None: texto fijo (p. ej. un numero de serie) que no se traduce
+        self.header_key = key
+        self.header.setText(self.t(key) if key else text)
 
     def toggle_theme(self):
+        # Solo cambia estilo, logo e iconos; los textos no dependen del tema
+        start = time.perf_counter()
         self.theme = "dark" if self.theme == "light" else "light"
         self.load_theme()
-        self.refresh_ui()
+        self.update_logo()
+        self.update_icons()
+        self.last_toggle_ms = (time.perf_counter() - start) * 1000
 
+    @timed("theme.load")
     def load_theme(self):
-        path = os.path.join(BASE, "styles", f"{self.theme}.qss")
-        with open(path, "r", encoding="utf-8") as f:
-            self.setStyleSheet(f.read())
+        # La hoja con todos los temas se aplica una sola vez; cambiar de tema
+        # es cambiar la propiedad y repulir los widgets, sin parsear de nuevo
+        self.setProperty("theme", self.theme)
+        if not self.styleSheet():
+            self.setStyleSheet(self.themes.combined())
+            return
+        for widget in [self, *self.findChildren(QWidget)]:
+            style = widget.style()
+            style.unpolish(widget)
+            style.polish(widget)
+
+    def closeEvent(self, event):
+        if self.snapshot_writer is not None:
+            self.snapshot_timer.stop()
+            self.save_snapshot(wait=True)
+        if self.engine is not None:
+            self.engine.stop()
+        if self.sensor_pages is not None:
+            self.sensor_pages.clear()
+        if self.dashboard is not None:
+            self.dashboard.shutdown()
+        if self.device_server is not None:
+            self.device_server.stop()
+        if self.history is not None:
+            self.history.close()
+        super().closeEvent(event)
 
     # Visuals
+    def asset_variants(self):
+        # Primero las variantes del tema actual, despues las del otro
+        dpr = self.devicePixelRatioF()
+        themes = [self.theme] + [t for t in THEMES if t != self.theme]
+        logos = [
+            ((asset_folder(theme), themed_logo(theme, collapsed)), *logo_size(collapsed), dpr)
+            for theme in themes for collapsed in (self.collapsed, not self.collapsed)
+        ]
+        icons = [
+            ((asset_folder(theme), dark if theme == "dark" else light), ICON_SIZE, ICON_SIZE, dpr)
+            for theme in themes for light, dark in NAV_ICONS
+        ]
+        return logos[:2] + icons + logos[2:]
+
     def update_logo(self):
+        if self.fast_start and not self._shown:
+            # El logo es un PNG enorme; en arranque rapido se carga despues de mostrar
+            return
         file = themed_logo(self.theme, self.collapsed)
-        pix = QPixmap(os.path.join(
-            BASE, "assets",
-            "dark" if self.theme == "dark" else "light",
-            file
-        )).scaled(
-            180 if not self.collapsed else 40,
-            50, Qt.KeepAspectRatio, Qt.SmoothTransformation
-        )
-        self.logo.setPixmap(pix)
+        self.logo.setPixmap(self.themes.logo(
+            asset_folder(self.theme), file, *logo_size(self.collapsed), self.devicePixelRatioF()
+        ))
 
     def update_icons(self):
+        dpr = self.devicePixelRatioF()
         for btn in [
             self.btn_menu, self.btn_home, self.btn_sensors, self.btn_help,
-            self.btn_account, self.btn_theme, self.btn_lang, self.btn_sensor_item
+            self.btn_account, self.btn_theme, self.btn_lang
         ]:
-            btn.setIcon(themed_icon(btn._icon_light, btn._icon_dark, self.theme))
+            btn.setIcon(self.themes.icon(btn._icon_light, btn._icon_dark, self.theme, ICON_SIZE, dpr))
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sensors", type=int, default=4, help="simulated sensor count")
+    parser.add_argument("--rate", type=float, default=100.0, help="simulated samples per second")
+    parser.add_argument("--history", metavar="DIR", help="keep sensor readings in an on-disk store")
+    parser.add_argument("--rules", metavar="JSON", help="alarm rules for the event engine")
+    parser.add_argument("--devices", metavar="HOST", help="poll device gateways at HOST ('local' starts stand-in gateways)")
+    parser.add_argument("--poll-rate", type=float, default=10.0, help="device polls per second")
+    parser.add_argument("--fast-start", action="store_true", help="show the shell first and build pages when idle")
+    parser.add_argument("--startup-report", action="store_true", help="print launch time by phase")
+    parser.add_argument("--perf", action="store_true", help="time hot paths and show a p50/p99 overlay (F12)")
+    parser.add_argument("--perf-json", metavar="FILE", help="write timing histograms on exit (implies --perf)")
+    parser.add_argument("--perf-trace", metavar="FILE", help="write a Chrome trace on exit (implies --perf)")
+    parser.add_argument("--snapshot", metavar="FILE", help="restore the last session from FILE and save it on exit")
+    parser.add_argument("--snapshot-interval", type=float, default=SNAPSHOT_INTERVAL_S, help="seconds between snapshot saves")
+    parser.add_argument("--engine", metavar="NAME", help="run headless and publish the fleet to shared memory NAME")
+    parser.add_argument("--attach", metavar="NAME", help="show the fleet published by an --engine NAME process (read-only)")
+    parser.add_argument("--tail", type=int, help="samples per sensor kept for attached detail pages (--engine; default: shared_fleet.TAIL)")
+    return parser.parse_known_args(argv[1:])
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    w = Dashboard()
+    args, qt_args = parse_args(sys.argv)
+    if args.engine:
+        # Sin ventana ni QApplication: adquiere y publica hasta SIGINT/SIGTERM
+        from shared_fleet import serve, TAIL
+        rules = None
+        if args.rules:
+            from events import load_rules
+            rules = load_rules(args.rules)
+        source, server = make_source(args.sensors, args.rate, args.devices, args.poll_rate)
+        try:
+            code = serve(args.engine, [source], rules, tail=TAIL if args.tail is None else args.tail)
+        finally:
+            if server is not None:
+                server.stop()
+        sys.exit(code)
+    app = QApplication(sys.argv[:1] + qt_args)
+    startup.timer.mark("create QApplication")
+    w = Dashboard(
+        sensors=args.sensors, rate=args.rate,
+        fast_start=args.fast_start, startup_report=args.startup_report,
+        history=args.history, rules=args.rules,
+        devices=args.devices, poll_rate=args.poll_rate,
+        perf=bool(args.perf or args.perf_json or args.perf_trace),
+        snapshot=args.snapshot, snapshot_interval=args.snapshot_interval,
+        attach=args.attach
+    )
     w.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    code = app.exec()
+    if args.perf_json:
+        recorder.write_json(args.perf_json)
+    if args.perf_trace:
+        recorder.write_trace(args.perf_trace)
+    sys.exit(code)
\ No newline at end of file
@@ -0,0 +1,219 @@
+import time, math, json, threading, functools
+from collections import deque
+from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import Qt, QObject, QTimer, QEvent
+
+# Histogramas en escala logaritmica: 20 cubetas por decada de 1 us a 100 s
+LO_MS = 1e-3
+PER_DECADE = 20
+BINS = 8 * PER_DECADE
+LOOP_INTERVAL_MS = 50
+TRACE_CAPACITY = 200_000
+# Los atrasos del loop menores a esto solo van al histograma, no a la traza
+TRACE_LAG_MS = 1.0
+
+
+class Histogram:
+    def __init__(self, counts=None):
+        # Cubeta 0: por debajo de LO_MS; ultima: por encima del rango
+        self.counts = counts or [0] * (BINS + 2)
+        self.count = sum(self.counts)
+        self.max = 0.0
+
+    def add(self, ms):
+        if ms < LO_MS:
+            b = 0
+        else:
+            b = min(BINS + 1, 1 + int(math.log10(ms / LO_MS) * PER_DECADE))
+        self.counts[b] += 1
+        self.count += 1
+        if ms > self.max:
+            self.max = ms
+
+    def since(self, counts):
+        # Lo registrado despues de una copia anterior de counts
+        return Histogram([a - b for a, b in zip(self.counts, counts)])
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for b, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                # Centro geometrico de la cubeta
+                return LO_MS * 10 ** ((max(b, 1) - 0.5) / PER_DECADE)
+        return self.max
+
+    def buckets(self):
+        # (limite superior en ms, cantidad) de las cubetas no vacias
+        return [
+            (LO_MS * 10 ** (b / PER_DECADE), n)
+            for b, n in enumerate(self.counts) if n
+        ]
+
+
+# Registro de tiempos: apagado no cuesta mas que un if por llamada
+class Recorder:
+    def __init__(self, trace_capacity=TRACE_CAPACITY):
+        self.enabled = False
+        self.histograms = {}
+        self.spans = deque(maxlen=trace_capacity)
+        self.t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def record(self, name, start, end):
+        ms = (end - start) * 1000
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.add(ms)
+        self.spans.append((name, start, end, threading.get_ident()))
+
+    def add(self, name, ms, trace=True):
+        # Muestra sin tramo propio (atraso del loop): termina ahora
+        end = time.perf_counter()
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.add(ms)
+        if trace:
+            self.spans.append((name, end - ms / 1000, end, threading.get_ident()))
+
+    def summary(self):
+        with self._lock:
+            items = list(self.histograms.items())
+        return {
+            name: {
+                "count": h.count,
+                "p50_ms": round(h.percentile(0.50), 4),
+                "p90_ms": round(h.percentile(0.90), 4),
+                "p99_ms": round(h.percentile(0.99), 4),
+                "max_ms": round(h.max, 4),
+                "buckets": [[round(edge, 6), n] for edge, n in h.buckets()],
+            }
+            for name, h in sorted(items)
+        }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"histograms": self.summary()}, f, indent=2)
+
+    def write_trace(self, path):
+        # Formato de eventos de traza de Chrome (chrome://tracing, Perfetto)
+        events = [
+            {
+                "name": name, "ph": "X", "pid": 1, "tid": tid,
+                "ts": round((start - self.t0) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+            }
+            for name, start, end, tid in list(self.spans)
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+recorder = Recorder()
+
+
+def timed(name):
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not recorder.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                recorder.record(name, start, time.perf_counter())
+        return inner
+    return wrap
+
+
+# Atraso del loop de eventos: un timer que deberia disparar cada
+# LOOP_INTERVAL_MS; lo que tarde de mas es tiempo en que la UI no respondio
+class LoopMonitor(QObject):
+    def __init__(self, interval_ms=LOOP_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self._last = None
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.tick)
+
+    def start(self):
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def tick(self):
+        now = time.perf_counter()
+        lag = max(0.0, (now - self._last) * 1000 - self.interval_ms)
+        self._last = now
+        recorder.add("loop.lag", lag, trace=lag >= TRACE_LAG_MS)
+
+
+# Panel sobre la ventana con p50/p99 de los ultimos segundos
+class PerfOverlay(QLabel):
+    def __init__(self, parent, window_s=5.0, refresh_ms=500, rows=12):
+        super().__init__(parent)
+        self.setObjectName("PerfOverlay")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.PlainText)
+        self.rows = rows
+        # Copias de los histogramas para restar y quedarse con la ventana
+        self.history = deque(maxlen=max(1, int(window_s * 1000 / refresh_ms)))
+        self.timer = QTimer(self)
+        self.timer.setInterval(refresh_ms)
+        self.timer.timeout.connect(self.refresh)
+        parent.installEventFilter(self)
+
+    def start(self):
+        self.timer.start()
+        self.refresh()
+        self.show()
+
+    def toggle(self):
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+        else:
+            self.start()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize:
+            self.place()
+        return False
+
+    def place(self):
+        self.adjustSize()
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - 12, 12)
+        self.raise_()
+
+    def refresh(self):
+        with recorder._lock:
+            current = {name: (h, list(h.counts)) for name, h in recorder.histograms.items()}
+        oldest = self.history[0] if self.history else {}
+        self.history.append({name: counts for name, (_, counts) in current.items()})
+        rows = []
+        for name, (hist, _) in current.items():
+            recent = hist.since(oldest[name]) if name in oldest else hist
+            if recent.count:
+                rows.append((recent.percentile(0.99), recent.percentile(0.50), recent.count, name))
+        rows.sort(reverse=True)
+        lines = [f"{'':<24}{'n':>7}{'p50 ms':>9}{'p99 ms':>9}"]
+        for p99, p50, count, name in rows[:self.rows]:
+            lines.append(f"{name:<24}{count:>7}{p50:>9.2f}{p99:>9.2f}")
+        self.setText("\n".join(lines))
+        self.place()
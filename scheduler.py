@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtGui import QGuiApplication
+from perf import timed
+
+
+def frame_interval_ms():
+    screen = QGuiApplication.primaryScreen()
+    rate = screen.refreshRate() if screen is not None else 0
+    return max(1, int(1000 / rate)) if rate > 0 else 16
+
+
+# Planificador de actualizaciones de UI
+# Cada actualizacion tiene una clave; si llega otra con la misma clave antes
+# del proximo frame, la anterior se descarta. Lo que pertenece a widgets
+# ocultos queda estacionado hasta que se vuelvan a mostrar.
+class UpdateScheduler(QObject):
+    def __init__(self, interval_ms=None, budget_ms=8.0, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms or frame_interval_ms()
+        self.budget_ms = budget_ms
+        self._pending = OrderedDict()
+        self._parked = OrderedDict()
+        self._last_flush = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self.stats = {
+            "posted": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "applied": 0,
+            "skipped_hidden": 0,
+            "frames": 0,
+            "over_budget": 0,
+        }
+
+    def post(self, key, owner, fn, *args):
+        self.stats["posted"] += 1
+        if key in self._pending or key in self._parked:
+            self.stats["dropped"] += 1
+        if owner is not None and not owner.isVisible():
+            self._pending.pop(key, None)
+            self._parked[key] = (owner, fn, args)
+            self.stats["skipped_hidden"] += 1
+            return
+        self._parked.pop(key, None)
+        self._pending[key] = (owner, fn, args)
+        self._schedule()
+
+    def wake(self):
+        # Llamar cuando una pagina vuelve a mostrarse
+        if not self._parked:
+            return
+        for key, entry in self._parked.items():
+            self._pending.setdefault(key, entry)
+        self._parked.clear()
+        self._schedule()
+
+    def forget(self, owners):
+        # Llamar antes de destruir widgets que pudieron dejar trabajo pendiente
+        owners = {id(o) for o in owners}
+        for queue in (self._pending, self._parked):
+            for key in [k for k, (owner, _, _) in queue.items() if id(owner) in owners]:
+                del queue[key]
+
+    def _schedule(self):
+        if self._timer.isActive():
+            self.stats["coalesced"] += 1
+            return
+        elapsed = (time.perf_counter() - self._last_flush) * 1000
+        self._timer.start(max(0, int(self.interval_ms - elapsed)))
+
+    @timed("scheduler.frame")
+    def flush(self):
+        self._timer.stop()
+        self._last_flush = start = time.perf_counter()
+        self.stats["frames"] += 1
+        while self._pending:
+            key, entry = self._pending.popitem(last=False)
+            owner, fn, args = entry
+            if owner is not None and not owner.isVisible():
+                self._parked[key] = entry
+                self.stats["skipped_hidden"] += 1
+                continue
+            fn(*args)
+            self.stats["applied"] += 1
+            if self._pending and (time.perf_counter() - start) * 1000 > self.budget_ms:
+                # Lo que no entra en este frame sigue en el proximo
+                self.stats["over_budget"] += 1
+                self._timer.start(self.interval_ms)
+                break
+
+    def pending(self):
+        return len(self._pending), len(self._parked)
+
+
+_instance = None
+
+
+def get_scheduler():
+    global _instance
+    if _instance is None:
+        _instance = UpdateScheduler()
+    return _instance
@@ -0,0 +1,166 @@
+import threading
+import numpy as np
+
+WIDTH = 32
+REBUILD_AFTER = 4096
+
+
+def encode(texts, width=WIDTH):
+    # Matriz (filas, width) de bytes en minuscula, rellenada con ceros
+    raw = np.array([t.lower().encode("utf-8")[:width] for t in texts], dtype=f"S{width}")
+    return raw.view(np.uint8).reshape(len(texts), width)
+
+
+def clip(text, width=WIDTH):
+    # El mismo texto que queda en la matriz despues de encode
+    return text.lower().encode("utf-8")[:width].decode("utf-8", "ignore")
+
+
+def gram_codes(matrix, size):
+    # Codigo entero por n-grama y posicion; -1 donde cae en el relleno
+    span = matrix.shape[1] - size + 1
+    codes = np.zeros((matrix.shape[0], span), dtype=np.int32)
+    valid = np.ones((matrix.shape[0], span), dtype=bool)
+    for k in range(size):
+        part = matrix[:, k:k + span]
+        codes = (codes << 8) | part
+        valid &= part != 0
+    codes[~valid] = -1
+    return codes
+
+
+def intersect(small, large):
+    # Ambas listas estan ordenadas: busqueda binaria en vez de ordenar de nuevo
+    idx = np.searchsorted(large, small)
+    idx[idx == len(large)] = 0
+    return small[large[idx] == small] if len(large) else large
+
+
+# Indice invertido de n-gramas en formato CSR
+class GramIndex:
+    def __init__(self, matrix, size):
+        self.size = size
+        codes = gram_codes(matrix, size)
+        rows = np.broadcast_to(np.arange(matrix.shape[0], dtype=np.int32)[:, None], codes.shape)
+        keep = codes >= 0
+        codes = codes[keep]
+        rows = rows[keep]
+        # Orden estable: dentro de cada n-grama las filas quedan ascendentes
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        rows = rows[order]
+        first = np.ones(len(codes), dtype=bool)
+        first[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+        codes = codes[first]
+        self.rows = rows[first]
+        starts = np.flatnonzero(np.diff(codes)) + 1
+        self.codes = codes[np.concatenate(([0], starts))] if len(codes) else codes
+        self.bounds = np.concatenate(([0], starts, [len(codes)]))
+
+    def postings(self, code):
+        i = np.searchsorted(self.codes, code)
+        if i >= len(self.codes) or self.codes[i] != code:
+            return self.rows[:0]
+        return self.rows[self.bounds[i]:self.bounds[i + 1]]
+
+
+class SensorFilter:
+    def __init__(self, texts, conn_codes, kind_codes, n_conn, n_kind):
+        self.count = len(texts)
+        self.matrix = encode(texts)
+        # Los indices de texto se arman en segundo plano; numpy suelta el GIL al ordenar
+        self.ready = threading.Event()
+        threading.Thread(target=self.build, daemon=True).start()
+        # Bitmaps por tipo de conexion y tipo de sensor
+        conn_codes = np.asarray(conn_codes)
+        kind_codes = np.asarray(kind_codes)
+        self.conn_bits = [conn_codes == c for c in range(n_conn)]
+        self.kind_bits = [kind_codes == k for k in range(n_kind)]
+        # Ediciones todavia fuera de la matriz y los indices. _lock cubre el
+        # cambio de matriz e indices por los reconstruidos
+        self.edited = {}
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    def update_text(self, row, text):
+        with self._lock:
+            self.edited[row] = clip(text)
+            due = len(self.edited) > REBUILD_AFTER and self.ready.is_set() and not self._rebuilding
+            if due:
+                self._rebuilding = True
+                applied = dict(self.edited)
+        if due:
+            # Se rearma en segundo plano sobre una copia; mientras tanto las
+            # busquedas siguen con los indices viejos mas las ediciones
+            threading.Thread(target=self.rebuild, args=(applied,), daemon=True).start()
+
+    def build(self):
+        self.grams = [None] + [GramIndex(self.matrix, size) for size in (1, 2, 3)]
+        self.ready.set()
+
+    def rebuild(self, applied):
+        matrix = self.matrix.copy()
+        rows = np.fromiter(applied, dtype=np.int64, count=len(applied))
+        matrix[rows] = encode(list(applied.values()))
+        grams = [None] + [GramIndex(matrix, size) for size in (1, 2, 3)]
+        with self._lock:
+            self.matrix, self.grams = matrix, grams
+            # Lo editado otra vez durante el rearmado sigue pendiente
+            for row, text in applied.items():
+                if self.edited.get(row) == text:
+                    del self.edited[row]
+            self._rebuilding = False
+
+    def deferred(self, text):
+        # True si query() ignoro el texto porque los indices no estan listos:
+        # quien llama repite la busqueda mas tarde
+        return bool(text.strip()) and not self.ready.is_set()
+
+    def query(self, text="", conn=None, kind=None):
+        # Devuelve las filas visibles ordenadas, o None si no hay filtro
+        text = text.strip().lower()
+        mask = None
+        if conn is not None:
+            mask = self.conn_bits[conn]
+        if kind is not None:
+            mask = self.kind_bits[kind] if mask is None else mask & self.kind_bits[kind]
+        if not text or not self.ready.is_set():
+            # Sin indices todavia solo filtran las categorias: recorrer el
+            # texto de millones de filas no entra en un cuadro
+            return None if mask is None else np.flatnonzero(mask)
+        rows = self.match(text)
+        if mask is not None:
+            rows = rows[mask[rows]]
+        return rows
+
+    def match(self, text):
+        with self._lock:
+            matrix, grams, edited = self.matrix, self.grams, dict(self.edited)
+        query = encode([text])[0]
+        length = int(np.count_nonzero(query))
+        if len(text.encode("utf-8")) > WIDTH:
+            rows = np.zeros(0, dtype=np.int32)
+        elif length < 3:
+            rows = grams[length].postings(int(gram_codes(query[None, :length], length)[0, 0]))
+        else:
+            codes = np.unique(gram_codes(query[None, :length], 3)[0])
+            lists = sorted((grams[3].postings(int(c)) for c in codes), key=len)
+            rows = lists[0]
+            for other in lists[1:]:
+                if not len(rows):
+                    break
+                rows = intersect(rows, other)
+            if length > 3 and len(rows):
+                rows = rows[verify(matrix, rows, query[:length])]
+        if edited:
+            rows = rows[~np.isin(rows, np.fromiter(edited, dtype=np.int32, count=len(edited)))]
+            hits = [r for r, t in edited.items() if text in t]
+            if hits:
+                rows = np.union1d(rows, np.array(hits, dtype=np.int32))
+        return rows
+
+
+def verify(matrix, rows, query):
+    # Los trigramas no garantizan contiguidad: se confirma la subcadena
+    windows = np.lib.stride_tricks.sliding_window_view(matrix[rows], len(query), axis=1)
+    return (windows == query).all(axis=2).any(axis=1)
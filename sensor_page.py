@@ -0,0 +1,174 @@
+from collections import OrderedDict
+import numpy as np
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QComboBox
+from acquisition import CHANNELS
+from dashboard import MplCanvas
+
+MAX_PAGES = 8
+PAGE_CAPACITY = 30_000
+
+
+# Pagina de detalle de un sensor: grafico en vivo por canal y medidas propias
+class SensorPage(QWidget):
+    def __init__(self, row, sensor, i18n, scheduler, units, capacity=PAGE_CAPACITY):
+        super().__init__()
+        self.row = row
+        self.model, self.serial, self.conn, self.kind = sensor
+        self.i18n = i18n
+        self.tr = i18n.tr
+        self.metrics = None
+        self.scheduler = scheduler
+        self.units = units
+        self.capacity = capacity
+        self.build_ui()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Lo que se acumulo mientras la pagina estaba oculta se aplica ahora
+        self.scheduler.wake()
+
+    def build_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(16, 16, 16, 16)
+        layout.setSpacing(16)
+
+        self.info = QLabel()
+        self.info.setObjectName("SectionTitle")
+        layout.addWidget(self.info)
+
+        middle = QHBoxLayout()
+        middle.setSpacing(12)
+
+        chart_frame = QFrame()
+        chart_frame.setObjectName("ChartFrame")
+        chart_layout = QVBoxLayout(chart_frame)
+        chart_layout.setContentsMargins(12, 12, 12, 12)
+
+        # Un canal por vez: las escalas de los canales no se parecen
+        self.channel = QComboBox()
+        self.channel.setObjectName("ComboBox")
+        self.channel.addItems([""] * len(CHANNELS))
+        self.channel.currentIndexChanged.connect(self.show_channel)
+        chart_layout.addWidget(self.channel)
+
+        self.canvas = MplCanvas(self, width=6, height=3.2, dpi=100)
+        self.canvas.scheduler = self.scheduler
+        self.canvas.start_streaming(
+            [(key, self.tr[key], {"linewidth": 1.6}) for key in CHANNELS],
+            capacity=self.capacity, legend=False
+        )
+        chart_layout.addWidget(self.canvas)
+
+        measures = QFrame()
+        measures.setObjectName("MeasuresFrame")
+        measures_layout = QVBoxLayout(measures)
+        measures_layout.setContentsMargins(12, 12, 12, 12)
+
+        self.measure_labels = {}
+        self.measure_values = {}
+        self.measure_details = {}
+        for key in CHANNELS:
+            lbl = QLabel()
+            # Registros a nombre de la pagina: se sueltan todos en release()
+            self.i18n.bind(key, lbl.setText, owner=self)
+            self.i18n.bind(key, lambda text, i=len(self.measure_labels): self.channel.setItemText(i, text), owner=self)
+            value = QLabel("--", objectName="MeasureValue")
+            detail = QLabel("", objectName="MeasureDetail")
+            self.measure_labels[key] = lbl
+            self.measure_values[key] = value
+            self.measure_details[key] = detail
+            measures_layout.addWidget(lbl)
+            measures_layout.addWidget(value)
+            measures_layout.addWidget(detail)
+        measures_layout.addStretch()
+
+        middle.addWidget(chart_frame, 3)
+        middle.addWidget(measures, 1)
+        layout.addLayout(middle, 1)
+
+        self.show_channel(0)
+        self.set_info()
+        self.i18n.on_change(self.update_translations, owner=self)
+
+    def show_channel(self, index):
+        if index >= 0:
+            self.canvas.show_series({CHANNELS[index]})
+
+    # Datos
+    def push(self, ts, values):
+        # values: (muestras, canales) de este sensor; los NaN no se dibujan
+        for i, key in enumerate(CHANNELS):
+            v = values[:, i]
+            ok = ~np.isnan(v)
+            if ok.any():
+                self.canvas.push(key, ts[ok], v[ok])
+        last = values[-1]
+        for i, key in enumerate(CHANNELS):
+            if not np.isnan(last[i]):
+                self.set_text(self.measure_values[key], f"{last[i]:.3f} {self.units[key]}")
+
+    def update_analytics(self, metrics):
+        # metrics: una fila de analytics.METRIC_DTYPE por canal
+        self.metrics = metrics
+        for i, key in enumerate(CHANNELS):
+            m = metrics[i]
+            self.set_text(self.measure_details[key], (
+                f"σ {m['std']:.3g} · {self.tr['noise']} {m['noise']:.3g}\n"
+                f"{self.tr['drift']} {m['drift']:+.2g} {self.units[key]}/s · {m['peak_hz']:.2f} Hz"
+            ))
+
+    def seed(self, ts, values):
+        # Historial previo (del store) para no arrancar con el grafico vacio
+        for i, key in enumerate(CHANNELS):
+            if len(ts[i]):
+                self.canvas.push(key, ts[i], values[i])
+
+    def set_text(self, label, text):
+        self.scheduler.post(("text", id(label)), label, label.setText, text)
+
+    def set_info(self):
+        self.info.setText(f"{self.model} · {self.serial} · {self.conn} · {self.tr.get(self.kind, self.kind)}")
+
+    def update_translations(self, tr):
+        self.tr = tr
+        self.set_info()
+        if self.metrics is not None:
+            self.update_analytics(self.metrics)
+
+    def release(self):
+        # Suelta buffers y figura; la pagina deja de existir al volver al loop
+        self.i18n.drop(self)
+        self.scheduler.forget([self.canvas, *self.measure_values.values(), *self.measure_details.values()])
+        self.canvas.stop_streaming()
+        self.canvas.fig.clear()
+        self.canvas.close()
+        self.deleteLater()
+
+
+# Cache LRU de paginas: se crean en la primera visita y la menos usada se
+# descarta al pasar el limite
+class PageCache:
+    def __init__(self, factory, on_evict, capacity=MAX_PAGES):
+        self.factory = factory
+        self.on_evict = on_evict
+        self.capacity = capacity
+        self.pages = OrderedDict()
+
+    def get(self, key):
+        page = self.pages.get(key)
+        if page is None:
+            page = self.pages[key] = self.factory(key)
+            while len(self.pages) > self.capacity:
+                _, old = self.pages.popitem(last=False)
+                self.on_evict(old)
+        else:
+            self.pages.move_to_end(key)
+        return page
+
+    def values(self):
+        return list(self.pages.values())
+
+    def clear(self):
+        while self.pages:
+            _, old = self.pages.popitem(last=False)
+            self.on_evict(old)
@@ -0,0 +1,251 @@
+import numpy as np
+from acquisition import CONN_TYPES, SENSOR_KINDS
+
+FNV_OFFSET = np.uint64(14695981039346656037)
+FNV_PRIME = np.uint64(1099511628211)
+EMPTY, DELETED = -1, -2
+# Estado 0: el texto por defecto, que cambia con el idioma
+DEFAULT_STATUS = 0
+
+
+def fnv1a(matrix):
+    # FNV-1a de 64 bits por fila de una matriz (filas, ancho) de bytes; el
+    # relleno cuenta, asi que solo se comparan hashes del mismo ancho
+    h = np.full(matrix.shape[0], FNV_OFFSET, dtype=np.uint64)
+    for k in range(matrix.shape[1]):
+        h ^= matrix[:, k].astype(np.uint64)
+        h *= FNV_PRIME
+    return h
+
+
+def fnv1a_key(key, width):
+    # El mismo hash para una sola clave, sin pasar por numpy
+    h = int(FNV_OFFSET)
+    prime = int(FNV_PRIME)
+    for b in key.ljust(width, b"\0"):
+        h = ((h ^ b) * prime) & 0xFFFFFFFFFFFFFFFF
+    return h
+
+
+# Textos repetidos (modelos, estados) guardados una vez; las filas llevan el codigo
+class Vocabulary:
+    def __init__(self, words=()):
+        # Los codigos son las posiciones en words, tal como vienen
+        self.words = list(words)
+        self.codes = {}
+        for c, word in enumerate(self.words):
+            self.codes.setdefault(word, c)
+
+    def code(self, word):
+        c = self.codes.get(word)
+        if c is None:
+            c = self.codes[word] = len(self.words)
+            self.words.append(word)
+        return c
+
+    def encode(self, words):
+        return np.array([self.code(w) for w in words], dtype=np.uint16)
+
+    def rename(self, code, word):
+        del self.codes[self.words[code]]
+        self.words[code] = word
+        self.codes[word] = code
+
+
+# Registro de sensores en columnas: una fila por sensor, con codigos
+# categoricos para modelo, estado, conexion y tipo, series de ancho fijo y un
+# indice serie -> fila por direccionamiento abierto. Los cambios se avisan por
+# rango de filas (primera, ultima) para que la tabla los junte en un solo
+# dataChanged. Sin Qt: tambien sirve fuera de la interfaz.
+class SensorRegistry:
+    def __init__(self, sensors=(), status=""):
+        sensors = list(sensors)
+        self.listeners = []
+        self.model_names = Vocabulary()
+        self.status_names = Vocabulary([status])
+        self.model = self.model_names.encode([s[0] for s in sensors])
+        serials = [s[1].encode("utf-8") for s in sensors]
+        self.width = max([8] + [len(s) for s in serials])
+        self.serial = np.array(serials, dtype=f"S{self.width}")
+        self.conn = np.array([CONN_TYPES.index(s[2]) for s in sensors], dtype=np.uint8)
+        self.kind = np.array([SENSOR_KINDS.index(s[3]) for s in sensors], dtype=np.uint8)
+        self.status = np.full(len(sensors), DEFAULT_STATUS, dtype=np.uint16)
+        self.active = np.ones(len(sensors), dtype=bool)
+        self.build_index()
+
+    def __len__(self):
+        return len(self.serial)
+
+    def on_change(self, fn):
+        self.listeners.append(fn)
+
+    def changed(self, lo, hi):
+        for fn in self.listeners:
+            fn(lo, hi)
+
+    # Indice serie -> fila
+    def build_index(self):
+        size = 1 << max(4, int(2 * max(len(self), 1) - 1).bit_length())
+        self.mask = size - 1
+        # int32: filas hasta 2**31, la mitad de memoria que int64
+        self.slots = np.full(size, EMPTY, dtype=np.int32)
+        self.deleted = 0
+        self.insert(np.arange(len(self), dtype=np.int64))
+
+    def hashes(self, serials):
+        matrix = np.asarray(serials, dtype=f"S{self.width}").view(np.uint8).reshape(-1, self.width)
+        return fnv1a(matrix)
+
+    def insert(self, rows):
+        # Sondeo lineal en rondas: en cada ronda las filas pendientes ocupan
+        # su casilla si esta libre; si dos caen en la misma, gana la primera
+        pos = (self.hashes(self.serial[rows]) & np.uint64(self.mask)).astype(np.int64)
+        pending = np.arange(len(rows))
+        while len(pending):
+            slot = pos[pending]
+            free = np.flatnonzero(self.slots[slot] == EMPTY)
+            taken, first = np.unique(slot[free], return_index=True)
+            winners = free[first]
+            self.slots[taken] = rows[pending[winners]]
+            placed = np.zeros(len(pending), dtype=bool)
+            placed[winners] = True
+            pending = pending[~placed]
+            pos[pending] = (pos[pending] + 1) & self.mask
+
+    def find(self, serial):
+        # Fila de una serie, o None
+        key = serial.encode("utf-8")
+        if len(key) > self.width:
+            return None
+        i = fnv1a_key(key, self.width) & self.mask
+        while True:
+            row = int(self.slots[i])
+            if row == EMPTY:
+                return None
+            if row != DELETED and self.serial[row] == key:
+                return row
+            i = (i + 1) & self.mask
+
+    def find_many(self, serials):
+        # Filas de muchas series a la vez; -1 donde no esta
+        keys = np.array([s.encode("utf-8") for s in serials], dtype=f"S{self.width}")
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        pos = (self.hashes(keys) & np.uint64(self.mask)).astype(np.int64)
+        pending = np.arange(len(keys))
+        while len(pending):
+            row = self.slots[pos[pending]]
+            hit = row >= 0
+            hit[hit] = self.serial[row[hit]] == keys[pending[hit]]
+            rows[pending[hit]] = row[hit]
+            pending = pending[~hit & (row != EMPTY)]
+            pos[pending] = (pos[pending] + 1) & self.mask
+        return rows
+
+    def remove_key(self, row):
+        i = fnv1a_key(self.serial[row], self.width) & self.mask
+        while self.slots[i] != row:
+            i = (i + 1) & self.mask
+        self.slots[i] = DELETED
+        self.deleted += 1
+
+    # Lectura
+    def model_text(self, row):
+        return self.model_names.words[self.model[row]]
+
+    def serial_text(self, row):
+        return self.serial[row].decode("utf-8")
+
+    def status_text(self, row):
+        return self.status_names.words[self.status[row]]
+
+    def row(self, row):
+        # (modelo, serie, estado, activo), como las filas de la tabla
+        return self.model_text(row), self.serial_text(row), self.status_text(row), bool(self.active[row])
+
+    def sensor(self, row):
+        # (modelo, serie, conexion, tipo), como los da la adquisicion
+        return self.model_text(row), self.serial_text(row), CONN_TYPES[self.conn[row]], SENSOR_KINDS[self.kind[row]]
+
+    def serial_texts(self, start=0, stop=None):
+        return [s.decode("utf-8") for s in self.serial[start:stop]]
+
+    def labels(self):
+        # "modelo serie" por fila, para los indices de busqueda
+        models = self.model_names.words
+        return [f"{models[m]} {s.decode('utf-8')}" for m, s in zip(self.model.tolist(), self.serial)]
+
+    # Escritura
+    def set_active(self, rows, active):
+        # rows: fila, slice o arreglo de filas; active: valor o arreglo
+        self.active[rows] = active
+        self.notify(rows)
+
+    def set_status(self, rows, text):
+        self.status[rows] = self.status_names.code(text)
+        self.notify(rows)
+
+    def rename_status(self, code, text):
+        # Cambia el texto de una categoria (p. ej. el estado por defecto al
+        # cambiar de idioma) sin tocar las filas
+        self.status_names.rename(code, text)
+        if len(self):
+            self.changed(0, len(self) - 1)
+
+    def update(self, row, model, serial, status):
+        self.model[row] = self.model_names.code(model)
+        self.status[row] = self.status_names.code(status)
+        key = serial.encode("utf-8")
+        if key != self.serial[row]:
+            if len(key) > self.width:
+                # Serie mas larga que la columna: se ensancha y se rehace el indice
+                self.width = len(key)
+                self.serial = self.serial.astype(f"S{self.width}")
+                self.serial[row] = key
+                self.build_index()
+            else:
+                self.remove_key(row)
+                self.serial[row] = key
+                self.insert(np.array([row], dtype=np.int64))
+                if self.deleted > len(self) // 4:
+                    self.build_index()
+        self.notify(row)
+
+    def notify(self, rows):
+        if isinstance(rows, slice):
+            lo, hi, _ = rows.indices(len(self))
+            hi -= 1
+        else:
+            rows = np.atleast_1d(rows)
+            if rows.dtype == bool:
+                rows = np.flatnonzero(rows)
+            if not len(rows):
+                return
+            lo, hi = int(rows.min()), int(rows.max())
+        if hi >= lo:
+            self.changed(lo, hi)
+
+    # Instantanea: columnas e indice tal cual, sin volver a calcular hashes
+    COLUMNS = ("model", "serial", "conn", "kind", "status", "active", "slots")
+
+    def state(self):
+        meta = {
+            "models": self.model_names.words, "statuses": self.status_names.words,
+            "mask": self.mask, "deleted": self.deleted,
+        }
+        return meta, {name: getattr(self, name).copy() for name in self.COLUMNS}
+
+    @classmethod
+    def restore(cls, meta, arrays):
+        registry = cls()
+        registry.model_names = Vocabulary(meta["models"])
+        registry.status_names = Vocabulary(meta["statuses"])
+        for name in cls.COLUMNS:
+            # Copia: las vistas de la instantanea son de solo lectura
+            setattr(registry, name, np.array(arrays[name]))
+        registry.width = registry.serial.dtype.itemsize
+        registry.mask = meta["mask"]
+        registry.deleted = meta["deleted"]
+        return registry
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.model, self.serial, self.conn, self.kind, self.status, self.active, self.slots))
@@ -0,0 +1,282 @@
+import os
+import numpy as np
+from PySide6.QtWidgets import QStyledItemDelegate
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QEvent, QRect, QSize, QTimer, Signal
+from PySide6.QtGui import QIcon, QPainter, QColor, QBrush, QPixmap
+from perf import timed
+
+BASE = os.path.dirname(__file__)
+
+COL_SENSOR, COL_SERIAL, COL_STATUS, COL_ACTION, COL_EDIT = range(5)
+ActiveRole = Qt.UserRole + 1
+# Leer Qt.X cuesta microsegundos en PySide: las cabeceras se piden por fila
+# en cada repulido del estilo, asi que se leen una sola vez
+DISPLAY_ROLE = Qt.DisplayRole
+HORIZONTAL = Qt.Horizontal
+
+FETCH_BATCH = 256
+ROW_HEIGHT = 36
+# Cuadros del switch: 0 apagado, el ultimo encendido, el resto la transicion
+TOGGLE_FRAMES = 6
+TOGGLE_OFF = QColor("#D3D5DA")
+TOGGLE_ON = QColor("#5BC4A2")
+
+
+def paint_toggle(painter, rect, t):
+    # Dibujo vectorial del switch; t va de 0 (apagado) a 1 (encendido)
+    painter.save()
+    painter.setRenderHint(QPainter.Antialiasing)
+    color = QColor(
+        round(TOGGLE_OFF.red() + (TOGGLE_ON.red() - TOGGLE_OFF.red()) * t),
+        round(TOGGLE_OFF.green() + (TOGGLE_ON.green() - TOGGLE_OFF.green()) * t),
+        round(TOGGLE_OFF.blue() + (TOGGLE_ON.blue() - TOGGLE_OFF.blue()) * t),
+    )
+    painter.setBrush(QBrush(color))
+    painter.setPen(Qt.NoPen)
+    painter.drawRoundedRect(rect, 14, 14)
+    painter.setBrush(QBrush(QColor("white")))
+    x = rect.x() + 4 + round((rect.width() - 28) * t)
+    painter.drawEllipse(x, rect.y() + 4, 20, 20)
+    painter.restore()
+
+
+# Cuadros del switch ya rasterizados por tamano y densidad de pixeles: pintar
+# una fila es copiar un pixmap en vez de rellenar un rectangulo redondeado
+# con antialiasing
+class ToggleSprites:
+    def __init__(self, frames=TOGGLE_FRAMES):
+        self.frames = frames
+        self._sheets = {}
+
+    def sheet(self, width, height, dpr):
+        key = (width, height, dpr)
+        sheet = self._sheets.get(key)
+        if sheet is None:
+            sheet = []
+            for i in range(self.frames):
+                pix = QPixmap(round(width * dpr), round(height * dpr))
+                pix.setDevicePixelRatio(dpr)
+                pix.fill(Qt.transparent)
+                painter = QPainter(pix)
+                paint_toggle(painter, QRect(0, 0, width, height), i / (self.frames - 1))
+                painter.end()
+                sheet.append(pix)
+            self._sheets[key] = sheet
+        return sheet
+
+    def frame(self, width, height, dpr, i):
+        return self.sheet(width, height, dpr)[i]
+
+
+toggle_sprites = ToggleSprites()
+
+
+def draw_toggle(painter, rect, checked, frame=None):
+    # frame: cuadro de la transicion; por defecto el del estado final
+    if frame is None:
+        frame = TOGGLE_FRAMES - 1 if checked else 0
+    dpr = painter.device().devicePixelRatioF()
+    painter.drawPixmap(rect.topLeft(), toggle_sprites.frame(rect.width(), rect.height(), dpr, frame))
+
+
+def centered(outer, width, height):
+    return QRect(
+        outer.x() + (outer.width() - width) // 2,
+        outer.y() + (outer.height() - height) // 2,
+        width, height
+    )
+
+
+# Model
+class SensorTableModel(QAbstractTableModel):
+    def __init__(self, registry=None, headers=None, parent=None):
+        super().__init__(parent)
+        self._registry = registry
+        self._visible = None
+        self._headers = list(headers or [""] * 5)
+        self._loaded = 0
+        self._changed = None
+
+    def set_rows(self, registry, visible=None):
+        # Solo se cargan filas a medida que la vista las pide
+        self.beginResetModel()
+        self._registry = registry
+        self._visible = visible
+        self._loaded = min(FETCH_BATCH, self.total())
+        self.endResetModel()
+
+    def set_visible(self, visible):
+        # visible: filas de origen ordenadas, o None para mostrar todas
+        self.set_rows(self._registry, visible)
+
+    def total(self):
+        if self._registry is None:
+            return 0
+        return len(self._registry) if self._visible is None else len(self._visible)
+
+    def source_row(self, row):
+        return row if self._visible is None else int(self._visible[row])
+
+    def set_headers(self, headers):
+        self._headers = list(headers)
+        self.headerDataChanged.emit(Qt.Horizontal, 0, len(self._headers) - 1)
+
+    def mark_changed(self, lo, hi=None):
+        # Rango de filas de origen; se acumula hasta el proximo flush
+        hi = lo if hi is None else hi
+        if self._changed is not None:
+            lo, hi = min(lo, self._changed[0]), max(hi, self._changed[1])
+        self._changed = (lo, hi)
+
+    def flush_changes(self):
+        # Un solo dataChanged que abarca todas las filas marcadas
+        if self._changed is None:
+            return
+        lo, hi = self._changed
+        self._changed = None
+        if self._visible is not None:
+            lo = int(np.searchsorted(self._visible, lo, "left"))
+            hi = int(np.searchsorted(self._visible, hi, "right")) - 1
+        hi = min(hi, self._loaded - 1)
+        if hi >= lo:
+            self.dataChanged.emit(self.index(lo, 0), self.index(hi, COL_EDIT))
+
+    def view_row(self, row):
+        if self._visible is None:
+            return row
+        i = int(np.searchsorted(self._visible, row))
+        if i >= len(self._visible) or self._visible[i] != row:
+            return None
+        return i
+
+    def row_changed(self, row):
+        row = self.view_row(row)
+        if row is not None and row < self._loaded:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, COL_EDIT))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 5
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < self.total()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH, self.total() - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.source_row(index.row())
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == COL_SENSOR:
+                return self._registry.model_text(row)
+            if col == COL_SERIAL:
+                return self._registry.serial_text(row)
+            if col == COL_STATUS:
+                return self._registry.status_text(row)
+        elif role == ActiveRole:
+            return bool(self._registry.active[row])
+        elif role == Qt.TextAlignmentRole and col >= COL_ACTION:
+            return int(Qt.AlignCenter)
+        return None
+
+    def headerData(self, section, orientation, role=DISPLAY_ROLE):
+        if role != DISPLAY_ROLE:
+            return None
+        if orientation == HORIZONTAL:
+            return self._headers[section] if section < len(self._headers) else None
+        return str(section + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled
+
+
+# Delegates
+class ClickableDelegate(QStyledItemDelegate):
+    clicked = Signal(int)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            if self.hit_rect(option.rect).contains(event.position().toPoint()):
+                self.clicked.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def hit_rect(self, rect):
+        return rect
+
+
+class ToggleDelegate(ClickableDelegate):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Filas de origen en transicion: [cuadro actual, cuadro final]. La
+        # perilla recorre los cuadros ya dibujados hasta el estado nuevo
+        self.moving = {}
+        self._anim = QTimer(self)
+        self._anim.setInterval(16)
+        self._anim.timeout.connect(self.step)
+
+    def animate(self, row, checked):
+        target = TOGGLE_FRAMES - 1 if checked else 0
+        frame = self.moving.get(row, [TOGGLE_FRAMES - 1 - target])[0]
+        self.moving[row] = [frame, target]
+        self._anim.start()
+
+    def step(self):
+        for row, state in list(self.moving.items()):
+            frame, target = state
+            state[0] = frame + (target > frame) - (target < frame)
+            if state[0] == target:
+                del self.moving[row]
+        if not self.moving:
+            self._anim.stop()
+        self.parent().viewport().update()
+
+    @timed("switch.paint")
+    def paint(self, painter, option, index):
+        QStyledItemDelegate.paint(self, painter, option, index)
+        state = self.moving.get(index.model().source_row(index.row()))
+        draw_toggle(
+            painter, self.hit_rect(option.rect), bool(index.data(ActiveRole)),
+            state[0] if state else None
+        )
+
+    def hit_rect(self, rect):
+        return centered(rect, 50, 28)
+
+
+class EditButtonDelegate(ClickableDelegate):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        icon_path = os.path.join(BASE, "assets", "edit.png")
+        self.icon = QIcon(icon_path) if os.path.exists(icon_path) else None
+        # Icono ya escalado por densidad de pixeles
+        self._pixmaps = {}
+
+    def pixmap(self, dpr):
+        pix = self._pixmaps.get(dpr)
+        if pix is None:
+            pix = self._pixmaps[dpr] = self.icon.pixmap(QSize(16, 16), dpr)
+        return pix
+
+    def paint(self, painter, option, index):
+        QStyledItemDelegate.paint(self, painter, option, index)
+        if self.icon is not None:
+            rect = centered(self.hit_rect(option.rect), 16, 16)
+            painter.drawPixmap(rect.topLeft(), self.pixmap(painter.device().devicePixelRatioF()))
+
+    def hit_rect(self, rect):
+        return centered(rect, 28, 28)
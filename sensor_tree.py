@@ -0,0 +1,213 @@
+import numpy as np
+from PySide6.QtWidgets import QTreeView, QAbstractItemView
+from PySide6.QtCore import Qt, QAbstractItemModel, QModelIndex, Signal
+from acquisition import CONN_TYPES, SENSOR_KINDS
+
+FETCH_BATCH = 256
+SerialRole = Qt.UserRole + 1
+GROUP, KIND, LEAF = range(3)
+# La vista pide flags de cada fila en cada layout: se arma una sola vez
+ITEM_FLAGS = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+EXPAND_LIMIT = 2000
+
+
+# Model
+# Arbol conexion -> tipo -> sensor sin un objeto por nodo: las filas se ordenan
+# por grupo y cada grupo es un rango [inicio, fin) de ese orden. El id interno
+# de cada indice dice el nivel y la posicion. Las hojas se cargan de a
+# FETCH_BATCH cuando la vista expande un grupo o llega al final del scroll.
+class SensorTreeModel(QAbstractItemModel):
+    def __init__(self, tr=None, parent=None):
+        super().__init__(parent)
+        self.tr = tr or {}
+        self.registry = None
+        self.conn = np.zeros(0, dtype=np.int64)
+        self.kind = np.zeros(0, dtype=np.int64)
+        self.filter = None
+        self.layout_rows(np.zeros(0, dtype=np.int64))
+
+    def set_sensors(self, registry, sensor_filter):
+        # Textos y categorias salen del registro; el arbol no guarda copias.
+        # El filtro es el de la tabla: las ediciones de series lo actualizan
+        # una sola vez y la busqueda lateral las ve
+        self.registry = registry
+        self.conn = registry.conn.astype(np.int64)
+        self.kind = registry.kind.astype(np.int64)
+        self.filter = sensor_filter
+        self.set_rows(None)
+
+    def set_rows(self, rows):
+        # rows: filas de origen visibles, o None para todas
+        self.beginResetModel()
+        if rows is None:
+            rows = np.arange(len(self.conn), dtype=np.int64)
+        self.layout_rows(np.asarray(rows, dtype=np.int64))
+        self.endResetModel()
+
+    def layout_rows(self, rows):
+        keys = self.conn[rows] * len(SENSOR_KINDS) + self.kind[rows]
+        order = np.argsort(keys, kind="stable")
+        self.order = rows[order]
+        keys = keys[order]
+        kinds, starts = np.unique(keys, return_index=True)
+        self.kind_key = kinds
+        self.kind_start = starts
+        self.kind_end = np.append(starts[1:], len(keys)).astype(np.int64)
+        self.loaded = np.zeros(len(kinds), dtype=np.int64)
+        groups, first = np.unique(kinds // len(SENSOR_KINDS), return_index=True)
+        self.group_conn = groups
+        self.group_first = first
+        self.group_end = np.append(first[1:], len(kinds)).astype(np.int64)
+
+    def deferred(self, text):
+        return self.filter is not None and self.filter.deferred(text)
+
+    def search(self, text):
+        if self.filter is None:
+            return 0
+        rows = self.filter.query(text)
+        self.set_rows(rows)
+        return len(self.order)
+
+    def set_translations(self, tr):
+        self.tr = tr
+        for g in range(len(self.group_conn)):
+            parent = self.index(g, 0)
+            count = self.rowCount(parent)
+            if count:
+                self.dataChanged.emit(self.index(0, 0, parent), self.index(count - 1, 0, parent))
+
+    # Ids: grupos, despues tipos, despues hojas (posicion en el orden)
+    def node(self, index):
+        n = index.internalId()
+        groups, kinds = len(self.group_conn), len(self.kind_key)
+        if n < groups:
+            return GROUP, n
+        if n < groups + kinds:
+            return KIND, n - groups
+        return LEAF, n - groups - kinds
+
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        groups, kinds = len(self.group_conn), len(self.kind_key)
+        if not parent.isValid():
+            return self.createIndex(row, column, id=row)
+        level, n = self.node(parent)
+        if level == GROUP:
+            return self.createIndex(row, column, id=groups + int(self.group_first[n]) + row)
+        if level == KIND:
+            return self.createIndex(row, column, id=groups + kinds + int(self.kind_start[n]) + row)
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        level, n = self.node(index)
+        if level == GROUP:
+            return QModelIndex()
+        if level == KIND:
+            g = int(np.searchsorted(self.group_first, n, "right")) - 1
+            return self.createIndex(g, 0, id=g)
+        k = int(np.searchsorted(self.kind_start, n, "right")) - 1
+        g = int(np.searchsorted(self.group_first, k, "right")) - 1
+        return self.createIndex(k - int(self.group_first[g]), 0, id=len(self.group_conn) + k)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        if not parent.isValid():
+            return len(self.group_conn)
+        level, n = self.node(parent)
+        if level == GROUP:
+            return int(self.group_end[n] - self.group_first[n])
+        if level == KIND:
+            return int(self.loaded[n])
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.group_conn) > 0
+        return self.node(parent)[0] != LEAF
+
+    def canFetchMore(self, parent):
+        if not parent.isValid():
+            return False
+        level, n = self.node(parent)
+        return level == KIND and bool(self.loaded[n] < self.kind_end[n] - self.kind_start[n])
+
+    def fetchMore(self, parent):
+        # La vista pasa una referencia a su propio item; se copia antes de que
+        # beginInsertRows reacomode la vista
+        parent = QModelIndex(parent)
+        if not self.canFetchMore(parent):
+            return
+        level, n = self.node(parent)
+        done = int(self.loaded[n])
+        count = min(FETCH_BATCH, int(self.kind_end[n] - self.kind_start[n]) - done)
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, done, done + count - 1)
+        self.loaded[n] += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        level, n = self.node(index)
+        if level == LEAF:
+            row = int(self.order[n])
+            if role in (Qt.DisplayRole, SerialRole):
+                return self.registry.serial_text(row)
+            if role == Qt.ToolTipRole:
+                return self.registry.model_text(row)
+            return None
+        if role != Qt.DisplayRole:
+            return None
+        if level == GROUP:
+            count = self.kind_end[self.group_end[n] - 1] - self.kind_start[self.group_first[n]]
+            return f"{CONN_TYPES[self.group_conn[n]]} ({count})"
+        kind = SENSOR_KINDS[self.kind_key[n] % len(SENSOR_KINDS)]
+        return f"{self.tr.get(kind, kind)} ({self.kind_end[n] - self.kind_start[n]})"
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return ITEM_FLAGS
+
+
+# View
+class SensorTree(QTreeView):
+    sensorActivated = Signal(str)
+
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setObjectName("SensorTree")
+        self.setModel(model)
+        self.setHeaderHidden(True)
+        # Altura de fila fija: la vista no mide cada item para ubicar el scroll
+        self.setUniformRowHeights(True)
+        self.setIndentation(12)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.clicked.connect(self.on_clicked)
+
+    def on_clicked(self, index):
+        serial = index.data(SerialRole)
+        if serial is not None:
+            self.sensorActivated.emit(serial)
+
+    def expand_matches(self, searching):
+        # Los grupos son pocos: se abren siempre; los tipos solo si la busqueda
+        # dejo pocos resultados
+        model = self.model()
+        open_kinds = searching and len(model.order) <= EXPAND_LIMIT
+        for g in range(model.rowCount()):
+            group = model.index(g, 0)
+            self.expand(group)
+            if open_kinds:
+                for k in range(model.rowCount(group)):
+                    self.expand(model.index(k, 0, group))
@@ -0,0 +1,354 @@
+import os, json, time, signal
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+from acquisition import CHANNELS
+from analytics import METRIC_DTYPE
+from events import EVENT_DTYPE
+from sensor_registry import SensorRegistry, Vocabulary
+from snapshot import aligned, dtype_descr, descr_dtype
+
+MAGIC = int.from_bytes(b"RHFLEET1", "little")
+VERSION = 1
+# Encabezado (int64): magic, version, secuencia, largo del JSON, cerrado
+H_MAGIC, H_VERSION, H_SEQ, H_JSON, H_CLOSED = range(5)
+HEADER = 64
+# Contadores (int64)
+C_ANALYTICS, C_EV_HEAD, C_EV_SIZE, C_CHART, C_READINGS, C_CONNECTED, C_EVENTS, C_SUMMARY = range(8)
+COUNTERS = 8
+# Muestras por sensor para las paginas de detalle de las vistas y puntos de
+# los graficos de tasas
+TAIL = 32
+CHART_CAPACITY = 100_000
+ATTACH_TIMEOUT_S = 5.0
+READ_RETRIES = 1000
+
+
+# Bloque de memoria compartida con la flota que calcula un solo proceso. Un
+# encabezado, la ubicacion de cada arreglo en JSON (como en las instantaneas)
+# y los arreglos alineados a 64 bytes. Las vistas solo leen: el costo de
+# adquirir y procesar se paga una vez, sin importar cuantas ventanas miren.
+#
+# Concurrencia por seqlock: el escritor pone la secuencia impar, escribe y la
+# vuelve a poner par; el lector copia lo que necesita y reintenta si la vio
+# impar o si cambio mientras copiaba. Sin locks entre procesos: un lector
+# nunca frena al escritor. Se apoya en que las escrituras llegan en orden
+# (x86); numpy no expone barreras de memoria.
+def layout_arrays(specs):
+    layout, offset = {}, 0
+    for name, (dtype, shape) in specs.items():
+        dtype = np.dtype(dtype)
+        layout[name] = [offset, dtype_descr(dtype), list(shape)]
+        offset = aligned(offset + dtype.itemsize * int(np.prod(shape, dtype=np.int64)))
+    return layout, offset
+
+
+def array_views(buf, start, layout):
+    views = {}
+    for name, (offset, descr, shape) in layout.items():
+        dtype = descr_dtype(descr)
+        count = int(np.prod(shape, dtype=np.int64))
+        views[name] = np.ndarray(shape, dtype=dtype, buffer=buf, offset=start + offset) if count else np.zeros(shape, dtype)
+    return views
+
+
+class FleetPublisher:
+    def __init__(self, name, fleet, tail=TAIL, chart=CHART_CAPACITY):
+        self.fleet = fleet
+        registry = fleet.registry
+        n, ch = len(registry), len(CHANNELS)
+        analyzed = fleet.analytics.n_sensors
+        specs = {f"registry.{c}": (getattr(registry, c).dtype, getattr(registry, c).shape) for c in registry.COLUMNS}
+        specs.update({
+            "counters": (np.int64, (COUNTERS,)),
+            "changes": (np.float64, (2,)),
+            "means": (np.float64, (ch,)),
+            "known": (np.int64, (ch,)),
+            "summary": (METRIC_DTYPE, (ch,)),
+            "metrics": (METRIC_DTYPE, (analyzed, ch)),
+            "valid": (bool, (analyzed,)),
+            "events": (EVENT_DTYPE, fleet.events.log.records.shape),
+            "tail.values": (np.float32, (tail, n, ch)),
+            "tail.ts": (np.float64, (tail, n)),
+            "tail.total": (np.int64, (n,)),
+        })
+        for key in ("data", "events"):
+            specs[f"chart.{key}.x"] = (np.float64, (chart,))
+            specs[f"chart.{key}.y"] = (np.float64, (chart,))
+        layout, size = layout_arrays(specs)
+        head = json.dumps({
+            "arrays": layout, "models": registry.model_names.words, "statuses": registry.status_names.words,
+            "mask": registry.mask, "deleted": registry.deleted,
+            "rules": [r.name for r in fleet.events.rules], "tail": tail, "chart": chart,
+        }).encode("utf-8")
+        start = aligned(HEADER + len(head))
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=start + size)
+        self.header = np.ndarray((HEADER // 8,), dtype=np.int64, buffer=self.shm.buf)
+        self.shm.buf[HEADER:HEADER + len(head)] = head
+        self.arrays = array_views(self.shm.buf, start, layout)
+        # El registro no cambia mientras publica: se copia una sola vez
+        for c in registry.COLUMNS:
+            self.arrays[f"registry.{c}"][:] = getattr(registry, c)
+        self.arrays["changes"][:] = np.nan
+        self.tail = tail
+        self.chart = chart
+        self.header[H_VERSION] = VERSION
+        self.header[H_JSON] = len(head)
+        # Magic al final: las vistas esperan a verlo para leer el resto
+        self.header[H_MAGIC] = MAGIC
+
+    def publish(self, ingested, fresh):
+        # ingested: [(lote, (eventos, punto))] como los devuelve Fleet.ingest
+        fleet, a = self.fleet, self.arrays
+        stats = fleet.stats()
+        known, means = fleet.means()
+        summary = fleet.summary() if fresh else None
+        self.header[H_SEQ] += 1
+        for batch, (events, point) in ingested:
+            self.add_tail(batch)
+            self.add_events(events)
+            if point is not None:
+                self.add_point(point)
+        c = a["counters"]
+        c[C_READINGS], c[C_CONNECTED], c[C_EVENTS] = stats["readings"], stats["connected"], stats["events"]
+        a["changes"][:] = [np.nan if v is None else v for v in (stats["readings_change"], stats["events_change"])]
+        a["means"][:] = means
+        a["known"][:] = known
+        analytics = fleet.analytics
+        if fresh and analytics is not None:
+            a["metrics"][:] = analytics.result
+            a["valid"][:] = analytics.valid
+            c[C_SUMMARY] = summary is not None
+            if summary is not None:
+                for key in METRIC_DTYPE.names:
+                    a["summary"][key] = summary[key]
+            c[C_ANALYTICS] += 1
+        self.header[H_SEQ] += 1
+
+    def add_tail(self, batch):
+        k, count = batch.values.shape[:2]
+        rows = slice(batch.offset, batch.offset + count)
+        total = self.arrays["tail.total"]
+        ts, values = batch.timestamps, batch.values
+        if k > self.tail:
+            ts, values = ts[-self.tail:], values[-self.tail:]
+        heads = total[rows]
+        if (heads == heads[0]).all():
+            # Los sensores de una fuente avanzan juntos: una copia por muestra
+            for j in range(len(ts)):
+                slot = (int(heads[0]) + k - len(ts) + j) % self.tail
+                self.arrays["tail.values"][slot, rows] = values[j]
+                self.arrays["tail.ts"][slot, rows] = ts[j]
+        else:
+            slot = (heads[None, :] + k - len(ts) + np.arange(len(ts))[:, None]) % self.tail
+            cols = np.arange(rows.start, rows.stop)[None, :]
+            self.arrays["tail.values"][slot, cols] = values
+            self.arrays["tail.ts"][slot, cols] = ts[:, None]
+        total[rows] += k
+
+    def add_events(self, events):
+        if not len(events):
+            return
+        records, c = self.arrays["events"], self.arrays["counters"]
+        cap = len(records)
+        if len(events) > cap:
+            events = events[-cap:]
+        records[(c[C_EV_HEAD] + np.arange(len(events))) % cap] = events
+        c[C_EV_HEAD] = (c[C_EV_HEAD] + len(events)) % cap
+        c[C_EV_SIZE] = min(cap, c[C_EV_SIZE] + len(events))
+
+    def add_point(self, point):
+        t, rate, event_rate = point
+        c = self.arrays["counters"]
+        i = c[C_CHART] % self.chart
+        self.arrays["chart.data.x"][i] = self.arrays["chart.events.x"][i] = t
+        self.arrays["chart.data.y"][i] = rate
+        self.arrays["chart.events.y"][i] = event_rate
+        c[C_CHART] += 1
+
+    def close(self, unlink=True):
+        # Las vistas que sigan abiertas conservan su mapeo
+        self.header[H_CLOSED] = 1
+        self.header = self.arrays = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+# Vista de solo lectura de una flota publicada: mismos metodos de lectura que
+# Fleet, mas poll() para traer lo nuevo en cada tick de la interfaz
+class FleetView:
+    def __init__(self, name, timeout=ATTACH_TIMEOUT_S):
+        self.shm = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            # Al adjuntarse, resource_tracker lo borraria al salir este proceso;
+            # el bloque es del motor
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.header = np.ndarray((HEADER // 8,), dtype=np.int64, buffer=self.shm.buf)
+        deadline = time.monotonic() + timeout
+        while self.header[H_MAGIC] != MAGIC:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{name}: no fleet published")
+            time.sleep(0.01)
+        if self.header[H_VERSION] != VERSION:
+            raise ValueError(f"{name}: fleet version {self.header[H_VERSION]}, expected {VERSION}")
+        head = json.loads(bytes(self.shm.buf[HEADER:HEADER + int(self.header[H_JSON])]))
+        self.arrays = array_views(self.shm.buf, aligned(HEADER + int(self.header[H_JSON])), head["arrays"])
+        for array in self.arrays.values():
+            array.flags.writeable = False
+        self.rules = head["rules"]
+        self.tail = head["tail"]
+        self.chart = head["chart"]
+        self.registry = self.attach_registry(head)
+        self.seq = None
+        self.chart_cursor = 0
+        self.analytics_version = 0
+        self._stats = {"readings": 0, "readings_change": None, "connected": 0, "events": 0, "events_change": None}
+        self._means = (np.zeros(len(CHANNELS), dtype=np.int64), np.zeros(len(CHANNELS)))
+        self._summary = None
+
+    def attach_registry(self, head):
+        # Columnas sin copia sobre el bloque; los vocabularios viajan en el JSON
+        registry = SensorRegistry()
+        registry.model_names = Vocabulary(head["models"])
+        registry.status_names = Vocabulary(head["statuses"])
+        for c in SensorRegistry.COLUMNS:
+            setattr(registry, c, self.arrays[f"registry.{c}"])
+        registry.width = registry.serial.dtype.itemsize
+        registry.mask = head["mask"]
+        registry.deleted = head["deleted"]
+        return registry
+
+    def read(self, fn):
+        # fn debe copiar lo que devuelve; None si el escritor no suelta el bloque
+        for attempt in range(READ_RETRIES):
+            seq = self.header[H_SEQ]
+            if not seq & 1:
+                out = fn()
+                if self.header[H_SEQ] == seq:
+                    return out
+            if attempt > 8:
+                time.sleep(0)
+        return None
+
+    def poll(self):
+        # None si no hubo publicaciones desde el ultimo poll; si no,
+        # ((t, lecturas/s, eventos/s) nuevos, analisis nuevo)
+        seq = self.header[H_SEQ]
+        if seq == self.seq:
+            return None
+        out = self.read(self.read_poll)
+        if out is None:
+            return None
+        self.seq, self.chart_cursor, points, stats, means, summary, version = out
+        self._stats, self._means = stats, means
+        fresh = version != self.analytics_version
+        if fresh:
+            self._summary = summary
+            self.analytics_version = version
+        return points, fresh
+
+    def read_poll(self):
+        a = self.arrays
+        c = a["counters"].copy()
+        changes = a["changes"].copy()
+        stats = {
+            "readings": int(c[C_READINGS]), "connected": int(c[C_CONNECTED]), "events": int(c[C_EVENTS]),
+            "readings_change": None if np.isnan(changes[0]) else float(changes[0]),
+            "events_change": None if np.isnan(changes[1]) else float(changes[1]),
+        }
+        total = int(c[C_CHART])
+        idx = np.arange(max(self.chart_cursor, total - self.chart), total) % self.chart
+        points = (a["chart.data.x"][idx], a["chart.data.y"][idx], a["chart.events.y"][idx])
+        summary = None
+        if c[C_ANALYTICS] != self.analytics_version and c[C_SUMMARY]:
+            values = a["summary"].copy()
+            summary = {key: values[key] for key in METRIC_DTYPE.names}
+        # La secuencia leida aca es la que read() valida despues
+        return int(self.header[H_SEQ]), total, points, stats, (a["known"].copy(), a["means"].copy()), summary, int(c[C_ANALYTICS])
+
+    def samples(self, row, cursor):
+        # Muestras del sensor desde cursor (las ultimas tail como mucho):
+        # (nuevo cursor, timestamps, (muestras, canales))
+        def read():
+            total = int(self.arrays["tail.total"][row])
+            idx = np.arange(max(cursor, total - self.tail), total) % self.tail
+            return total, self.arrays["tail.ts"][idx, row], self.arrays["tail.values"][idx, row]
+        return self.read(read) or (cursor, np.zeros(0), np.zeros((0, len(CHANNELS)), dtype=np.float32))
+
+    # Lectura, como Fleet
+    def stats(self):
+        return self._stats
+
+    def means(self):
+        return self._means
+
+    def summary(self):
+        return self._summary
+
+    def metrics(self, row):
+        if row >= len(self.arrays["valid"]):
+            return None
+        out = self.read(lambda: (bool(self.arrays["valid"][row]), self.arrays["metrics"][row].copy()))
+        if out is None or not out[0]:
+            return None
+        return out[1]
+
+    def recent_events(self, count):
+        def read():
+            c, records = self.arrays["counters"], self.arrays["events"]
+            n = min(count, int(c[C_EV_SIZE]))
+            return records[(int(c[C_EV_HEAD]) - 1 - np.arange(n)) % len(records)]
+        events = self.read(read)
+        if events is None:
+            return []
+        return [
+            (float(ev["t"]), int(ev["sensor"]), self.rules[ev["rule"]], float(ev["value"]))
+            for ev in events
+        ]
+
+    def closed(self):
+        return bool(self.header[H_CLOSED])
+
+    def close(self):
+        self.header = self.arrays = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # El registro de la tabla todavia apunta al bloque: el mapeo se
+            # libera con el proceso
+            pass
+
+
+# Motor sin ventana: adquiere, procesa y publica; las ventanas se adjuntan
+# con FleetView. Corre hasta SIGINT/SIGTERM y borra el bloque al salir
+def serve(name, sources, rules=None, tail=TAIL, chart=CHART_CAPACITY):
+    from PySide6.QtCore import QCoreApplication, QTimer
+    from acquisition import AcquisitionEngine
+    from fleet import Fleet
+    app = QCoreApplication.instance() or QCoreApplication([])
+    engine = AcquisitionEngine(sources)
+    fleet = Fleet(SensorRegistry(engine.sensors()), rules)
+    publisher = FleetPublisher(name, fleet, tail, chart)
+
+    def on_batches():
+        batches = engine.take()
+        if not batches:
+            return
+        ingested = [(batch, fleet.ingest(batch)) for batch in batches]
+        publisher.publish(ingested, fleet.analyze(time.monotonic()))
+
+    engine.batchesReady.connect(on_batches)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: app.quit())
+    # Las senales de Python solo se atienden cuando el loop vuelve al interprete
+    idle = QTimer()
+    idle.timeout.connect(lambda: None)
+    idle.start(200)
+    engine.start()
+    try:
+        return app.exec()
+    finally:
+        idle.stop()
+        engine.stop()
+        fleet.close()
+        publisher.close(unlink=True)
@@ -0,0 +1,152 @@
+import os, json, struct, threading
+
+# numpy se importa recien al mapear o escribir: main lee el encabezado (tema,
+# idioma, estado de la barra) antes de mostrar la ventana, y numpy no entra en
+# ese camino
+
+MAGIC = b"RHSNAP\x00\x01"
+ALIGN = 64
+
+
+def aligned(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def dtype_descr(dtype):
+    # Descripcion de numpy apta para JSON (tambien para dtypes estructurados)
+    import numpy as np
+    return np.lib.format.dtype_to_descr(dtype)
+
+
+def from_json(descr):
+    # JSON devuelve listas donde numpy espera tuplas: (nombre, tipo[, forma])
+    if isinstance(descr, str):
+        return descr
+    return [(f[0], from_json(f[1]), *[tuple(shape) for shape in f[2:]]) for f in descr]
+
+
+def descr_dtype(descr):
+    import numpy as np
+    return np.lib.format.descr_to_dtype(from_json(descr))
+
+
+# Formato: MAGIC, largo del encabezado (uint64), encabezado JSON con el estado
+# y la ubicacion de cada arreglo, y los arreglos crudos alineados a 64 bytes
+# para poder mapearlos sin copiar
+def write_snapshot(path, state, arrays):
+    import numpy as np
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = [offset, dtype_descr(array.dtype), list(array.shape)]
+        offset = aligned(offset + array.nbytes)
+    head = json.dumps({"state": state, "arrays": layout, "size": offset}).encode("utf-8")
+    start = aligned(len(MAGIC) + 8 + len(head))
+    # Se escribe aparte y se reemplaza: nunca queda una instantanea a medias
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(head)))
+        f.write(head)
+        for name, array in arrays.items():
+            f.seek(start + layout[name][0])
+            np.ascontiguousarray(array).tofile(f)
+        f.truncate(start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# Instantanea abierta: el estado va a memoria y los arreglos se mapean con el
+# primer get(); cada get() es una vista sin copia
+class Snapshot:
+    def __init__(self, path):
+        # El archivo queda abierto hasta mapearlo: si el escritor lo reemplaza
+        # antes, se sigue leyendo la instantanea de este encabezado
+        self.file = open(path, "rb")
+        try:
+            header, size = self.read_header(path)
+        except BaseException:
+            self.file.close()
+            raise
+        self.state = header["state"]
+        self.layout = header["arrays"]
+        self.start = aligned(len(MAGIC) + 8 + size)
+        self.raw = None
+
+    def read_header(self, path):
+        f = self.file
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: not a snapshot")
+        head = f.read(8)
+        # Largo cortado o mayor que el archivo: escritura interrumpida
+        if len(head) < 8:
+            raise ValueError(f"{path}: truncated snapshot")
+        size, = struct.unpack("<Q", head)
+        file_size = os.fstat(f.fileno()).st_size
+        if size > file_size:
+            raise ValueError(f"{path}: truncated snapshot")
+        header = json.loads(f.read(size))
+        if file_size < aligned(len(MAGIC) + 8 + size) + header["size"]:
+            raise ValueError(f"{path}: truncated snapshot")
+        return header, size
+
+    def __contains__(self, name):
+        return name in self.layout
+
+    def get(self, name):
+        import numpy as np
+        if self.raw is None:
+            self.raw = np.memmap(self.file, dtype=np.uint8, mode="r")
+            self.file.close()
+        offset, descr, shape = self.layout[name]
+        dtype = descr_dtype(descr)
+        start = self.start + offset
+        count = int(np.prod(shape, dtype=np.int64))
+        return self.raw[start:start + count * dtype.itemsize].view(dtype).reshape(shape)
+
+    def group(self, prefix):
+        # Arreglos "prefijo.nombre" como {nombre: vista}
+        head = prefix + "."
+        return {name[len(head):]: self.get(name) for name in self.layout if name.startswith(head)}
+
+    def close(self):
+        # Las vistas que sigan vivas mantienen el mapeo por referencia
+        self.file.close()
+        self.raw = None
+
+
+def load_snapshot(path):
+    # None si no hay instantanea o no se puede leer: se arranca de cero
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return Snapshot(path)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+# Escritor en segundo plano: el hilo de la interfaz solo copia el estado
+class SnapshotWriter:
+    def __init__(self, path):
+        self.path = path
+        self._thread = None
+
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def save(self, state, arrays, wait=False):
+        if wait:
+            self.join()
+            write_snapshot(self.path, state, arrays)
+            return True
+        if self.busy():
+            return False
+        self._thread = threading.Thread(target=write_snapshot, args=(self.path, state, arrays), daemon=True)
+        self._thread.start()
+        return True
+
+    def join(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,30 @@
+import sys, time
+
+# Referencia lo mas temprana posible: main.py importa este modulo primero
+T0 = time.perf_counter()
+
+
+# Tiempos de arranque por fase
+class StartupTimer:
+    def __init__(self, t0=T0):
+        self.t0 = t0
+        self.last = t0
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000, (now - self.t0) * 1000))
+        self.last = now
+
+    def report(self):
+        width = max([len(p[0]) for p in self.phases] + [5])
+        lines = [f"{'phase':<{width}}  {'ms':>8}  {'total':>8}"]
+        for phase, ms, total in self.phases:
+            lines.append(f"{phase:<{width}}  {ms:8.1f}  {total:8.1f}")
+        return "\n".join(lines)
+
+    def print_report(self, stream=None):
+        print(self.report(), file=stream or sys.stderr)
+
+
+timer = StartupTimer()
@@ -0,0 +1,99 @@
+import numpy as np
+
+
+# Ring buffer
+# Cada muestra se escribe dos veces (posicion i e i + capacity), asi las
+# ultimas `size` muestras siempre forman una vista contigua sin copias.
+class RingBuffer:
+    def __init__(self, capacity, dtype=np.float64):
+        self.capacity = int(capacity)
+        self._buf = np.zeros(2 * self.capacity, dtype=dtype)
+        self._head = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self._head = 0
+        self.size = 0
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._buf.dtype).ravel()
+        cap = self.capacity
+        if len(values) > cap:
+            values = values[-cap:]
+        n = len(values)
+        if n == 0:
+            return
+        start = self._head
+        first = min(n, cap - start)
+        self._buf[start:start + first] = values[:first]
+        self._buf[start + cap:start + cap + first] = values[:first]
+        rest = n - first
+        if rest:
+            self._buf[:rest] = values[first:]
+            self._buf[cap:cap + rest] = values[first:]
+        self._head = (start + n) % cap
+        self.size = min(cap, self.size + n)
+
+    def append(self, value):
+        self.extend((value,))
+
+    def view(self):
+        end = self._head + self.capacity
+        return self._buf[end - self.size:end]
+
+    def last(self):
+        return self._buf[self._head + self.capacity - 1] if self.size else None
+
+
+def envelope(x, y, x0, x1, pixels):
+    # Por columna de pixel en [x0, x1]: (x central, minimo, maximo, promedio).
+    # None si los puntos ya son pocos y conviene dibujarlos tal cual. x debe
+    # estar ordenado
+    columns = max(1, int(pixels))
+    lo = int(np.searchsorted(x, x0, "left"))
+    hi = int(np.searchsorted(x, x1, "right"))
+    if hi - lo <= 4 * columns or not x1 > x0:
+        return None
+    edges = np.searchsorted(x[lo:hi], np.linspace(x0, x1, columns + 1)[1:-1]) + lo
+    starts = np.unique(np.concatenate(([lo], edges)))
+    starts = starts[starts < hi]
+    ends = np.append(starts[1:], hi)
+    cx = (x[starts] + x[ends - 1]) / 2
+    mean = np.add.reduceat(y[:hi], starts, dtype=np.float64) / (ends - starts)
+    return cx, np.minimum.reduceat(y[:hi], starts), np.maximum.reduceat(y[:hi], starts), mean
+
+
+# Serie en vivo: con mas puntos que pixeles la linea recibe el promedio por
+# columna y la banda (un poligono del mismo color) el minimo y maximo. Una
+# linea en zigzag entre minimo y maximo pinta lo mismo pero rasterizarla
+# cuesta decenas de ms por cuadro con datos ruidosos
+class Stream:
+    def __init__(self, line, capacity, band):
+        self.line = line
+        self.band = band
+        self.x = RingBuffer(capacity)
+        self.y = RingBuffer(capacity, dtype=np.float32)
+
+    def push(self, x, y):
+        self.x.extend(x)
+        self.y.extend(y)
+
+    def sync(self, x0, x1, pixels):
+        x, y = self.x.view(), self.y.view()
+        columns = envelope(x, y, x0, x1, pixels)
+        if columns is None:
+            self.line.set_data(x, y)
+            self.band.set_verts([])
+            return
+        cx, lo, hi, mean = columns
+        self.line.set_data(cx, mean)
+        self.band.set_verts([np.column_stack((np.concatenate((cx, cx[::-1])), np.concatenate((hi, lo[::-1]))))])
+
+    def bounds(self):
+        if not self.x.size:
+            return None
+        y = self.y.view()
+        return self.x.view()[0], self.x.last(), float(y.min()), float(y.max())
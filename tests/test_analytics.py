@@ -0,0 +1,31 @@
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from analytics import AnalyticsEngine
+
+
+def test_gaps_repeat_the_previous_reading():
+    engine = AnalyticsEngine(3, 2, window=16)
+    first = np.arange(6, dtype=np.float32).reshape(1, 3, 2)
+    engine.add(0, np.array([0.0]), first)
+    values = np.random.default_rng(0).random((5, 3, 2)).astype(np.float32)
+    values[np.random.default_rng(1).random(values.shape) < 0.4] = np.nan
+    engine.add(0, np.arange(1.0, 6.0), values)
+    # Referencia: la muestra anterior de cada sensor y canal, en orden
+    expected, prev = values.copy(), first[0]
+    for sample in expected:
+        gaps = np.isnan(sample)
+        sample[gaps] = prev[gaps]
+        prev = sample
+    assert np.array_equal(engine.ring[1:6], expected)
+    assert engine.pool is None and engine.shm is None
+    engine.close()
+
+
+def test_rows_past_the_cap_are_ignored():
+    engine = AnalyticsEngine(4, 1, window=8)
+    engine.add(2, np.arange(3.0), np.ones((3, 6, 1), dtype=np.float32))
+    engine.add(6, np.arange(3.0), np.ones((3, 2, 1), dtype=np.float32))
+    assert list(engine.filled) == [0, 0, 3, 3]
+    engine.close()
@@ -0,0 +1,19 @@
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from history_store import HistoryStore
+
+
+def test_new_chunks_are_synced_before_the_manifest(tmp_path):
+    store = HistoryStore(str(tmp_path), chunk_size=8)
+    ts = np.arange(20, dtype=np.float64)
+    store.append_block(["S0", "S1"], ["a", "b"], ts, np.ones((20, 2, 2), dtype=np.float32))
+    store.flush()
+    # Tres chunks por sensor, todos nombrados por el manifiesto y ya sincronizados
+    assert all(not store.log(s).unsynced for s in ("S0", "S1"))
+    store.close()
+
+    reopened = HistoryStore(str(tmp_path))
+    t, v = reopened.read("S1", "b")
+    assert np.array_equal(t, ts) and np.all(v == 1)
@@ -0,0 +1,45 @@
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from lod import LodPyramid
+
+
+def pyramid(n):
+    p = LodPyramid()
+    x = np.arange(n, dtype=np.float64)
+    # En dos tandas, como llegan los datos en vivo
+    p.append(x[:n // 3], np.sin(x[:n // 3]))
+    p.append(x[n // 3:], np.sin(x[n // 3:]))
+    return p
+
+
+@pytest.mark.parametrize("mode", ["minmax", "lttb"])
+@pytest.mark.parametrize("x0", [0, 1, 500, 900])
+def test_select_reaches_last_sample(mode, x0):
+    # La serie devuelta llega hasta el ultimo bin: el hueco al final es
+    # menor que lo que representa un pixel
+    n, pixels = 1000, 50
+    out_x, _ = pyramid(n).select(x0, n - 1, pixels, mode)
+    assert n - 1 - out_x[-1] < (n - 1 - x0) / pixels
+    assert np.all(np.diff(out_x) >= 0)
+
+
+@pytest.mark.parametrize("mode", ["minmax", "lttb"])
+@pytest.mark.parametrize("x0", [0, 500])
+def test_select_skips_no_bin(mode, x0):
+    # Cada bin del nivel elegido aporta al menos un punto hasta el final
+    n, pixels = 1000, 50
+    width = 1
+    while (n - x0) / width > pixels:
+        width *= 2
+    out_x, _ = pyramid(n).select(x0, n - 1, pixels, mode)
+    bins = np.unique(out_x // width)
+    assert np.all(np.diff(bins) == 1)
+
+
+@pytest.mark.parametrize("mode", ["minmax", "lttb"])
+def test_select_same_tail_with_or_without_start(mode):
+    p = pyramid(1000)
+    assert p.select(0, 999, 50, mode)[0][-1] == p.select(500, 999, 50, mode)[0][-1]
@@ -0,0 +1,48 @@
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import sensor_filter
+from sensor_filter import SensorFilter, WIDTH
+
+
+def make(n=1000):
+    texts = [f"S{i % 7} SN-{i:07d}" for i in range(n)]
+    f = SensorFilter(texts, np.arange(n) % 2, np.arange(n) % 3, 2, 3)
+    f.ready.wait()
+    return f
+
+
+def test_text_waits_for_index():
+    f = make()
+    f.ready.clear()
+    assert f.deferred("sn-0000001")
+    # Sin indices solo filtran las categorias
+    assert np.array_equal(f.query("sn-0000001", conn=1), np.flatnonzero(np.arange(1000) % 2 == 1))
+    f.ready.set()
+    assert not f.deferred("sn-0000001")
+    assert list(f.query("sn-0000001")) == [1]
+
+
+def test_edit_is_clipped_like_the_matrix():
+    f = make()
+    f.update_text(5, "X" * WIDTH + "tail")
+    assert 5 in f.query("x" * WIDTH)
+    assert 5 not in f.query("xtail")
+
+
+def test_rebuild_swaps_in_edits(monkeypatch):
+    monkeypatch.setattr(sensor_filter, "REBUILD_AFTER", 3)
+    f = make()
+    for row in range(5):
+        f.update_text(row, f"edited-{row}")
+    # El rearmado corre en otro hilo; mientras tanto las ediciones ya se ven
+    assert list(f.query("edited-")) == [0, 1, 2, 3, 4]
+    for _ in range(200):
+        if not f._rebuilding:
+            break
+        time.sleep(0.01)
+    assert not f._rebuilding
+    assert len(f.edited) <= 1
+    assert list(f.query("edited-")) == [0, 1, 2, 3, 4]
+    assert len(f.query("sn-000000")) == 5
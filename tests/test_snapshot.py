@@ -0,0 +1,47 @@
+import os, sys, struct, subprocess
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pytest
+from snapshot import MAGIC, write_snapshot, load_snapshot
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "state.snap")
+    write_snapshot(path, {"source": "sim"}, {"a": np.arange(10, dtype=np.float32)})
+    snap = load_snapshot(path)
+    assert snap.state == {"source": "sim"}
+    assert np.array_equal(snap.get("a"), np.arange(10, dtype=np.float32))
+    snap.close()
+
+
+# Archivos cortados despues de MAGIC: se ignoran en vez de romper el arranque
+@pytest.mark.parametrize("body", [b"", b"\x01\x02\x03", struct.pack("<Q", 1 << 62), struct.pack("<Q", 40) + b"{"])
+def test_truncated_header(tmp_path, body):
+    path = tmp_path / "state.snap"
+    path.write_bytes(MAGIC + body)
+    assert load_snapshot(str(path)) is None
+
+
+# main lee el encabezado antes de mostrar la ventana: sin numpy en ese camino
+def test_header_does_not_import_numpy(tmp_path):
+    path = str(tmp_path / "state.snap")
+    write_snapshot(path, {"ui": {"theme": "dark"}}, {"a": np.arange(10, dtype=np.float32)})
+    code = (
+        "import sys; from snapshot import load_snapshot; "
+        f"snap = load_snapshot({path!r}); "
+        "assert snap.state == {'ui': {'theme': 'dark'}}; "
+        "assert 'numpy' not in sys.modules"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+def test_mapping_survives_replace(tmp_path):
+    path = str(tmp_path / "state.snap")
+    write_snapshot(path, {}, {"a": np.arange(10, dtype=np.float32)})
+    snap = load_snapshot(path)
+    # El escritor reemplaza el archivo antes del primer get()
+    write_snapshot(path, {}, {"b": np.ones(3, dtype=np.int64)})
+    assert np.array_equal(snap.get("a"), np.arange(10, dtype=np.float32))
+    snap.close()
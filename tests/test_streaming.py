@@ -0,0 +1,21 @@
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from streaming import envelope
+
+
+def test_envelope_keeps_extremes():
+    x = np.arange(100_000, dtype=np.float64)
+    y = np.random.default_rng(0).standard_normal(len(x)).astype(np.float32)
+    cx, lo, hi, mean = envelope(x, y, x[0], x[-1], 500)
+    assert len(cx) <= 500
+    assert lo.min() == y.min() and hi.max() == y.max()
+    assert np.all(lo <= mean) and np.all(mean <= hi)
+    # Las columnas cubren del primer al ultimo punto
+    assert cx[0] < x[len(x) // 500] and cx[-1] > x[-len(x) // 500]
+
+
+def test_envelope_skips_few_points():
+    x = np.arange(1000, dtype=np.float64)
+    assert envelope(x, np.zeros(1000, dtype=np.float32), 0, 999, 500) is None
@@ -0,0 +1,143 @@
+import os, re, threading
+from PySide6.QtGui import QIcon, QPixmap, QImage
+from PySide6.QtCore import Qt
+
+BASE = os.path.dirname(__file__)
+THEMES = ("light", "dark")
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_SPACE = re.compile(r"\s+")
+
+
+def compile_qss(text):
+    # Sin comentarios ni espacios de mas, Qt tiene menos que parsear
+    text = _COMMENT.sub("", text)
+    text = _SPACE.sub(" ", text)
+    return re.sub(r"\s*([{};,])\s*", r"\1", text).strip()
+
+
+def scope_qss(text, theme):
+    # Cada selector vale solo bajo un widget con la propiedad theme, o en el
+    # widget mismo si la tiene (ventanas sueltas como menus). El atributo va
+    # antes de pseudo-estados y sub-controles
+    attr = f'[theme="{theme}"]'
+    rules = []
+    for selectors, body in re.findall(r"([^{}]+)\{([^{}]*)\}", text):
+        scoped = []
+        for sel in selectors.split(","):
+            sel = sel.strip()
+            head, _, last = sel.rpartition(" ")
+            name, colon, rest = last.partition(":")
+            scoped.append(f"*{attr} {sel}")
+            scoped.append(f"{head} {name}{attr}{colon}{rest}".strip())
+        rules.append(",".join(scoped) + "{" + body + "}")
+    return "".join(rules)
+
+
+def asset_folder(theme):
+    return "dark" if theme == "dark" else "light"
+
+
+def device_size(width, height, dpr):
+    return round(width * dpr), round(height * dpr)
+
+
+# Cache de hojas de estilo, logos e iconos por tema. Las imagenes se guardan
+# ya escaladas al tamano en pixeles del dispositivo (tamano logico por
+# densidad de pixeles); warm() las prepara en un hilo aparte como QImage, que
+# a diferencia de QPixmap se puede crear fuera del hilo de la interfaz.
+class ThemeManager:
+    def __init__(self, base=BASE):
+        self.base = base
+        self._sheets = {}
+        self._icons = {}
+        self._pixmaps = {}
+        self._images = {}
+        # (partes, tamano en dispositivo) ya escalados, en _images o en _pixmaps,
+        # y los que el hilo de warm() tiene en curso
+        self._scaled = set()
+        self._pending = set()
+        self._ready = threading.Condition()
+        self._warming = None
+
+    def preload(self):
+        self.combined()
+
+    def combined(self):
+        # Una sola hoja con todos los temas: se aplica una vez y el tema se
+        # elige con la propiedad theme, sin volver a parsear
+        sheet = self._sheets.get(None)
+        if sheet is None:
+            sheet = self._sheets[None] = "".join(scope_qss(self.sheet(theme), theme) for theme in THEMES)
+        return sheet
+
+    def sheet(self, theme):
+        sheet = self._sheets.get(theme)
+        if sheet is None:
+            path = os.path.join(self.base, "styles", f"{theme}.qss")
+            with open(path, "r", encoding="utf-8") as f:
+                sheet = compile_qss(f.read())
+            self._sheets[theme] = sheet
+        return sheet
+
+    def icon(self, light, dark, theme, size, dpr=1.0):
+        file = dark if theme == "dark" else light
+        key = (asset_folder(theme), file, size, dpr)
+        icon = self._icons.get(key)
+        if icon is None:
+            icon = QIcon(self.pixmap((key[0], file), size, size, dpr)) if file else QIcon()
+            self._icons[key] = icon
+        return icon
+
+    def logo(self, folder, file, width, height, dpr=1.0):
+        return self.pixmap((folder, file), width, height, dpr)
+
+    def pixmap(self, parts, width, height, dpr=1.0):
+        # parts: ruta dentro de assets. Se guarda solo la version escalada: el
+        # logo original pesa cientos de MB decodificado
+        key = (parts, width, height, dpr)
+        pix = self._pixmaps.get(key)
+        if pix is None:
+            size = device_size(width, height, dpr)
+            with self._ready:
+                # Si warm() ya la escalo se usa esa; si la esta escalando, se espera
+                while (parts, size) in self._pending:
+                    self._ready.wait()
+                image = self._images.pop((parts, size), None)
+                self._scaled.add((parts, size))
+            if image is None:
+                _, image = next(self.load(parts, [size]))
+            pix = QPixmap.fromImage(image)
+            pix.setDevicePixelRatio(dpr)
+            self._pixmaps[key] = pix
+        return pix
+
+    def load(self, parts, sizes):
+        # Una sola decodificacion por archivo para todos los tamanos pedidos
+        image = QImage(os.path.join(self.base, "assets", *parts))
+        for size in sizes:
+            yield size, image.scaled(size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    def warm(self, variants):
+        # variants: (partes, ancho, alto, dpr) en orden de prioridad. Escala en
+        # segundo plano lo que todavia no esta en cache
+        files = {}
+        for parts, width, height, dpr in variants:
+            if parts[-1] and (parts, width, height, dpr) not in self._pixmaps:
+                files.setdefault(parts, []).append(device_size(width, height, dpr))
+        if files:
+            self._warming = threading.Thread(target=self._warm, args=(files,), daemon=True)
+            self._warming.start()
+
+    def _warm(self, files):
+        for parts, sizes in files.items():
+            with self._ready:
+                sizes = [size for size in sizes if (parts, size) not in self._scaled]
+                self._scaled.update((parts, size) for size in sizes)
+                self._pending.update((parts, size) for size in sizes)
+            # Cada tamano se publica apenas esta listo
+            for size, image in self.load(parts, sizes):
+                with self._ready:
+                    self._images[(parts, size)] = image
+                    self._pending.discard((parts, size))
+                    self._ready.notify_all()